@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Adaptive early-stopping sample plan for the strict analyzer
+- The fixed plan (min(50, max(10, total_frames // 10)) evenly spaced frames) becomes the upper
+  bound; frames are taken coarse-to-fine in rounds: AI_ADAPTIVE_MIN_SAMPLES evenly spaced frames
+  first, then each round adds the midpoints between the frames already taken (doubling the density)
+- Every round covers the whole video, so a stop after any round sees all of it, not a prefix
+- Running mean and variance per metric (eye, expression, gesture, posture) are kept with
+  Welford's algorithm; after each round sampling stops once every metric's confidence interval
+  (AI_ADAPTIVE_CONFIDENCE, normal approximation) has a half-width within AI_ADAPTIVE_TOLERANCE
+  score points; noisy videos keep refining up to the fixed plan's frame count
+- Each round is one forward pass. Keyframe sampling seeks straight to every target, so its
+  rounds stay separate and any of them can stop. Sequential decoding walks the file up to the
+  round's last frame, so there the rounds after the first are merged into one pass
+  (merge_refinements): at most two passes, stopping only after the first round
+- Only frames run through the graphs are observed; a frame whose scores the motion filter reused
+  adds no new information and would narrow the interval like a repeat
+- A frame is observed at most once: keyframe sampling snaps a later round's midpoints to
+  keyframes an earlier round may already have scored, and first_visit() drops those repeats so
+  they do not count as new observations and narrow the interval
+"""
+
+import math
+import os
+import statistics
+from typing import Any, Dict, List, Sequence
+
+from frame_sampler import sample_indices
+
+ADAPTIVE_SAMPLING = os.environ.get('AI_ADAPTIVE_SAMPLING', '0') == '1'
+DEFAULT_MIN_SAMPLES = int(os.environ.get('AI_ADAPTIVE_MIN_SAMPLES', '10'))
+DEFAULT_TOLERANCE = float(os.environ.get('AI_ADAPTIVE_TOLERANCE', '5'))
+DEFAULT_CONFIDENCE = float(os.environ.get('AI_ADAPTIVE_CONFIDENCE', '0.95'))
+
+METRICS = ('eyeContactScore', 'facialExpressionScore', 'gestureScore', 'postureScore')
+
+
+class RunningStats:
+    """Welford's online mean and variance"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1); zero until there are two values"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def half_width(self, z: float) -> float:
+        """Half-width of the normal-approximation confidence interval of the mean"""
+        return z * math.sqrt(self.variance / self.count) if self.count else math.inf
+
+
+def refinement_rounds(total_frames: int, first: int, limit: int) -> List[List[int]]:
+    """Frame indices per round: `first` evenly spaced, then the new midpoints of each doubling, up to `limit` in total"""
+    limit = min(limit, total_frames)
+    rounds, planned, count = [], set(), max(1, first)
+    while len(planned) < limit:
+        level = sorted(set(sample_indices(total_frames, count)) - planned)
+        room = limit - len(planned)
+        if len(level) > room:
+            # Last round: spread the remaining budget evenly over the new midpoints
+            level = [level[int(i * len(level) / room)] for i in range(room)]
+        if not level:
+            break
+        rounds.append(level)
+        planned.update(level)
+        count *= 2
+    return rounds
+
+
+class AdaptiveSamplingPolicy:
+    """Coarse-to-fine rounds plus the confidence-interval stopping rule"""
+
+    def __init__(self, total_frames: int, max_samples: int, min_samples: int = None, tolerance: float = None,
+                 confidence: float = None, merge_refinements: bool = False):
+        self.min_samples = min(max_samples, min_samples or DEFAULT_MIN_SAMPLES)
+        self.tolerance = tolerance or DEFAULT_TOLERANCE
+        self.confidence = confidence or DEFAULT_CONFIDENCE
+        self.z = statistics.NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        self.rounds = refinement_rounds(total_frames, self.min_samples, max_samples)
+        self.merged = merge_refinements and len(self.rounds) > 2
+        if self.merged:
+            # One forward pass for every refinement: the stop is decided after the first round only
+            self.rounds = [self.rounds[0], sorted(index for indices in self.rounds[1:] for index in indices)]
+        self.planned = sum(len(indices) for indices in self.rounds)
+        self.stats = {name: RunningStats() for name in METRICS}
+        self.rounds_run = 0
+        self.stopped_early = False
+        self.visited = set()
+        self.repeats = 0
+
+    @property
+    def samples(self) -> int:
+        return self.stats[METRICS[0]].count
+
+    def first_visit(self, index: int) -> bool:
+        """Record a decoded frame index; False when an earlier round already analyzed that frame"""
+        if index in self.visited:
+            self.repeats += 1
+            return False
+        self.visited.add(index)
+        return True
+
+    def observe(self, scores: Sequence[float]):
+        """Add the (eye, expression, gesture, posture) scores of one frame the graphs analyzed"""
+        for name, score in zip(METRICS, scores):
+            self.stats[name].add(score)
+
+    def half_widths(self) -> Dict[str, float]:
+        return {name: stats.half_width(self.z) for name, stats in self.stats.items()}
+
+    def end_round(self) -> bool:
+        """Call after each round; True when sampling can stop before the remaining rounds"""
+        self.rounds_run += 1
+        if self.rounds_run >= len(self.rounds) or self.samples < self.min_samples:
+            return False
+        if all(width <= self.tolerance for width in self.half_widths().values()):
+            self.stopped_early = True
+        return self.stopped_early
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "tolerance": self.tolerance,
+            "confidence": self.confidence,
+            "roundsPlanned": len(self.rounds),
+            "roundsRun": self.rounds_run,
+            "roundsMerged": self.merged,
+            "framesPlanned": self.planned,
+            "framesSampled": len(self.visited),
+            "framesSaved": self.planned - len(self.visited),
+            "framesObserved": self.samples,
+            "framesRepeated": self.repeats,
+            "stoppedEarly": self.stopped_early,
+            "halfWidths": {name: None if math.isinf(width) else round(width, 2)
+                           for name, width in self.half_widths().items()},
+        }
@@ -14,10 +14,23 @@ import sys
 import base64
 import tempfile
 import os
+import time
 import cv2
-import mediapipe as mp
 import numpy as np
 from typing import Dict, Any
+from model_pool import get_pool
+from frame_sampler import FrameSampler, sample_indices, DEFAULT_SAMPLING_MODE
+from frame_preprocess import FramePreprocessor
+from video_probe import probe_video
+from parallel_graphs import run_graphs
+from adaptive_sampling import AdaptiveSamplingPolicy, ADAPTIVE_SAMPLING
+from motion_filter import MotionFilter
+from analysis_modes import ANALYSIS_MODES, parse_mode, sample_count
+from stage_timer import StageTimer
+from analysis_stream import AnalysisCancelled
+
+# Bump whenever a change can alter scores for the same video; cached results are keyed on it
+ANALYZER_VERSION = 'strict-1'
 
 def get_recommendations(overall, eye, face, gesture, posture):
     recs = []
@@ -35,28 +48,147 @@ def get_recommendations(overall, eye, face, gesture, posture):
         recs.append("Great job! Keep practicing to maintain your strong communication skills.")
     return recs
 
-def analyze(video_path, scenario, duration):
+def run_frame_graphs(parallel, tasks):
+    """Run {name: (graph.process, input)} on the graph thread pool or one after another"""
+    if parallel:
+        return run_graphs(tasks)
+    return {name: fn(arg) for name, (fn, arg) in tasks.items()}
+
+def cascade_report(enabled, frames, frames_gated):
+    """How much Hands/Pose work the FaceMesh gate skipped"""
+    graph_runs = 3 * frames
+    skipped = 2 * frames_gated
+    return {
+        "enabled": bool(enabled),
+        "framesGated": frames_gated,
+        "graphRunsSkipped": skipped,
+        "graphRunsTotal": graph_runs,
+        "skippedRatio": round(skipped / graph_runs, 4) if graph_runs else 0.0,
+    }
+
+def score_frame(face_results, hand_results, pose_results):
+    """Per-frame (eye, expression, gesture, posture) scores, or None when no face was found"""
+    # --- Person/Face detection ---
+    if not face_results.multi_face_landmarks or len(face_results.multi_face_landmarks) == 0:
+        return None
+    face_landmarks = face_results.multi_face_landmarks[0]
+
+    # --- Eye contact (very basic: eyes open) ---
+    try:
+        left_eye_top = face_landmarks.landmark[159]
+        left_eye_bottom = face_landmarks.landmark[145]
+        right_eye_top = face_landmarks.landmark[386]
+        right_eye_bottom = face_landmarks.landmark[374]
+        left_eye_open = abs(left_eye_top.y - left_eye_bottom.y) > 0.005
+        right_eye_open = abs(right_eye_top.y - right_eye_bottom.y) > 0.005
+        eyes_open = left_eye_open or right_eye_open
+        eye_score = 100 if eyes_open else 0
+    except Exception:
+        eye_score = 0
+
+    # --- Facial expression (very basic: mouth open) ---
+    try:
+        mouth_top = face_landmarks.landmark[13]
+        mouth_bottom = face_landmarks.landmark[14]
+        mouth_open = abs(mouth_top.y - mouth_bottom.y) > 0.03
+        expression_score = 100 if mouth_open else 60
+    except Exception:
+        expression_score = 0
+
+    # --- Hand gesture (any hand detected) ---
+    gesture_score = 100 if hand_results.multi_hand_landmarks else 0
+
+    # --- Posture (shoulders visible) ---
+    try:
+        if pose_results.pose_landmarks:
+            left_shoulder = pose_results.pose_landmarks.landmark[11]
+            right_shoulder = pose_results.pose_landmarks.landmark[12]
+            if left_shoulder.visibility > 0.8 and right_shoulder.visibility > 0.8:
+                posture_score = 100
+            else:
+                posture_score = 0
+        else:
+            posture_score = 0
+    except Exception:
+        posture_score = 0
+
+    return eye_score, expression_score, gesture_score, posture_score
+
+def running_means(score_sums, frames, person_frames):
+    """Means of the per-frame scores so far (same weighting as the final result, not truncated)"""
+    means = [total / frames if frames else 0.0 for total in score_sums]
+    return {
+        "overallScore": round(sum(means) / 4, 1),
+        "eyeContactScore": round(means[0], 1),
+        "facialExpressionScore": round(means[1], 1),
+        "gestureScore": round(means[2], 1),
+        "postureScore": round(means[3], 1),
+        "personFrames": person_frames,
+    }
+
+def analyze(video_path, scenario, duration, models=None, sampling=None, resize=None, cascade=None,
+            parallel=False, adaptive=None, motion_threshold=None, progress=None, timings=False,
+            timer=None, mode=None):
+    """Analyze a video; borrows a model set from the process-wide pool unless one is given.
+
+    progress, if given, is called as progress(frames_processed, frames_planned, means) after every
+    frame, where means are the running_means() of the frames so far.
+    mode ('fast', 'standard' or 'full', default AI_ANALYSIS_MODE) picks the graphs, the sample count
+    and the defaults of resize, cascade, adaptive and motion_threshold (see analysis_modes).
+    adaptive (default AI_ADAPTIVE_SAMPLING) samples coarse-to-fine and stops once the scores are stable.
+    motion_threshold (default AI_MOTION_THRESHOLD) reuses the last scores for near-identical frames.
+    timings adds a per-stage wall/CPU time block (see stage_timer) to the result; a timer passed in
+    records the stages either way (the service feeds it to its metrics).
+    """
+    timer = timer if timer is not None else StageTimer(timings)
+    mode = parse_mode(mode)
+    settings = ANALYSIS_MODES[mode]
+    temp_file_path = None
     # Handle base64 encoded video data
     if video_path.startswith('data:video') or len(video_path) > 1000:
         try:
             with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
-                video_data = base64.b64decode(video_path)
-                temp_file.write(video_data)
+                with timer.stage('base64Decode'):
+                    video_data = base64.b64decode(video_path)
+                with timer.stage('tempFileWrite'):
+                    temp_file.write(video_data)
                 temp_file_path = temp_file.name
             video_path = temp_file_path
         except Exception as e:
             return {"error": f"Failed to decode video data: {str(e)}"}
 
+    options = dict(sampling=sampling, parallel=parallel, progress=progress, timer=timer, mode=mode,
+                   resize=settings.get('resize') if resize is None else resize,
+                   cascade=settings.get('cascade', False) if cascade is None else cascade,
+                   adaptive=settings.get('adaptive', ADAPTIVE_SAMPLING) if adaptive is None else adaptive,
+                   motion_threshold=settings.get('motion_threshold') if motion_threshold is None else motion_threshold)
     try:
-        mp_face = mp.solutions.face_mesh
-        mp_hands = mp.solutions.hands
-        mp_pose = mp.solutions.pose
+        if models is None:
+            with get_pool(settings['pool']).acquire() as pooled_models:
+                result = _analyze_with_models(video_path, pooled_models, **options)
+        else:
+            result = _analyze_with_models(video_path, models, **options)
+        if timings:
+            result["timings"] = timer.report()
+        return result
+    finally:
+        # Clean up temporary file if created
+        if temp_file_path and os.path.exists(temp_file_path):
+            os.unlink(temp_file_path)
 
-        face_mesh = mp_face.FaceMesh(static_image_mode=False, max_num_faces=1, refine_landmarks=True)
-        hands = mp_hands.Hands(static_image_mode=False, max_num_hands=2)
-        pose = mp_pose.Pose(static_image_mode=False)
+def _analyze_with_models(video_path, models, sampling=None, resize=None, cascade=False, parallel=False,
+                         adaptive=False, motion_threshold=None, progress=None, timer=None, mode='standard'):
+    timer = timer or StageTimer()
+    cap = None
+    try:
+        # Graph calls go through the timer (the bound methods themselves when timings are off)
+        face_mesh_process = timer.timed('faceMesh', models.face_mesh.process)
+        hands_process = timer.timed('hands', models.hands.process)
+        pose_process = timer.timed('pose', models.pose.process)
+        frame_scorer = timer.timed('score', score_frame)
 
-        cap = cv2.VideoCapture(video_path)
+        with timer.stage('open'):
+            cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             return {
                 "status": "error",
@@ -70,81 +202,106 @@ def analyze(video_path, scenario, duration):
                 "recommendations": get_recommendations(0, 0, 0, 0, 0)
             }
 
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        sample_frames = min(50, max(10, total_frames // 10))
-        frame_indices = [int(i * total_frames / sample_frames) for i in range(sample_frames)]
+        with timer.stage('probe'):
+            video_info = probe_video(video_path, cap)
+        total_frames = video_info.frames
+        sample_frames = sample_count(total_frames, mode)
+        sampling = sampling or DEFAULT_SAMPLING_MODE
+        # Adaptive sampling takes the fixed plan's frame count as its budget, in coarse-to-fine rounds;
+        # sequential decoding walks the file on every pass, so its refinements share one pass
+        policy = AdaptiveSamplingPolicy(total_frames, sample_frames,
+                                        merge_refinements=sampling != 'keyframe') if adaptive else None
+        rounds = policy.rounds if policy else [sample_indices(total_frames, sample_frames)]
+        frames_planned = sum(len(indices) for indices in rounds)
 
         eye_scores = []
         expression_scores = []
         gesture_scores = []
         posture_scores = []
+        score_sums = [0, 0, 0, 0]
         valid_person_frames = 0
+        frames_processed = 0
+        preprocessor = FramePreprocessor(resize)
+        frames_gated = 0
+        motion = MotionFilter(motion_threshold)
+        last_frame_scores = None
+        loop_started = time.perf_counter()
 
-        for idx in frame_indices:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-            ret, frame = cap.read()
-            if not ret:
-                continue
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            face_results = face_mesh.process(rgb_frame)
-            hand_results = hands.process(rgb_frame)
-            pose_results = pose.process(rgb_frame)
-
-            # --- Person/Face detection ---
-            if not face_results.multi_face_landmarks or len(face_results.multi_face_landmarks) == 0:
-                # No face detected: all scores zero for this frame
-                eye_scores.append(0)
-                expression_scores.append(0)
-                gesture_scores.append(0)
-                posture_scores.append(0)
-                continue
-            valid_person_frames += 1
-            face_landmarks = face_results.multi_face_landmarks[0]
-
-            # --- Eye contact (very basic: eyes open) ---
-            try:
-                left_eye_top = face_landmarks.landmark[159]
-                left_eye_bottom = face_landmarks.landmark[145]
-                right_eye_top = face_landmarks.landmark[386]
-                right_eye_bottom = face_landmarks.landmark[374]
-                left_eye_open = abs(left_eye_top.y - left_eye_bottom.y) > 0.005
-                right_eye_open = abs(right_eye_top.y - right_eye_bottom.y) > 0.005
-                eyes_open = left_eye_open or right_eye_open
-                eye_score = 100 if eyes_open else 0
-            except Exception:
-                eye_score = 0
-            eye_scores.append(eye_score)
-
-            # --- Facial expression (very basic: mouth open) ---
-            try:
-                mouth_top = face_landmarks.landmark[13]
-                mouth_bottom = face_landmarks.landmark[14]
-                mouth_open = abs(mouth_top.y - mouth_bottom.y) > 0.03
-                expression_score = 100 if mouth_open else 60
-            except Exception:
-                expression_score = 0
-            expression_scores.append(expression_score)
-
-            # --- Hand gesture (any hand detected) ---
-            gesture_score = 100 if hand_results.multi_hand_landmarks else 0
-            gesture_scores.append(gesture_score)
-
-            # --- Posture (shoulders visible) ---
-            try:
-                if pose_results.pose_landmarks:
-                    left_shoulder = pose_results.pose_landmarks.landmark[11]
-                    right_shoulder = pose_results.pose_landmarks.landmark[12]
-                    if left_shoulder.visibility > 0.8 and right_shoulder.visibility > 0.8:
-                        posture_score = 100
+        # Keyframe sampling reopens the file through PyAV; sequential reuses the open capture
+        source = video_path if sampling == 'keyframe' else cap
+        for round_number, frame_indices in enumerate(rounds):
+            # Later rounds start by seeking to their first frame instead of decoding from the start again
+            samples = FrameSampler(source, frame_indices, mode=sampling, seek=round_number > 0)
+            for idx, timestamp, frame in timer.timed_iter('decode', samples):
+                if policy is not None and not policy.first_visit(idx):
+                    # Keyframe sampling snapped this round's target to a frame already scored
+                    continue
+                with timer.frame():
+                    reused = motion.unchanged(frame)
+                    if reused:
+                        # Nearly identical to the last analyzed frame: count its scores again
+                        frame_scores = last_frame_scores
                     else:
-                        posture_score = 0
-                else:
-                    posture_score = 0
-            except Exception:
-                posture_score = 0
-            posture_scores.append(posture_score)
+                        with timer.stage('preprocess'):
+                            # Inputs are resized and converted on first access, so read them all here
+                            inputs = preprocessor.prepare(frame)
+                            face_input = inputs['face_mesh']
+                            hands_input, pose_input = (None, None) if cascade else (inputs['hands'], inputs['pose'])
+                        if cascade:
+                            face_results = face_mesh_process(face_input)
+                            # Cascade: frames without a face are zero-scored, so Hands/Pose would be thrown away
+                            if not face_results.multi_face_landmarks:
+                                frames_gated += 1
+                                hand_results = pose_results = None
+                            else:
+                                with timer.stage('preprocess'):
+                                    hands_input, pose_input = inputs['hands'], inputs['pose']
+                                results = run_frame_graphs(parallel, {
+                                    'hands': (hands_process, hands_input),
+                                    'pose': (pose_process, pose_input),
+                                })
+                                hand_results, pose_results = results['hands'], results['pose']
+                        else:
+                            results = run_frame_graphs(parallel, {
+                                'face_mesh': (face_mesh_process, face_input),
+                                'hands': (hands_process, hands_input),
+                                'pose': (pose_process, pose_input),
+                            })
+                            face_results, hand_results, pose_results = results['face_mesh'], results['hands'], results['pose']
+
+                        frame_scores = frame_scorer(face_results, hand_results, pose_results)
+                        last_frame_scores = frame_scores
+                    if frame_scores is None:
+                        # No face detected: all scores zero for this frame
+                        frame_scores = (0, 0, 0, 0)
+                    else:
+                        valid_person_frames += 1
+                    eye_scores.append(frame_scores[0])
+                    expression_scores.append(frame_scores[1])
+                    gesture_scores.append(frame_scores[2])
+                    posture_scores.append(frame_scores[3])
+                    for i, score in enumerate(frame_scores):
+                        score_sums[i] += score
+                    if policy is not None and not reused:
+                        # Reused scores are not a new measurement, so they do not narrow the interval
+                        policy.observe(frame_scores)
 
-        cap.release()
+                frames_processed += 1
+                if progress is not None:
+                    progress(frames_processed, frames_planned,
+                             running_means(score_sums, frames_processed, valid_person_frames))
+
+            if policy is not None and policy.end_round():
+                break
+
+        instrumentation = {
+            "mode": mode,
+            "probe": video_info.as_dict(),
+            "preprocess": preprocessor.report(time.perf_counter() - loop_started),
+            "cascade": cascade_report(cascade, preprocessor.frames, frames_gated),
+            "adaptive": policy.report() if policy else {"enabled": False},
+            "motion": motion.report(),
+        }
 
         # If no valid person frames, all results are zero
         if valid_person_frames == 0:
@@ -157,15 +314,17 @@ def analyze(video_path, scenario, duration):
                 "gestureScore": 0,
                 "postureScore": 0,
                 "feedback": ["No person detected in the video."],
-                "recommendations": get_recommendations(0, 0, 0, 0, 0)
+                "recommendations": get_recommendations(0, 0, 0, 0, 0),
+                "instrumentation": instrumentation
             }
 
         # Aggregate scores
-        eye_contact_score = int(np.mean(eye_scores))
-        facial_expression_score = int(np.mean(expression_scores))
-        gesture_score = int(np.mean(gesture_scores))
-        posture_score = int(np.mean(posture_scores))
-        overall_score = int(np.mean([eye_contact_score, facial_expression_score, gesture_score, posture_score]))
+        with timer.stage('aggregate'):
+            eye_contact_score = int(np.mean(eye_scores))
+            facial_expression_score = int(np.mean(expression_scores))
+            gesture_score = int(np.mean(gesture_scores))
+            posture_score = int(np.mean(posture_scores))
+            overall_score = int(np.mean([eye_contact_score, facial_expression_score, gesture_score, posture_score]))
 
         result = {
             "status": "success",
@@ -175,16 +334,19 @@ def analyze(video_path, scenario, duration):
             "gestureScore": gesture_score,
             "postureScore": posture_score,
             "feedback": [],
-            "recommendations": get_recommendations(overall_score, eye_contact_score, facial_expression_score, gesture_score, posture_score)
+            "recommendations": get_recommendations(overall_score, eye_contact_score, facial_expression_score, gesture_score, posture_score),
+            "instrumentation": instrumentation
         }
-
-        # Clean up temporary file if created
-        if 'temp_file_path' in locals() and video_path == temp_file_path:
-            os.unlink(video_path)
         return result
 
+    except AnalysisCancelled:
+        # The streaming client went away: no result to report, analysis_stream drops the run
+        raise
     except Exception as e:
         return {"error": f"Analysis failed: {str(e)}"}
+    finally:
+        if cap is not None:
+            cap.release()
 
 def main():
     if len(sys.argv) != 4:
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Cost/latency tiers for the strict analyzer (the `mode` parameter of /analyze)
+- fast: FaceMesh without refined (iris) landmarks, Hands and Pose at model_complexity=0,
+  320/256 px model inputs, about a third of the standard sample count (5-20 frames),
+  cascade gating and motion-aware skipping on
+- standard: the behavior before modes existed (10-50 frames, default graphs and input sizes)
+- full: dense sampling (30-300 frames, one every 3rd frame), Pose at model_complexity=2, and
+  every graph on every sampled frame (no cascade, motion skipping or adaptive early stop)
+- Explicit request parameters (resize, cascade, adaptive, motion_threshold) still win over the
+  mode's defaults; AI_ANALYSIS_MODE picks the default mode (an unknown name falls back to
+  standard with a warning)
+- Each mode with its own graph settings has its own model pool, built on first use, so a worker
+  that serves every mode holds up to three sets of MediaPipe graphs per pool slot
+- benchmarks/bench_modes.py measures each mode's latency and score deviation; the README records
+  the latency on synthetic clips, deviation needs real recordings
+"""
+
+import os
+import sys
+from typing import Any, Dict
+
+ANALYSIS_MODES: Dict[str, Dict[str, Any]] = {
+    'fast': {
+        'pool': 'fast',
+        'samples': (5, 20, 30),  # (minimum, maximum, one per N frames)
+        'resize': {'face_mesh': 320, 'hands': 320, 'pose': 256},
+        'cascade': True,
+        'motion_threshold': 0.02,
+    },
+    'standard': {
+        'pool': 'strict',
+        'samples': (10, 50, 10),
+    },
+    'full': {
+        'pool': 'full',
+        'samples': (30, 300, 3),
+        'cascade': False,
+        'motion_threshold': 0.0,
+        'adaptive': False,
+    },
+}
+
+FALLBACK_MODE = 'standard'
+
+
+def _default_mode() -> str:
+    """AI_ANALYSIS_MODE, validated once at import: a typo falls back to 'standard' instead of failing every request"""
+    mode = os.environ.get('AI_ANALYSIS_MODE', FALLBACK_MODE).strip().lower()
+    if mode not in ANALYSIS_MODES:
+        print(f"[WARN] AI_ANALYSIS_MODE={mode!r} is not one of {', '.join(ANALYSIS_MODES)}; "
+              f"using '{FALLBACK_MODE}'", file=sys.stderr)
+        return FALLBACK_MODE
+    return mode
+
+
+DEFAULT_MODE = _default_mode()
+
+
+def parse_mode(value) -> str:
+    """Mode name from a request parameter (None keeps the default); raises ValueError for unknown names"""
+    mode = DEFAULT_MODE if value is None or value == '' else str(value).lower()
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"mode must be one of: {', '.join(ANALYSIS_MODES)}")
+    return mode
+
+
+def sample_count(total_frames: int, mode: str) -> int:
+    """Frames to sample for a video of total_frames under the mode's plan"""
+    minimum, maximum, every = ANALYSIS_MODES[mode]['samples']
+    return min(maximum, max(minimum, total_frames // every))
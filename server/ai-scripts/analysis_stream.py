@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Streaming analysis responses for POST /analyze/stream
+- The analysis runs on its own thread; the response generator relays its events as they happen
+- Events, one JSON object each, as NDJSON lines or as SSE messages (Accept: text/event-stream):
+  - started:   sent at once, before any frame is decoded (time to first byte is the upload alone)
+  - progress:  every K analyzed frames (AI_STREAM_PROGRESS_EVERY or the progress_every
+               parameter), with the running metric means of the frames so far
+  - heartbeat: after AI_STREAM_HEARTBEAT seconds without an event (keeps proxies from timing out)
+  - result / error: the final /analyze body, or the failure; always the last event
+- A client that disconnects cancels the analysis at its next frame, so abandoning a stream
+  frees the model set instead of finishing a result nobody reads
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator
+
+STREAM_PROGRESS_EVERY = int(os.environ.get('AI_STREAM_PROGRESS_EVERY', '5'))
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get('AI_STREAM_HEARTBEAT', '10'))
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+SSE_MIMETYPE = 'text/event-stream'
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCancelled(Exception):
+    """The streaming client went away; raised from the progress callback to stop the frame loop"""
+
+
+def format_event(event: Dict[str, Any], sse: bool) -> str:
+    data = json.dumps(event)
+    if sse:
+        return f"event: {event['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+def start_stream(run: Callable[[Callable[..., None]], Dict[str, Any]], cleanup: Callable[[], None] = None,
+                 every: int = None, sse: bool = False) -> Iterator[str]:
+    """Start run(progress) on a thread now and return the generator of its formatted events
+
+    The thread is started here rather than on the first next(), so cleanup() runs even when the
+    response is never iterated.
+    """
+    every = max(1, every or STREAM_PROGRESS_EVERY)
+    events: 'queue.Queue' = queue.Queue()
+    cancelled = threading.Event()
+
+    def progress(processed: int, planned: int, means: Dict[str, Any] = None):
+        if cancelled.is_set():
+            raise AnalysisCancelled("Streaming client disconnected")
+        if processed % every == 0 or processed >= planned:
+            events.put({"event": "progress", "processed": processed, "planned": planned, "means": means})
+
+    def worker():
+        try:
+            result = run(progress)
+            events.put({"event": "result", "result": result})
+        except AnalysisCancelled:
+            pass
+        except Exception as e:
+            logger.exception("Streaming analysis failed")
+            events.put({"event": "error", "error": str(e)})
+        finally:
+            try:
+                if cleanup:
+                    cleanup()
+            finally:
+                events.put(None)
+
+    threading.Thread(target=worker, name='analysis-stream', daemon=True).start()
+
+    def generate():
+        try:
+            yield format_event({"event": "started", "progressEvery": every}, sse)
+            while True:
+                try:
+                    event = events.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n" if sse else format_event({"event": "heartbeat"}, sse)
+                    continue
+                if event is None:
+                    return
+                yield format_event(event, sse)
+        finally:
+            # Normal end, or the server closed the generator because the client disconnected
+            cancelled.set()
+
+    return generate()
@@ -1,24 +1,243 @@
-from flask import Flask, request, jsonify
-from ai_strict_video_analysis import analyze
-import traceback
+from flask import Flask, Response, request, jsonify
+from ai_strict_video_analysis import analyze, ANALYZER_VERSION
+from model_pool import get_pool
+from video_upload import UploadRequest, spool_stream, spool_upload, remove_spool
+from jobs import get_job_manager, read_job, QueueFull
+from result_cache import get_cache, cache_key
+from analysis_stream import start_stream, AnalysisCancelled, NDJSON_MIMETYPE, SSE_MIMETYPE
+from frame_sampler import SAMPLING_MODES
+from frame_preprocess import parse_target_long_edge
+from motion_filter import parse_motion_threshold
+from analysis_modes import ANALYSIS_MODES, parse_mode
+from stage_timer import StageTimer
+import metrics
+import hashlib
+import logging
+import os
+import threading
+import time
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.request_class = UploadRequest
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500 MB, adjust as needed
 
+@app.after_request
+def count_request(response):
+    metrics.http_request(request.url_rule.rule if request.url_rule else 'unmatched', response.status_code)
+    return response
+
+def start_model_warmup():
+    """Load and warm the default mode's models on a background thread while the worker starts serving
+
+    Called from gunicorn's post_worker_init hook (gunicorn.conf.py) and by `python app.py`, so
+    importing this module stays cheap; a request that arrives first builds its own model set.
+    """
+    if os.environ.get('AI_MODEL_POOL_WARMUP', '1') != '1':
+        return None
+    pool = get_pool(ANALYSIS_MODES[parse_mode(None)]['pool'])
+
+    def warm():
+        try:
+            pool.warm()
+        except Exception:
+            logger.exception("Model warmup failed; models will load on the first request")
+
+    thread = threading.Thread(target=warm, name='model-warmup', daemon=True)
+    thread.start()
+    return thread
+
+def is_enabled(value):
+    """Boolean request flag from JSON (true) or form/query strings ('1', 'true', 'yes')"""
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def read_upload():
+    """Return (video_path, params, spooled, digest) for JSON, multipart or raw binary requests
+
+    digest is the SHA-256 of the uploaded bytes, computed while spooling (None for JSON bodies).
+    """
+    if request.mimetype == 'multipart/form-data':
+        video_path, digest = None, None
+        try:
+            upload = request.files.get('video')
+            if upload:
+                video_path, digest = spool_upload(upload)
+        finally:
+            # Other file parts (and every part of a request that failed to parse) are not kept
+            request.discard_spools(keep=video_path)
+        return video_path, request.form, video_path is not None, digest
+    if request.mimetype == 'application/octet-stream':
+        hasher = hashlib.sha256()
+        video_path = spool_stream(request.stream, request.args.get('mime_type'), hasher=hasher)
+        return video_path, request.args, True, hasher.hexdigest()
+    # Legacy contract: base64 video (or a server-side path) in the JSON body
+    data = request.get_json(silent=True) or {}
+    return data.get('video_path'), data, False, None
+
+def run_analysis(options, digest, progress=None):
+    """analyze() behind the result cache, recorded in the service metrics"""
+    # Per-stage timing only when asked for: by the request, or for every run with AI_METRICS_STAGE_TIMINGS=1
+    timer = StageTimer(metrics.STAGE_TIMINGS or options.get('timings'))
+    result, status = None, None
+    started = time.perf_counter()
+    metrics.analysis_started()
+    try:
+        result = run_cached_analysis(options, digest, progress, timer)
+        return result
+    except AnalysisCancelled:
+        status = 'cancelled'
+        raise
+    finally:
+        metrics.analysis_finished(options['scenario'], time.perf_counter() - started, result, timer, status)
+
+def run_cached_analysis(options, digest, progress, timer):
+    """analyze() behind the result cache; every result carries a cacheHit marker
+
+    A request for timings always runs the pipeline (a cached result has nothing to time), and the
+    timings block is not stored with the result.
+    """
+    cache = get_cache() if digest else None
+    key = cache_key(digest, options['scenario'], ANALYZER_VERSION, options) if cache else None
+    if cache and not options.get('timings'):
+        cached = cache.get(key)
+        metrics.cache_lookup(cached is not None)
+        if cached is not None:
+            cached['cacheHit'] = True
+            return cached
+    result = analyze(progress=progress, timer=timer, **options)
+    if cache and result.get('status') == 'success':
+        try:
+            cache.put(key, {name: value for name, value in result.items() if name != 'timings'})
+        except OSError as e:
+            logger.warning("Could not store cached result: %s", e)
+    result['cacheHit'] = False
+    return result
+
+def parse_analysis_params(video_path, params):
+    """Return (analyze() keyword arguments, None) or (None, error message) for a request"""
+    scenario = params.get('scenario')
+    duration = params.get('duration')
+    if not all([video_path, scenario, duration]):
+        return None, "Missing required parameters: video_path, scenario, duration"
+    try:
+        duration = float(duration)
+    except (TypeError, ValueError):
+        return None, "duration must be a number"
+    sampling = params.get('sampling')
+    if sampling is not None and sampling not in SAMPLING_MODES:
+        return None, f"sampling must be one of: {', '.join(SAMPLING_MODES)}"
+    try:
+        resize = parse_target_long_edge(params.get('resize'))
+    except (TypeError, ValueError):
+        return None, "resize must be a long-edge size, an object of sizes per model, or false"
+    try:
+        motion_threshold = parse_motion_threshold(params.get('motion_threshold'))
+    except (TypeError, ValueError):
+        return None, "motion_threshold must be a number between 0 and 1"
+    try:
+        mode = parse_mode(params.get('mode'))
+    except ValueError as e:
+        return None, str(e)
+    return {
+        "video_path": video_path,
+        "scenario": scenario,
+        "duration": duration,
+        "sampling": sampling,
+        "resize": resize,
+        # None (absent) for cascade and adaptive leaves the choice to the mode
+        "cascade": is_enabled(params['cascade']) if params.get('cascade') is not None else None,
+        "parallel": is_enabled(params.get('parallel')),
+        "adaptive": is_enabled(params['adaptive']) if params.get('adaptive') is not None else None,
+        "motion_threshold": motion_threshold,
+        "timings": is_enabled(params.get('timings')),
+        "mode": mode,
+    }, None
+
 @app.route('/analyze', methods=['POST'])
 def analyze_route():
-    data = request.json
-    video_path = data.get('video_path')
-    scenario = data.get('scenario')
-    duration = data.get('duration')
-    if not all([video_path, scenario, duration]):
-        return jsonify({"error": "Missing required parameters: video_path, scenario, duration"}), 400
+    video_path, spooled = None, False
     try:
-        result = analyze(video_path, scenario, duration)
+        video_path, params, spooled, digest = read_upload()
+        options, error = parse_analysis_params(video_path, params)
+        if error:
+            return jsonify({"error": error}), 400
+        result = run_analysis(options, digest)
         return jsonify(result)
     except Exception as e:
-        print(traceback.format_exc())
+        logger.exception("Request to %s failed", request.path)
         return jsonify({"error": str(e)}), 500
+    finally:
+        if spooled:
+            remove_spool(video_path)
+
+@app.route('/analyze/stream', methods=['POST'])
+def analyze_stream_route():
+    """/analyze with progress events every K frames and the result as the last event"""
+    video_path, spooled = None, False
+    try:
+        video_path, params, spooled, digest = read_upload()
+        options, error = parse_analysis_params(video_path, params)
+        if error:
+            return jsonify({"error": error}), 400
+        try:
+            every = int(params['progress_every']) if params.get('progress_every') is not None else None
+        except (TypeError, ValueError):
+            return jsonify({"error": "progress_every must be a whole number of frames"}), 400
+        sse = SSE_MIMETYPE in request.headers.get('Accept', '')
+        cleanup = (lambda path=video_path: remove_spool(path)) if spooled else None
+        events = start_stream(lambda progress: run_analysis(options, digest, progress), cleanup=cleanup,
+                              every=every, sse=sse)
+        # The stream owns the spooled upload from here on
+        spooled = False
+        return Response(events, mimetype=SSE_MIMETYPE if sse else NDJSON_MIMETYPE,
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    except Exception as e:
+        logger.exception("Request to %s failed", request.path)
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if spooled:
+            remove_spool(video_path)
+
+@app.route('/jobs', methods=['POST'])
+def submit_job_route():
+    video_path, spooled = None, False
+    try:
+        video_path, params, spooled, digest = read_upload()
+        options, error = parse_analysis_params(video_path, params)
+        if error:
+            return jsonify({"error": error}), 400
+        cleanup = (lambda path=video_path: remove_spool(path)) if spooled else None
+        job_id = get_job_manager().submit(lambda progress: run_analysis(options, digest, progress),
+                                          cleanup=cleanup, meta={"scenario": options["scenario"]})
+        # The job owns the spooled upload from here on
+        spooled = False
+        return jsonify({"jobId": job_id, "status": "queued"}), 202
+    except QueueFull as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        logger.exception("Request to %s failed", request.path)
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if spooled:
+            remove_spool(video_path)
+
+@app.route('/metrics', methods=['GET'])
+def metrics_route():
+    """Prometheus exposition, aggregated over every gunicorn worker"""
+    body, content_type = metrics.render()
+    if body is None:
+        return jsonify({"error": "Metrics are disabled (prometheus_client is not installed)"}), 503
+    return Response(body, content_type=content_type)
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status_route(job_id):
+    job = read_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify(job)
 
 if __name__ == '__main__':
+    start_model_warmup()
     app.run(host='0.0.0.0', port=8000) 
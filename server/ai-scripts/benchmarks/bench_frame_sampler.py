@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Decode-time benchmark: per-sample CAP_PROP_POS_FRAMES seeks vs FrameSampler (sequential and keyframe modes)
+Usage: python benchmarks/bench_frame_sampler.py [--seconds 60] [--gops 12 60 250 600]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+
+from frame_sampler import FrameSampler, sample_indices
+from synthetic_clips import make_clip
+from video_probe import probe_video
+
+
+def decode_with_seeks(path: str, indices):
+    """The pre-FrameSampler loop: one random seek per sample"""
+    cap = cv2.VideoCapture(path)
+    decoded = 0
+    for idx in indices:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+        ret, _ = cap.read()
+        decoded += int(ret)
+    cap.release()
+    return decoded
+
+
+def decode_sequential(path: str, indices):
+    return sum(1 for _ in FrameSampler(path, indices))
+
+
+def decode_keyframes(path: str, indices):
+    return sum(1 for _ in FrameSampler(path, indices, mode='keyframe'))
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    count = fn(*args)
+    return time.perf_counter() - started, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--seconds', type=float, default=60)
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--codec', default='h264')
+    parser.add_argument('--gops', type=int, nargs='+', default=[12, 60, 250, 600])
+    args = parser.parse_args()
+
+    rows = []
+    for gop in args.gops:
+        path = make_clip(args.width, args.height, args.seconds, args.fps, gop, args.codec)
+        total_frames = probe_video(path).frames
+        indices = sample_indices(total_frames, min(50, max(10, total_frames // 10)))
+        seek_seconds, seek_frames = timed(decode_with_seeks, path, indices)
+        sequential_seconds, sequential_frames = timed(decode_sequential, path, indices)
+        keyframe_cpu_started = time.process_time()
+        keyframe_seconds, keyframe_frames = timed(decode_keyframes, path, indices)
+        keyframe_cpu = time.process_time() - keyframe_cpu_started
+        rows.append({
+            "clip": os.path.basename(path),
+            "gop": gop,
+            "samples": len(indices),
+            "seekSeconds": round(seek_seconds, 3),
+            "sequentialSeconds": round(sequential_seconds, 3),
+            "speedup": round(seek_seconds / sequential_seconds, 2) if sequential_seconds else None,
+            "framesMatched": seek_frames == sequential_frames,
+            "keyframeSeconds": round(keyframe_seconds, 3),
+            "keyframeCpuSeconds": round(keyframe_cpu, 3),
+            "keyframeSamples": keyframe_frames,
+        })
+        print(f"gop={gop:>4}  seek={seek_seconds:7.3f}s  sequential={sequential_seconds:7.3f}s  "
+              f"keyframe={keyframe_seconds:7.3f}s ({keyframe_frames} frames)  "
+              f"speedup={rows[-1]['speedup']}x", file=sys.stderr)
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == '__main__':
+    main()
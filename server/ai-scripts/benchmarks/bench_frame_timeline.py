@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Per-frame storage of RealVideoAnalyzer: frame_analysis_data dicts plus five score lists (before)
+vs the typed FrameTimeline (after). Reports retained bytes per frame (tracemalloc), the time to
+compute every per-metric mean, and the size of the state shipped between segment processes.
+Usage: python benchmarks/bench_frame_timeline.py [--frames 100000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from frame_timeline import FrameTimeline
+
+LIST_NAMES = ('overall_scores', 'eye_contact_scores', 'facial_expression_scores', 'gesture_scores', 'posture_scores')
+
+
+def random_columns(frames: int, seed: int = 0):
+    """Per-frame scores as finalize_frames produces them (low-resolution partial credit)"""
+    rng = np.random.default_rng(seed)
+    face, eye, hand, posture = (rng.random((4, frames)) < [[0.9], [0.6], [0.4], [0.7]])
+    eye &= face
+    return {
+        "time": np.linspace(0, frames / 30, frames),
+        "eye_contact": np.where(eye, 100, np.where(face, 50, 0)),
+        "expression": np.where(face, 100, 50),
+        "gesture": np.where(hand, 100, 30),
+        "posture": np.where(posture, 100, 40),
+        "overall": 25 * (face.astype(int) + eye + hand + posture),
+        "face_detected": face,
+        "hands_detected": hand,
+    }
+
+
+def build_lists(columns):
+    """The accumulators as they were: five score lists and one dict per frame"""
+    state = {name: [] for name in LIST_NAMES + ('frame_analysis_data',)}
+    for name, column in zip(LIST_NAMES, ('overall', 'eye_contact', 'expression', 'gesture', 'posture')):
+        state[name].extend(columns[column].tolist())
+    for row in zip(*(columns[name].tolist() for name in
+                     ('time', 'eye_contact', 'expression', 'gesture', 'posture', 'face_detected', 'hands_detected'))):
+        state['frame_analysis_data'].append(dict(zip(
+            ('time', 'eye_contact', 'expression', 'gesture', 'posture', 'face_detected', 'hands_detected'), row)))
+    return state
+
+
+def build_timeline(columns):
+    timeline = FrameTimeline(len(columns['time']))
+    timeline.extend(**columns)
+    return timeline
+
+
+def retained_bytes(build, columns) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = build(columns)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del store
+    return after - before
+
+
+def aggregate_lists(state):
+    means = {name: sum(state[name]) / len(state[name]) for name in LIST_NAMES}
+    rows = state['frame_analysis_data']
+    means['face_detected'] = sum(row['face_detected'] for row in rows) / len(rows)
+    means['hands_detected'] = sum(row['hands_detected'] for row in rows) / len(rows)
+    return means
+
+
+def aggregate_timeline(timeline):
+    return timeline.summary()['means']
+
+
+def best_of(fn, arg, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    columns = random_columns(args.frames)
+    state, timeline = build_lists(columns), build_timeline(columns)
+
+    # Both stores must agree on every mean before their costs are compared
+    list_means = aggregate_lists(state)
+    timeline_means = timeline.summary()['means']
+    names = {'overall_scores': 'overall', 'eye_contact_scores': 'eye_contact', 'facial_expression_scores': 'expression',
+             'gesture_scores': 'gesture', 'posture_scores': 'posture'}
+    mismatches = [name for name, value in list_means.items()
+                  if round(value, 3) != timeline_means[names.get(name, name)]]
+
+    results = {"frames": args.frames}
+    for label, build, aggregate, store, serialize in (
+            ('lists', build_lists, aggregate_lists, state, lambda s: pickle.dumps(s, pickle.HIGHEST_PROTOCOL)),
+            ('timeline', build_timeline, aggregate_timeline, timeline, lambda t: t.to_bytes())):
+        retained = retained_bytes(build, columns)
+        results[label] = {
+            "bytesPerFrame": round(retained / args.frames, 1),
+            "aggregateMs": round(1000 * best_of(aggregate, store, args.repeat), 3),
+            "serializedBytesPerFrame": round(len(serialize(store)) / args.frames, 1),
+        }
+    results["memoryRatio"] = round(results['lists']['bytesPerFrame'] / results['timeline']['bytesPerFrame'], 1)
+    results["aggregateSpeedup"] = round(results['lists']['aggregateMs'] / max(results['timeline']['aggregateMs'], 1e-6), 1)
+    results["meansMatch"] = not mismatches
+    print(json.dumps(results, indent=2))
+    if mismatches:
+        print(f"[ERROR] Means differ for: {', '.join(mismatches)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Per-frame cost of the landmark heuristics: scalar protobuf reads per frame vs landmark_features
+(one row read per frame, NumPy over all frames). Also checks on randomized landmark sets that
+both produce identical labels.
+Usage: python benchmarks/bench_landmark_features.py [--frames 2000] [--hands 2]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+from landmark_features import LandmarkBatch
+
+
+def random_landmarks(count: int, rng: random.Random, spread: float = 0.15):
+    """NormalizedLandmarkList around the image centre, like a face/hand/pose graph returns"""
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for _ in range(count):
+        landmarks.landmark.add(x=0.5 + rng.uniform(-spread, spread), y=0.5 + rng.uniform(-spread, spread),
+                               z=rng.uniform(-0.05, 0.05), visibility=rng.uniform(0.7, 1.0))
+    return landmarks
+
+
+def scalar_frame(face_landmarks, multi_hand_landmarks, pose_landmarks, eye_threshold, visibility_threshold):
+    """The heuristics as analyze_frame_realistic computed them before landmark_features (same field reads)"""
+    left_eye_top = face_landmarks.landmark[159]
+    left_eye_bottom = face_landmarks.landmark[145]
+    right_eye_top = face_landmarks.landmark[386]
+    right_eye_bottom = face_landmarks.landmark[374]
+    left_eye_open = abs(left_eye_top.y - left_eye_bottom.y) > eye_threshold
+    right_eye_open = abs(right_eye_top.y - right_eye_bottom.y) > eye_threshold
+    eyes_open = left_eye_open and right_eye_open
+    left_iris = face_landmarks.landmark[468]
+    right_iris = face_landmarks.landmark[473]
+    left_eye_outer = face_landmarks.landmark[33]
+    left_eye_inner = face_landmarks.landmark[133]
+    right_eye_inner = face_landmarks.landmark[362]
+    right_eye_outer = face_landmarks.landmark[263]
+    left_gaze_centered = left_eye_outer.x < left_iris.x < left_eye_inner.x
+    right_gaze_centered = right_eye_inner.x < right_iris.x < right_eye_outer.x
+    gaze_forward = left_gaze_centered and right_gaze_centered
+
+    left_shoulder = pose_landmarks.landmark[11]
+    right_shoulder = pose_landmarks.landmark[12]
+    left_hip = pose_landmarks.landmark[23]
+    right_hip = pose_landmarks.landmark[24]
+    left_elbow = pose_landmarks.landmark[13]
+    right_elbow = pose_landmarks.landmark[14]
+    left_wrist = pose_landmarks.landmark[15]
+    right_wrist = pose_landmarks.landmark[16]
+    confident = all(lm.visibility > visibility_threshold for lm in [left_shoulder, right_shoulder, left_hip, right_hip])
+
+    nose = face_landmarks.landmark[1]
+    left_eye = face_landmarks.landmark[33]
+    right_eye = face_landmarks.landmark[263]
+    chin = face_landmarks.landmark[152]
+    eye_center_x = (left_eye.x + right_eye.x) / 2
+    if nose.x < eye_center_x - 0.01:
+        head_pose = 'left'
+    elif nose.x > eye_center_x + 0.01:
+        head_pose = 'right'
+    elif nose.y < chin.y - 0.02:
+        head_pose = 'up'
+    elif nose.y > chin.y + 0.02:
+        head_pose = 'down'
+    else:
+        head_pose = 'forward'
+    mouth_left = face_landmarks.landmark[61]
+    mouth_right = face_landmarks.landmark[291]
+    mouth_top = face_landmarks.landmark[13]
+    mouth_bottom = face_landmarks.landmark[14]
+    brow_left = face_landmarks.landmark[70]
+    brow_right = face_landmarks.landmark[300]
+    brow_left_top = face_landmarks.landmark[105]
+    brow_right_top = face_landmarks.landmark[334]
+    mouth_width = ((mouth_right.x - mouth_left.x) ** 2 + (mouth_right.y - mouth_left.y) ** 2) ** 0.5
+    mouth_height = ((mouth_top.x - mouth_bottom.x) ** 2 + (mouth_top.y - mouth_bottom.y) ** 2) ** 0.5
+    smile_ratio = mouth_width / (mouth_height + 1e-6)
+    brow_raise = ((brow_left_top.y - brow_left.y) + (brow_right_top.y - brow_right.y)) / 2
+    if smile_ratio > 2.0:
+        emotion = 'happy'
+    elif brow_raise < -0.03:
+        emotion = 'surprised'
+    else:
+        emotion = 'neutral'
+
+    gestures = []
+    for hand_landmarks in multi_hand_landmarks:
+        wrist = hand_landmarks.landmark[0]
+        tip_ids = [4, 8, 12, 16, 20]
+        tip_distances = [((hand_landmarks.landmark[tip].x - wrist.x) ** 2 + (hand_landmarks.landmark[tip].y - wrist.y) ** 2) ** 0.5 for tip in tip_ids]
+        avg_tip_distance = sum(tip_distances) / len(tip_distances)
+        if avg_tip_distance > 0.25:
+            gestures.append('open_palm')
+        elif avg_tip_distance < 0.12:
+            gestures.append('fist')
+        else:
+            gestures.append('other')
+
+    quality = None
+    if confident:
+        left_shoulder = pose_landmarks.landmark[11]
+        right_shoulder = pose_landmarks.landmark[12]
+        left_hip = pose_landmarks.landmark[23]
+        right_hip = pose_landmarks.landmark[24]
+        left_elbow = pose_landmarks.landmark[13]
+        right_elbow = pose_landmarks.landmark[14]
+        left_wrist = pose_landmarks.landmark[15]
+        right_wrist = pose_landmarks.landmark[16]
+        if (left_shoulder.y > left_hip.y + 0.1 and right_shoulder.y > right_hip.y + 0.1):
+            quality = 'slouching'
+        elif (left_shoulder.x < left_hip.x - 0.07 and right_shoulder.x < right_hip.x - 0.07):
+            quality = 'leaning_left'
+        elif (left_shoulder.x > left_hip.x + 0.07 and right_shoulder.x > right_hip.x + 0.07):
+            quality = 'leaning_right'
+        elif (abs(left_wrist.x - right_elbow.x) < 0.07 and abs(right_wrist.x - left_elbow.x) < 0.07):
+            quality = 'arms_crossed'
+        else:
+            quality = 'confident'
+    return eyes_open, gaze_forward, head_pose, emotion, gestures, confident, quality
+
+
+def batched_frames(frames, eye_threshold, visibility_threshold):
+    """landmark_features: read rows per frame, then evaluate every frame at once"""
+    batch = LandmarkBatch()
+    for face, hands, pose in frames:
+        batch.add_frame(face, hands, pose)
+    return batch, batch.features(eye_threshold, visibility_threshold)
+
+
+def batched_rows(batch, features):
+    """The batch features as scalar_frame() tuples, for the parity check"""
+    hand_frames = np.array(batch.hand_frames)
+    gestures = features['gestures']
+    return [
+        (bool(features['eyes_open'][i]), bool(features['gaze_forward'][i]), str(features['head_pose'][i]),
+         str(features['emotion'][i]), gestures[hand_frames == i].tolist(), bool(features['pose_confident'][i]),
+         str(features['posture_quality'][i]) if features['pose_confident'][i] else None)
+        for i in range(batch.frames)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--hands', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    frames = [
+        (random_landmarks(478, rng), [random_landmarks(21, rng, spread=0.3) for _ in range(args.hands)],
+         random_landmarks(33, rng))
+        for _ in range(args.frames)
+    ]
+
+    rows = []
+    for eye_threshold, visibility_threshold in ((0.015, 0.8), (0.012, 0.6)):
+        started = time.perf_counter()
+        scalar = [scalar_frame(*frame, eye_threshold, visibility_threshold) for frame in frames]
+        scalar_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        batch, features = batched_frames(frames, eye_threshold, visibility_threshold)
+        batched_seconds = time.perf_counter() - started
+        mismatches = sum(1 for a, b in zip(scalar, batched_rows(batch, features)) if a != b)
+        rows.append({
+            "eyeThreshold": eye_threshold,
+            "visibilityThreshold": visibility_threshold,
+            "frames": args.frames,
+            "hands": args.hands,
+            "mismatches": mismatches,
+            "scalarMicrosecondsPerFrame": round(scalar_seconds / args.frames * 1e6, 2),
+            "vectorizedMicrosecondsPerFrame": round(batched_seconds / args.frames * 1e6, 2),
+            "speedup": round(scalar_seconds / batched_seconds, 2),
+        })
+        print(f"thresholds={eye_threshold}/{visibility_threshold}: scalar={rows[-1]['scalarMicrosecondsPerFrame']}us  "
+              f"vectorized={rows[-1]['vectorizedMicrosecondsPerFrame']}us  mismatches={mismatches}", file=sys.stderr)
+    print(json.dumps(rows, indent=2))
+    sys.exit(1 if any(row['mismatches'] for row in rows) else 0)
+
+
+if __name__ == '__main__':
+    main()
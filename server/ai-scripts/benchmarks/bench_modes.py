@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Latency and score deviation of the analysis modes (fast / standard / full)
+- Every clip is analyzed in every mode (--repeats times, median latency); graphs come from the
+  mode's model pool, warmed up before timing so model loading is not counted
+- Deviation: absolute difference of each score from the same clip's `full` score, averaged over
+  the clips (mean) and the worst clip (max); `full` is the reference because it samples densest
+- Synthetic clips (benchmarks/synthetic_clips.py) measure latency; deviation needs clips with a
+  person in view, since synthetic clips score zero in every mode
+Usage: python benchmarks/bench_modes.py clip1.mp4 [clip2.webm ...] [--repeats 3] [--scenario "Client Pitch"]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_strict_video_analysis import analyze
+from analysis_modes import ANALYSIS_MODES
+from model_pool import get_pool
+from video_probe import probe_video
+
+SCORES = ('overallScore', 'eyeContactScore', 'facialExpressionScore', 'gestureScore', 'postureScore')
+REFERENCE_MODE = 'full'
+
+
+def run_mode(clip: str, mode: str, scenario: str, repeats: int):
+    """(median seconds, frames analyzed, scores) of one clip in one mode"""
+    durations, result = [], None
+    duration = probe_video(clip).duration or 30.0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = analyze(clip, scenario, duration, mode=mode)
+        durations.append(time.perf_counter() - started)
+    frames = result.get('instrumentation', {}).get('preprocess', {}).get('framesPreprocessed', 0)
+    return statistics.median(durations), frames, {name: result.get(name, 0) for name in SCORES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('clips', nargs='+')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--scenario', default='Job Interview Introduction')
+    args = parser.parse_args()
+
+    for mode in ANALYSIS_MODES:
+        get_pool(ANALYSIS_MODES[mode]['pool']).warm()
+
+    runs = {mode: [] for mode in ANALYSIS_MODES}
+    for clip in args.clips:
+        for mode in ANALYSIS_MODES:
+            seconds, frames, scores = run_mode(clip, mode, args.scenario, args.repeats)
+            runs[mode].append({"clip": os.path.basename(clip), "seconds": round(seconds, 3),
+                               "framesAnalyzed": frames, "scores": scores})
+            print(f"{os.path.basename(clip):<32} {mode:<9} {seconds:7.2f}s {frames:4d} frames "
+                  f"overall={scores['overallScore']}", file=sys.stderr)
+
+    summary = {}
+    for mode, mode_runs in runs.items():
+        deviations = {name: [abs(run["scores"][name] - reference["scores"][name])
+                             for run, reference in zip(mode_runs, runs[REFERENCE_MODE])]
+                      for name in SCORES}
+        summary[mode] = {
+            "medianSeconds": round(statistics.median(run["seconds"] for run in mode_runs), 3),
+            "meanFramesAnalyzed": round(statistics.mean(run["framesAnalyzed"] for run in mode_runs), 1),
+            "meanAbsDeviation": {name: round(statistics.mean(values), 2) for name, values in deviations.items()},
+            "maxAbsDeviation": {name: max(values) for name, values in deviations.items()},
+        }
+    print(json.dumps({"reference": REFERENCE_MODE, "clips": len(args.clips), "summary": summary, "runs": runs},
+                     indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Person detector backends on CPU: ultralytics/PyTorch vs ONNX Runtime (fp32 and int8)
+- Parity: person counts per frame of every ONNX variant against ultralytics on the same frames
+  (ultralytics' sample images with people, plus frames sampled from --video or a synthetic clip);
+  exits 1 when the fp32 ONNX model disagrees on any frame (int8 is reported, not enforced)
+- Throughput: frames per second per backend, batch size and ONNX intra-op thread count
+- Import cost: seconds to import ultralytics vs onnxruntime in a fresh interpreter
+Usage: python benchmarks/bench_onnx_detector.py [--video clip.mp4] [--batch-sizes 1 8] [--threads 1 2 0]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+
+from frame_sampler import FrameSampler, sample_indices
+from model_registry import resolve_weights
+from person_detector import OnnxPersonDetector, count_persons, get_person_detector
+from synthetic_clips import make_clip
+from video_probe import probe_video
+
+
+def import_seconds(module: str) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', f'import {module}'], check=True)
+    return time.perf_counter() - started
+
+
+def sample_frames(video: str, samples: int):
+    frames = []
+    try:
+        from ultralytics.utils import ASSETS
+        frames += [cv2.imread(str(ASSETS / name)) for name in ('bus.jpg', 'zidane.jpg')]
+    except ImportError:
+        pass
+    total_frames = probe_video(video).frames
+    frames += [frame for _, _, frame in FrameSampler(video, sample_indices(total_frames, samples))]
+    return frames
+
+
+def throughput(detector, frames, batch_size: int):
+    """Frames per second and per-frame person counts (frames are grouped by shape into batches)"""
+    counts = []
+    started = time.perf_counter()
+    for start in range(0, len(frames), batch_size):
+        batch = frames[start:start + batch_size]
+        if len({frame.shape for frame in batch}) > 1:
+            for frame in batch:
+                counts.extend(count_persons(detector, [frame]))
+        else:
+            counts.extend(count_persons(detector, batch))
+    return len(frames) / (time.perf_counter() - started), counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--video', help='clip to sample frames from (default: synthetic 720p clip)')
+    parser.add_argument('--samples', type=int, default=48)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 0],
+                        help='ONNX Runtime intra-op threads to try (0 = all cores)')
+    args = parser.parse_args()
+
+    video = args.video or make_clip(1280, 720, 10, fps=30, gop=60)
+    frames = sample_frames(video, args.samples)
+    reference = get_person_detector('ultralytics')
+    reference_counts = [count_persons(reference, [frame])[0] for frame in frames]
+
+    results = {
+        "frames": len(frames),
+        "importSeconds": {module: round(import_seconds(module), 2) for module in ('ultralytics', 'onnxruntime')},
+        "parity": {},
+        "throughput": [],
+    }
+    for batch_size in args.batch_sizes:
+        fps, _ = throughput(reference, frames, batch_size)
+        results["throughput"].append({"backend": "ultralytics", "batchSize": batch_size,
+                                      "framesPerSecond": round(fps, 2)})
+        print(f"ultralytics batch={batch_size:>3}: {fps:7.2f} fps", file=sys.stderr)
+
+    failed = False
+    for name in ('yolov8n-onnx', 'yolov8n-onnx-int8'):
+        path = resolve_weights(name)
+        for threads in args.threads:
+            detector = OnnxPersonDetector(path, threads=threads)
+            count_persons(detector, frames[:1])  # warmup
+            for batch_size in args.batch_sizes:
+                fps, counts = throughput(detector, frames, batch_size)
+                results["throughput"].append({"backend": name, "threads": threads, "batchSize": batch_size,
+                                              "framesPerSecond": round(fps, 2)})
+                print(f"{name} threads={threads} batch={batch_size:>3}: {fps:7.2f} fps", file=sys.stderr)
+        matching = sum(a == b for a, b in zip(counts, reference_counts))
+        results["parity"][name] = {
+            "framesMatching": matching,
+            "agreement": round(matching / len(frames), 4),
+            "personsReference": sum(reference_counts),
+            "persons": sum(counts),
+        }
+        failed = failed or (name == 'yolov8n-onnx' and matching != len(frames))
+
+    print(json.dumps(results, indent=2))
+    if failed:
+        print("[ERROR] fp32 ONNX person counts differ from ultralytics", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Per-resolution-tier throughput: full-resolution MediaPipe input vs FramePreprocessor downscaling
+Usage: python benchmarks/bench_preprocess.py [--frames 30] [--tiers 480p 720p 1080p 1440p]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_preprocess import FramePreprocessor
+from frame_sampler import FrameSampler
+from model_pool import MODEL_CONFIGS, MediaPipeModels
+from synthetic_clips import make_clip
+
+TIER_SIZES = {'480p': (854, 480), '720p': (1280, 720), '1080p': (1920, 1080), '1440p': (2560, 1440)}
+
+
+def run(models, frames, resize) -> float:
+    """Seconds per frame for preprocessing + the three graphs"""
+    preprocessor = FramePreprocessor(resize)
+    models.reset()
+    started = time.perf_counter()
+    for frame in frames:
+        inputs = preprocessor.prepare(frame)
+        models.face_mesh.process(inputs['face_mesh'])
+        models.hands.process(inputs['hands'])
+        models.pose.process(inputs['pose'])
+    return (time.perf_counter() - started) / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--tiers', nargs='+', default=list(TIER_SIZES))
+    args = parser.parse_args()
+
+    models = MediaPipeModels(MODEL_CONFIGS['strict'])
+    rows = []
+    for tier in args.tiers:
+        width, height = TIER_SIZES[tier]
+        path = make_clip(width, height, seconds=max(2, args.frames / 30), fps=30, gop=30)
+        frames = [frame for _, _, frame in FrameSampler(path, range(args.frames))]
+        full = run(models, frames, False)
+        resized = run(models, frames, None)
+        rows.append({
+            "tier": tier,
+            "fullResolutionFps": round(1 / full, 2),
+            "resizedFps": round(1 / resized, 2),
+            "throughputGain": round(full / resized, 2),
+        })
+        print(f"{tier:>6}: full={1 / full:6.2f} fps  resized={1 / resized:6.2f} fps  "
+              f"gain={rows[-1]['throughputGain']}x", file=sys.stderr)
+    models.close()
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Cold-start report: import cost of every entry point, from `python -X importtime` in a fresh interpreter
+- Per entry point: wall seconds of `python -c "import <module>"` (interpreter start included),
+  the summed -X importtime cumulative time, and the heaviest packages it pulls in
+- Heavy backends (mediapipe, torch/ultralytics, onnxruntime, PyAV, imageio) are listed per entry
+  point, so an eager import that creeps back in shows up by name
+- --check exits 1 when the CLI or the Flask app misses its cold-start target (COLD_START_TARGETS,
+  seconds of wall time; override with --cli-target / --app-target)
+Usage: python benchmarks/bench_startup.py [--top 8] [--repeats 3] [--check]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = (
+    'ai_strict_video_analysis', 'real_ai_analysis', 'segmented_analysis', 'video_analysis',
+    'video_analysis_latest', 'video_analysis_opencv', 'app',
+)
+HEAVY_BACKENDS = ('mediapipe', 'torch', 'ultralytics', 'onnxruntime', 'av', 'imageio')
+
+# Wall seconds to import the CLI entry point (ai_strict_video_analysis, which the Node fallback
+# spawns) and the Flask app module that every gunicorn worker imports before serving. Measured on a
+# 1-vCPU container, Python 3.13: 1.23 s / 1.60 s with eager mediapipe, 0.26 s / 0.61 s deferred
+COLD_START_TARGETS = {'ai_strict_video_analysis': 0.5, 'app': 1.0}
+
+
+def import_report(module: str, top: int):
+    """(wall seconds, importtime total ms, heaviest packages, heavy backends loaded)"""
+    # Warmup runs in the background of a worker, so it is off here: this measures the import alone
+    env = dict(os.environ, AI_MODEL_POOL_WARMUP='0')
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=SCRIPTS_DIR, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {completed.stderr.strip().splitlines()[-1]}")
+    total_ms, packages, loaded = 0.0, [], set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        ms = int(cumulative) / 1000
+        loaded.add(name.strip())
+        # Nested imports are indented under their importer; only top-level ones add up to the total
+        if not name[1:].startswith(' '):
+            total_ms += ms
+        # Package roots (imported once each, at whatever depth) show where the time goes
+        if '.' not in name and name.strip() != module:
+            packages.append((name.strip(), ms))
+    heaviest = sorted(packages, key=lambda item: -item[1])[:top]
+    heavy = [backend for backend in HEAVY_BACKENDS if backend in loaded]
+    return wall, total_ms, heaviest, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modules', nargs='+', default=list(ENTRY_POINTS))
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--repeats', type=int, default=3, help='runs per module; the median wall time is kept')
+    parser.add_argument('--check', action='store_true', help='exit 1 when a cold-start target is missed')
+    parser.add_argument('--cli-target', type=float, default=COLD_START_TARGETS['ai_strict_video_analysis'])
+    parser.add_argument('--app-target', type=float, default=COLD_START_TARGETS['app'])
+    args = parser.parse_args()
+    targets = {'ai_strict_video_analysis': args.cli_target, 'app': args.app_target}
+
+    results, missed = {}, []
+    for module in args.modules:
+        try:
+            runs = [import_report(module, args.top) for _ in range(max(1, args.repeats))]
+        except RuntimeError as e:
+            results[module] = {"error": str(e)}
+            print(f"{module:<26} error: {e}", file=sys.stderr)
+            continue
+        wall = statistics.median(run[0] for run in runs)
+        _, total_ms, heaviest, heavy = runs[-1]
+        results[module] = {
+            "wallSeconds": round(wall, 3),
+            "importTimeMs": round(total_ms, 1),
+            "heaviest": [{"module": name, "ms": round(ms, 1)} for name, ms in heaviest],
+            "heavyBackends": heavy,
+        }
+        target = targets.get(module)
+        if target is not None:
+            results[module]["targetSeconds"] = target
+            if wall > target:
+                missed.append(module)
+        print(f"{module:<26} {wall:6.2f}s wall {total_ms:8.1f} ms imports  heavy: {', '.join(heavy) or '-'}"
+              + (f"  (target {target:g}s)" if target is not None else ''), file=sys.stderr)
+
+    print(json.dumps({"python": sys.version.split()[0], "modules": results}, indent=2))
+    if args.check and missed:
+        print(f"[ERROR] Cold-start target missed: {', '.join(missed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite for every analyzer entry point on deterministic synthetic clips
+- Clip matrix: resolutions x durations x codecs x GOP lengths (--preset quick/full, or set each axis)
+- Entry points: strict (ai_strict_video_analysis.analyze), real (RealVideoAnalyzer),
+  opencv (OpenCVVideoAnalyzer), yolo (VideoAnalyzer), latest (video_analysis_latest.analyze_video)
+- Each (entry point, clip) runs in a fresh interpreter, so model loading, imports and peak RSS are
+  measured per run rather than shared; a run that crashes or times out is recorded as failed and
+  the suite moves on (an analyzer's own "No person detected" result still counts as a run)
+- Per run: wall seconds (import, setup = model load, analyze), frames analyzed, frames per second,
+  peak RSS, and every *Seconds / *Ms figure found in the result's instrumentation block (per stage)
+- --output baseline.json writes the runs; --compare baseline.json diffs against a saved baseline
+  and exits 1 when fps, analyze time or peak RSS regresses beyond --tolerance (default 0.10)
+Usage: python benchmarks/bench_suite.py [--preset quick] [--entry-points strict yolo] [--output baseline.json]
+       python benchmarks/bench_suite.py --compare baseline.json [--tolerance 0.1]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_clips import make_clip
+
+ENTRY_POINTS = ('strict', 'real', 'opencv', 'yolo', 'latest')
+
+PRESETS = {
+    'quick': {'resolutions': ['640x360', '1280x720'], 'durations': [10], 'codecs': ['h264'], 'gops': [250]},
+    'full': {'resolutions': ['640x360', '1280x720', '1920x1080'], 'durations': [10, 60],
+             'codecs': ['h264', 'vp8'], 'gops': [30, 250]},
+}
+
+SCENARIO = 'Job Interview Introduction'
+
+
+def peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def stage_timings(block, prefix: str = '') -> dict:
+    """Flatten the *Seconds / *Ms / *MsPerFrame figures of an instrumentation block into dotted keys"""
+    stages = {}
+    if not isinstance(block, dict):
+        return stages
+    for key, value in block.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            stages.update(stage_timings(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and \
+                key.endswith(('Seconds', 'Ms', 'MsPerFrame')):
+            stages[name] = value
+    return stages
+
+
+def frames_analyzed(entry_point: str, result: dict, analyzer=None) -> int:
+    """Frames that went through the models, read from each analyzer's own bookkeeping"""
+    instrumentation = result.get('instrumentation') or {}
+    if entry_point in ('strict', 'real'):
+        return instrumentation.get('preprocess', {}).get('framesPreprocessed', 0)
+    if entry_point == 'yolo':
+        return instrumentation.get('presence', {}).get('detectionsRun', 0)
+    if entry_point == 'latest':
+        return instrumentation.get('inference', {}).get('framesInferred', 0)
+    return len(analyzer.face_detection_data)  # opencv keeps one entry per analyzed frame
+
+
+def run_entry_point(entry_point: str, clip: str, duration: float) -> dict:
+    """Import, set up and run one entry point on one clip in this process (the --worker side)"""
+    started = time.perf_counter()
+    analyzer = None
+    if entry_point == 'strict':
+        import ai_strict_video_analysis
+        from model_pool import get_pool
+        imported = time.perf_counter()
+        get_pool('strict').warm()
+        setup = time.perf_counter()
+        result = ai_strict_video_analysis.analyze(clip, SCENARIO, duration)
+    elif entry_point == 'latest':
+        import video_analysis_latest
+        from person_detector import get_person_detector
+        imported = time.perf_counter()
+        get_person_detector()
+        setup = time.perf_counter()
+        result = video_analysis_latest.analyze_video(clip, SCENARIO, duration)
+    else:
+        if entry_point == 'real':
+            from real_ai_analysis import RealVideoAnalyzer as Analyzer
+        elif entry_point == 'opencv':
+            from video_analysis_opencv import OpenCVVideoAnalyzer as Analyzer
+        else:
+            from video_analysis import VideoAnalyzer as Analyzer
+        imported = time.perf_counter()
+        analyzer = Analyzer()
+        setup = time.perf_counter()
+        result = analyzer.analyze_video(clip, SCENARIO, duration)
+    finished = time.perf_counter()
+
+    frames = frames_analyzed(entry_point, result, analyzer)
+    analyze_seconds = finished - setup
+    return {
+        "status": result.get('status', 'success'),
+        "importSeconds": round(imported - started, 3),
+        "setupSeconds": round(setup - imported, 3),
+        "analyzeSeconds": round(analyze_seconds, 3),
+        "wallSeconds": round(finished - started, 3),
+        "framesAnalyzed": frames,
+        "framesPerSecond": round(frames / analyze_seconds, 2) if analyze_seconds else None,
+        "peakRssMb": peak_rss_mb(),
+        "stages": stage_timings(result.get('instrumentation')),
+    }
+
+
+def run_isolated(entry_point: str, clip: str, duration: float, timeout: float) -> dict:
+    """Run one entry point in a fresh interpreter; failures come back as an error record"""
+    command = [sys.executable, os.path.abspath(__file__), '--worker', entry_point, clip, str(duration)]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"failed": True, "error": f"timed out after {timeout:g}s"}
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return {"failed": True, "error": lines[-1] if lines else f"exit code {completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def clip_matrix(args):
+    for resolution, seconds, codec, gop in itertools.product(args.resolutions, args.durations, args.codecs, args.gops):
+        width, height = (int(value) for value in resolution.split('x'))
+        yield {"resolution": resolution, "seconds": seconds, "codec": codec, "gop": gop,
+               "path": make_clip(width, height, seconds, fps=args.fps, gop=gop, codec=codec)}
+
+
+def run_key(run: dict) -> str:
+    return f"{run['entryPoint']}/{run['resolution']}/{run['seconds']:g}s/{run['codec']}/gop{run['gop']}"
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list:
+    """Rows for the runs present in both; a row regresses when a metric is worse by more than tolerance"""
+    previous = {run_key(run): run for run in baseline['runs']}
+    rows = []
+    for run in current['runs']:
+        before = previous.get(run_key(run))
+        if not before or before.get('failed') or run.get('failed'):
+            continue
+        row = {"run": run_key(run), "regressions": []}
+        # (metric, True when higher is better)
+        for metric, higher_is_better in (('framesPerSecond', True), ('analyzeSeconds', False), ('peakRssMb', False)):
+            old, new = before.get(metric), run.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            row[metric] = {"baseline": old, "current": new, "ratio": round(ratio, 3)}
+            if (ratio < 1 - tolerance) if higher_is_better else (ratio > 1 + tolerance):
+                row["regressions"].append(metric)
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--worker', nargs=3, metavar=('ENTRY_POINT', 'CLIP', 'DURATION'), help=argparse.SUPPRESS)
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='quick')
+    parser.add_argument('--resolutions', nargs='+', help='WIDTHxHEIGHT values (overrides the preset)')
+    parser.add_argument('--durations', type=float, nargs='+', help='clip seconds (overrides the preset)')
+    parser.add_argument('--codecs', nargs='+', help='h264, vp8, vp9 (overrides the preset)')
+    parser.add_argument('--gops', type=int, nargs='+', help='GOP lengths in frames (overrides the preset)')
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--entry-points', nargs='+', choices=ENTRY_POINTS, default=list(ENTRY_POINTS))
+    parser.add_argument('--timeout', type=float, default=900, help='seconds per run before it is recorded as failed')
+    parser.add_argument('--output', help='write the runs to this JSON baseline')
+    parser.add_argument('--compare', help='baseline JSON to compare the runs against')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='allowed relative regression (0.10 = 10%%)')
+    args = parser.parse_args()
+
+    if args.worker:
+        entry_point, clip, duration = args.worker
+        print(json.dumps(run_entry_point(entry_point, clip, float(duration))))
+        return
+
+    for axis, values in PRESETS[args.preset].items():
+        if getattr(args, axis) is None:
+            setattr(args, axis, values)
+
+    results = {
+        "host": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "runs": [],
+    }
+    for clip in clip_matrix(args):
+        for entry_point in args.entry_points:
+            run = {"entryPoint": entry_point, **{key: clip[key] for key in ('resolution', 'seconds', 'codec', 'gop')}}
+            run.update(run_isolated(entry_point, clip['path'], clip['seconds'], args.timeout))
+            results["runs"].append(run)
+            if run.get('failed'):
+                print(f"{run_key(run):<40} error: {run['error']}", file=sys.stderr)
+            else:
+                print(f"{run_key(run):<40} {run['framesPerSecond'] or 0:7.2f} fps  {run['analyzeSeconds']:7.2f}s  "
+                      f"{run['peakRssMb']:7.1f} MB", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            rows = compare(json.load(f), results, args.tolerance)
+        results["comparison"] = rows
+        regressed = [row for row in rows if row["regressions"]]
+        for row in regressed:
+            print(f"[WARN] {row['run']} regressed: {', '.join(row['regressions'])}", file=sys.stderr)
+    print(json.dumps(results, indent=2))
+    if args.compare and regressed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+YOLOv8 throughput on CPU: one forward pass per sampled frame vs batched passes
+Usage: python benchmarks/bench_yolo_batch.py [--samples 50] [--batch-sizes 1 4 8 16]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sampler import FrameSampler, sample_indices
+from model_registry import get_model
+from synthetic_clips import make_clip
+from video_probe import probe_video
+from person_detector import count_persons
+
+
+def run(model, frames, batch_size):
+    """Frames per second and per-frame person counts for one batch size"""
+    counts = []
+    started = time.perf_counter()
+    for start in range(0, len(frames), batch_size):
+        counts.extend(count_persons(model, frames[start:start + batch_size]))
+    return len(frames) / (time.perf_counter() - started), counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--seconds', type=float, default=30)
+    parser.add_argument('--samples', type=int, default=50)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    path = make_clip(args.width, args.height, args.seconds, fps=30, gop=60)
+    total_frames = probe_video(path).frames
+    frames = [frame for _, _, frame in FrameSampler(path, sample_indices(total_frames, args.samples))]
+    model = get_model('yolov8n')
+
+    rows = []
+    baseline_fps, baseline_counts = None, None
+    for batch_size in args.batch_sizes:
+        fps, counts = run(model, frames, batch_size)
+        if baseline_fps is None:
+            baseline_fps, baseline_counts = fps, counts
+        rows.append({
+            "batchSize": batch_size,
+            "framesPerSecond": round(fps, 2),
+            "speedup": round(fps / baseline_fps, 2),
+            "countsMatch": counts == baseline_counts,
+        })
+        print(f"batch={batch_size:>3}: {fps:7.2f} fps  speedup={rows[-1]['speedup']}x  "
+              f"counts match={rows[-1]['countsMatch']}", file=sys.stderr)
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic test clips for the analyzer benchmarks
+- Uses ffmpeg (testsrc2 pattern) when it is on PATH, so codec and GOP length are controllable
+- Falls back to cv2.VideoWriter (mp4v, encoder-chosen GOP) otherwise
+- Clips are cached by their parameters, so repeated runs reuse the same files
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+CODECS = {
+    'h264': ('libx264', '.mp4', ['-pix_fmt', 'yuv420p']),
+    'vp8': ('libvpx', '.webm', ['-b:v', '1M']),
+    'vp9': ('libvpx-vp9', '.webm', ['-b:v', '1M']),
+}
+
+DEFAULT_CLIP_DIR = os.path.join(tempfile.gettempdir(), 'tawasl-bench-clips')
+
+
+def clip_name(width: int, height: int, seconds: float, fps: int, gop: int, codec: str) -> str:
+    extension = CODECS[codec][1]
+    return f"synthetic_{width}x{height}_{seconds:g}s_{fps}fps_gop{gop}_{codec}{extension}"
+
+
+def make_clip(width: int = 1280, height: int = 720, seconds: float = 10, fps: int = 30,
+              gop: int = 250, codec: str = 'h264', clip_dir: str = DEFAULT_CLIP_DIR) -> str:
+    """Create (or reuse) a synthetic clip and return its path"""
+    os.makedirs(clip_dir, exist_ok=True)
+    path = os.path.join(clip_dir, clip_name(width, height, seconds, fps, gop, codec))
+    if os.path.exists(path):
+        return path
+    if shutil.which('ffmpeg'):
+        encoder, _, extra = CODECS[codec]
+        subprocess.run(
+            ['ffmpeg', '-y', '-loglevel', 'error',
+             '-f', 'lavfi', '-i', f'testsrc2=size={width}x{height}:rate={fps}',
+             '-t', str(seconds), '-c:v', encoder, '-g', str(gop), '-keyint_min', str(gop),
+             *extra, path],
+            check=True,
+        )
+        return path
+    return _make_clip_opencv(path, width, height, seconds, fps)
+
+
+def _make_clip_opencv(path: str, width: int, height: int, seconds: float, fps: int) -> str:
+    import cv2
+    import numpy as np
+
+    path = os.path.splitext(path)[0] + '_opencv.mp4'
+    if os.path.exists(path):
+        return path
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    for i in range(int(seconds * fps)):
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        frame[:, :, 0] = (x + i * 3) % 256
+        frame[:, :, 1] = ((x[::-1] + i * 5) % 256)
+        frame[:, :, 2] = (i * 7) % 256
+        cv2.putText(frame, f"{i:05d}", (width // 3, height // 2), cv2.FONT_HERSHEY_SIMPLEX,
+                    height / 200, (255, 255, 255), max(1, height // 150))
+        writer.write(frame)
+    writer.release()
+    return path
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Resolution-tiered pre-inference stage for the MediaPipe graphs
+- Downscales each BGR frame (aspect preserved) to a target long edge per model before
+  the BGR->RGB conversion, so cvtColor and the graph input copy touch far fewer pixels
+- FaceMesh/Hands/Pose resize to small tensors internally and return normalized
+  landmarks, so scores computed from normalized coordinates are unchanged
+- Inputs are built lazily per model, so graphs that are skipped cost nothing here;
+  smaller targets are derived from an already reduced image when one exists
+- Targets: dict per model, one int for every model, or 0/False to pass frames through
+"""
+
+import os
+import time
+from typing import Any, Dict, Optional
+
+import cv2
+import numpy as np
+
+MODELS = ('face_mesh', 'hands', 'pose')
+
+DEFAULT_TARGET_LONG_EDGE = {'face_mesh': 640, 'hands': 640, 'pose': 512}
+
+# (minimum short edge, tier name)
+RESOLUTION_TIERS = ((2160, '2160p'), (1440, '1440p'), (1080, '1080p'), (720, '720p'), (480, '480p'), (0, 'sd'))
+
+
+def resolution_tier(width: int, height: int) -> str:
+    short_edge = min(width, height)
+    for min_short_edge, name in RESOLUTION_TIERS:
+        if short_edge >= min_short_edge:
+            return name
+    return 'sd'
+
+
+def parse_target_long_edge(value: Any) -> Optional[Dict[str, int]]:
+    """Normalize a request/env value into {model: long edge}; None means use the defaults"""
+    if value is None or value == '' or value is True:
+        return None
+    if value is False or str(value).lower() in ('0', 'false', 'off', 'none'):
+        return {model: 0 for model in MODELS}
+    if isinstance(value, dict):
+        targets = dict(DEFAULT_TARGET_LONG_EDGE)
+        targets.update({model: int(edge) for model, edge in value.items() if model in MODELS})
+        return targets
+    return {model: int(value) for model in MODELS}
+
+
+ENV_TARGET_LONG_EDGE = parse_target_long_edge(os.environ.get('AI_RESIZE_LONG_EDGE'))
+
+
+class FramePreprocessor:
+    """Turns a BGR frame into one RGB input per model and keeps per-request instrumentation"""
+
+    def __init__(self, target_long_edge: Any = None):
+        targets = parse_target_long_edge(target_long_edge) or ENV_TARGET_LONG_EDGE or DEFAULT_TARGET_LONG_EDGE
+        self.target_long_edge = {model: int(targets.get(model, 0)) for model in MODELS}
+        self.frames = 0
+        self.seconds = 0.0
+        self.source_shape = None
+        self.input_shapes: Dict[str, tuple] = {}
+
+    def prepare(self, frame: np.ndarray) -> 'PreparedFrame':
+        """Per-model RGB inputs for one frame, built lazily on first access"""
+        height, width = frame.shape[:2]
+        self.source_shape = (width, height)
+        self.frames += 1
+        return PreparedFrame(self, frame)
+
+    def report(self, loop_seconds: float = None) -> Dict[str, Any]:
+        """Instrumentation block: tier, model input sizes, pixel reduction and throughput"""
+        if not self.source_shape:
+            return {"framesPreprocessed": 0}
+        width, height = self.source_shape
+        source_pixels = width * height
+        model_pixels = sum(w * h for w, h in self.input_shapes.values())
+        report = {
+            "resolutionTier": resolution_tier(width, height),
+            "sourceResolution": f"{width}x{height}",
+            "targetLongEdge": self.target_long_edge,
+            "modelInputs": {model: f"{w}x{h}" for model, (w, h) in self.input_shapes.items()},
+            # Share of the source pixels the graphs receive compared with full-resolution input
+            "pixelRatio": round(model_pixels / (source_pixels * max(1, len(self.input_shapes))), 4),
+            "framesPreprocessed": self.frames,
+            "preprocessMsPerFrame": round(1000 * self.seconds / self.frames, 3),
+        }
+        if loop_seconds:
+            report["framesPerSecond"] = round(self.frames / loop_seconds, 2)
+        return report
+
+
+class PreparedFrame:
+    """Mapping of model name -> RGB input; each size is resized and converted at most once"""
+
+    def __init__(self, preprocessor: FramePreprocessor, frame: np.ndarray):
+        self._preprocessor = preprocessor
+        self._frame = frame
+        self._long_edge = max(frame.shape[:2])
+        self._bgr_by_edge = {self._long_edge: frame}
+        self._rgb_by_edge = {}
+
+    def __getitem__(self, model: str) -> np.ndarray:
+        edge = self._preprocessor.target_long_edge[model]
+        edge = min(edge, self._long_edge) if edge > 0 else self._long_edge
+        rgb = self._rgb_by_edge.get(edge)
+        if rgb is None:
+            started = time.perf_counter()
+            # Resize from the smallest already reduced image that is still large enough
+            base_edge = min(e for e in self._bgr_by_edge if e >= edge)
+            bgr = self._bgr_by_edge[base_edge]
+            if edge < base_edge:
+                scale = edge / base_edge
+                size = (max(1, round(bgr.shape[1] * scale)), max(1, round(bgr.shape[0] * scale)))
+                bgr = cv2.resize(bgr, size, interpolation=cv2.INTER_AREA)
+                self._bgr_by_edge[edge] = bgr
+            rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+            self._rgb_by_edge[edge] = rgb
+            self._preprocessor.seconds += time.perf_counter() - started
+        self._preprocessor.input_shapes[model] = rgb.shape[1::-1]
+        return rgb
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Sequential-decode frame sampler shared by the analyzer scripts
+- Walks the stream once instead of seeking with CAP_PROP_POS_FRAMES per sample
+  (every seek decodes again from the previous keyframe, so long GOPs made sampling quadratic)
+- Skips unwanted frames with grab() and only converts target frames with retrieve()
+- Yields (index, timestamp, frame) tuples; frames are BGR for OpenCV/PyAV and RGB for imageio
+- 'keyframe' mode (PyAV) decodes only keyframes and picks the nearest one to each target;
+  non-key packets are never decoded. Falls back to the sequential walk without PyAV.
+"""
+
+import os
+import sys
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+SAMPLING_MODES = ('sequential', 'keyframe')
+DEFAULT_SAMPLING_MODE = os.environ.get('AI_SAMPLING_MODE', 'sequential')
+
+
+def sample_indices(total_frames: int, sample_count: int) -> List[int]:
+    """Evenly spaced frame indices, same spacing the analyzers used with per-sample seeks"""
+    if sample_count <= 0:
+        return []
+    return [int(i * total_frames / sample_count) for i in range(sample_count)]
+
+
+class FrameSampler:
+    """Iterates (index, timestamp, frame) for the requested frames of a video in one pass.
+
+    - indices: explicit frame indices (any order, duplicates are yielded as often as requested)
+    - step/start: every step-th frame from start until the stream ends
+    - neither: every frame
+    In 'keyframe' mode each keyframe is yielded at most once, however many targets share it.
+    seek=True jumps to the first target with a single absolute seek before walking, so the walk
+    may start deep into the file (segments) or on a capture that was already read (later
+    adaptive rounds).
+    """
+
+    def __init__(self, source, indices: Optional[Iterable[int]] = None, step: Optional[int] = None,
+                 start: int = 0, backend: str = 'opencv', mode: str = None, seek: bool = False):
+        self.source = source
+        self.seek = seek
+        self.mode = mode or DEFAULT_SAMPLING_MODE
+        if self.mode not in SAMPLING_MODES:
+            raise ValueError(f"Unknown sampling mode: {self.mode}")
+        self.indices = sorted(indices) if indices is not None else None
+        self.step = max(1, int(step)) if step else None
+        self.start = start
+        self.backend = backend
+        self._targets = Counter(self.indices) if self.indices is not None else None
+        self.frames_decoded = 0
+        self.frames_retrieved = 0
+
+    def __iter__(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        if self.backend == 'imageio':
+            return self._iter_imageio()
+        if self.mode == 'keyframe' and isinstance(self.source, str):
+            try:
+                import av  # noqa: F401
+                return self._iter_keyframes()
+            except ImportError:
+                print("[WARN] PyAV not installed, keyframe sampling falls back to sequential decode", file=sys.stderr)
+        return self._iter_opencv()
+
+    def _wanted(self, index: int) -> int:
+        """How many times frame `index` should be yielded"""
+        if self.indices is not None:
+            return self._targets.get(index, 0)
+        if self.step is not None:
+            return 1 if index >= self.start and (index - self.start) % self.step == 0 else 0
+        return 1
+
+    def _last_index(self) -> Optional[int]:
+        if self.indices is None:
+            return None
+        return self.indices[-1] if self.indices else -1
+
+    def _iter_opencv(self):
+        import cv2
+
+        owns_capture = isinstance(self.source, str)
+        cap = cv2.VideoCapture(self.source) if owns_capture else self.source
+        last_index = self._last_index()
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0
+        index = 0
+        first_index = self.indices[0] if self.indices else self.start
+        if self.seek:
+            # Absolute, so an already read capture is repositioned too (even back to frame 0)
+            cap.set(cv2.CAP_PROP_POS_FRAMES, first_index)
+            index = first_index
+        try:
+            while last_index is None or index <= last_index:
+                if not cap.grab():
+                    break
+                self.frames_decoded += 1
+                repeats = self._wanted(index)
+                if repeats:
+                    ok, frame = cap.retrieve()
+                    if ok:
+                        self.frames_retrieved += 1
+                        pos_msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+                        timestamp = pos_msec / 1000.0 if pos_msec > 0 else (index / fps if fps else 0.0)
+                        for _ in range(repeats):
+                            yield index, timestamp, frame
+                index += 1
+        finally:
+            if owns_capture:
+                cap.release()
+
+    def _iter_imageio(self):
+        import imageio
+
+        owns_reader = isinstance(self.source, str)
+        reader = imageio.get_reader(self.source) if owns_reader else self.source
+        last_index = self._last_index()
+        fps = reader.get_meta_data().get('fps') or 0
+        try:
+            for index, frame in enumerate(reader.iter_data()):
+                if last_index is not None and index > last_index:
+                    break
+                self.frames_decoded += 1
+                repeats = self._wanted(index)
+                if repeats:
+                    self.frames_retrieved += 1
+                    for _ in range(repeats):
+                        yield index, (index / fps if fps else 0.0), frame
+        finally:
+            if owns_reader:
+                reader.close()
+
+    def _iter_keyframes(self):
+        import av
+
+        container = av.open(self.source)
+        try:
+            stream = container.streams.video[0]
+            # The decoder drops non-key packets without decoding them
+            stream.codec_context.skip_frame = 'NONKEY'
+            fps = float(stream.average_rate or stream.guessed_rate or 0) or 30.0
+            if self.seek and self.indices and self.indices[0] > 0:
+                # Land on the keyframe at or before the first target
+                container.seek(int(self.indices[0] / fps / stream.time_base), stream=stream, backward=True)
+            if self.indices is not None:
+                targets = [index / fps for index in self.indices]
+            else:
+                targets = None  # every keyframe
+            pending = 0
+            previous = None  # (timestamp, frame) of the last keyframe not yet past its targets
+            last_yielded = None
+
+            def emit(timestamp, frame):
+                nonlocal last_yielded
+                if last_yielded == timestamp:
+                    return None
+                last_yielded = timestamp
+                self.frames_retrieved += 1
+                return int(round(timestamp * fps)), timestamp, frame.to_ndarray(format='bgr24')
+
+            for frame in container.decode(stream):
+                self.frames_decoded += 1
+                timestamp = float(frame.time) if frame.time is not None else self.frames_decoded / fps
+                if targets is None:
+                    sample = emit(timestamp, frame)
+                    if sample is not None:
+                        yield sample
+                    continue
+                # Every target before this keyframe goes to whichever neighbour is closer
+                while pending < len(targets) and targets[pending] <= timestamp:
+                    target = targets[pending]
+                    pending += 1
+                    if previous is not None and target - previous[0] <= timestamp - target:
+                        chosen = previous
+                    else:
+                        chosen = (timestamp, frame)
+                    sample = emit(*chosen)
+                    if sample is not None:
+                        yield sample
+                if pending >= len(targets):
+                    break
+                previous = (timestamp, frame)
+            if targets is not None and pending < len(targets) and previous is not None:
+                sample = emit(*previous)
+                if sample is not None:
+                    yield sample
+        finally:
+            container.close()
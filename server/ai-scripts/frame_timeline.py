@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Typed per-frame timeline for RealVideoAnalyzer
+- One packed NumPy structured row per analyzed frame (11 bytes): time as float32, the four
+  per-metric scores and the overall score as uint8, face/hands detected as bool
+- Replaces frame_analysis_data (one dict per frame) and the five parallel score lists; a
+  column is a strided view of the rows, so per-metric means and rates are single reductions
+- Storage only: RealVideoAnalyzer.calculate_scores still reads its fallback lists, so the
+  reported scores are unchanged; the column means are reported as instrumentation
+- Preallocated from the planned sample count and grown geometrically if more frames arrive
+- to_bytes()/from_bytes() give a compact binary form (header + raw rows) that segmented
+  analysis ships between processes instead of pickled lists and dicts
+"""
+
+import struct
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+TIMELINE_DTYPE = np.dtype([
+    ('time', '<f4'),
+    ('eye_contact', 'u1'),
+    ('expression', 'u1'),
+    ('gesture', 'u1'),
+    ('posture', 'u1'),
+    ('overall', 'u1'),
+    ('face_detected', '?'),
+    ('hands_detected', '?'),
+])
+SCORE_COLUMNS = ('eye_contact', 'expression', 'gesture', 'posture', 'overall')
+FLAG_COLUMNS = ('face_detected', 'hands_detected')
+
+# Binary form: magic, dtype size (guards against reading rows of another layout), row count
+HEADER = struct.Struct('<4sHI')
+MAGIC = b'FTL1'
+
+
+class FrameTimeline:
+    """Preallocated structured array of per-frame rows; len() is the number of frames stored"""
+
+    def __init__(self, capacity: int = 0):
+        self.rows = np.zeros(max(0, capacity), dtype=TIMELINE_DTYPE)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def reserve(self, capacity: int):
+        """Make room for at least capacity frames in total without reallocating later"""
+        if capacity > len(self.rows):
+            rows = np.zeros(capacity, dtype=TIMELINE_DTYPE)
+            rows[:self.size] = self.rows[:self.size]
+            self.rows = rows
+
+    def _claim(self, count: int) -> np.ndarray:
+        """View of the next count free rows, growing the buffer (x2) when it is full"""
+        end = self.size + count
+        if end > len(self.rows):
+            self.reserve(max(end, 2 * len(self.rows)))
+        view = self.rows[self.size:end]
+        self.size = end
+        return view
+
+    def extend(self, **columns):
+        """Append frames given as equal-length column arrays (missing columns stay zero)"""
+        count = len(next(iter(columns.values()))) if columns else 0
+        view = self._claim(count)
+        for name, values in columns.items():
+            view[name] = values
+
+    def append_timeline(self, other: 'FrameTimeline'):
+        """Append another timeline's frames (segments are merged in time order)"""
+        self._claim(len(other))[:] = other.frames
+
+    @property
+    def frames(self) -> np.ndarray:
+        """The stored rows (a view; columns are frames['eye_contact'] etc.)"""
+        return self.rows[:self.size]
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * TIMELINE_DTYPE.itemsize
+
+    def mean(self, column: str) -> Optional[float]:
+        """Mean of a score column, or the share of frames with a flag set; None when empty"""
+        if not self.size:
+            return None
+        return float(self.frames[column].mean(dtype=np.float64))
+
+    def summary(self) -> Dict[str, Any]:
+        """Frame count, bytes per frame and the mean of every column"""
+        means = {name: self.mean(name) for name in SCORE_COLUMNS + FLAG_COLUMNS}
+        return {
+            "frames": self.size,
+            "bytesPerFrame": TIMELINE_DTYPE.itemsize,
+            "means": {name: None if value is None else round(value, 3) for name, value in means.items()},
+        }
+
+    def to_bytes(self) -> bytes:
+        return HEADER.pack(MAGIC, TIMELINE_DTYPE.itemsize, self.size) + self.frames.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'FrameTimeline':
+        magic, itemsize, count = HEADER.unpack_from(data)
+        if magic != MAGIC or itemsize != TIMELINE_DTYPE.itemsize:
+            raise ValueError("Not a frame timeline of this layout")
+        if len(data) != HEADER.size + count * itemsize:
+            raise ValueError(f"Frame timeline holds {len(data) - HEADER.size} bytes, expected {count * itemsize}")
+        timeline = cls(count)
+        timeline.rows[:] = np.frombuffer(data, dtype=TIMELINE_DTYPE, count=count, offset=HEADER.size)
+        timeline.size = count
+        return timeline
@@ -0,0 +1,33 @@
+"""
+gunicorn settings for the analysis service (Dockerfile: gunicorn -c gunicorn.conf.py app:app)
+- PROMETHEUS_MULTIPROC_DIR is emptied when the arbiter starts, so samples from a previous run
+  are not added to this one's
+- post_worker_init starts the model warmup on a background thread once the app is imported, so
+  a worker boots in about the time it takes to import the app and loads MediaPipe while serving
+- child_exit marks a finished worker dead, so its live gauges (analyses in progress, job queue
+  depth, RSS) drop out of /metrics; its counters and histograms are kept
+"""
+
+import os
+import shutil
+
+bind = '0.0.0.0:8000'
+# One MediaPipe model set per request thread; keep threads equal to AI_MODEL_POOL_SIZE
+threads = int(os.environ.get('AI_MODEL_POOL_SIZE', '2'))
+
+
+def on_starting(server):
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def post_worker_init(worker):
+    from app import start_model_warmup
+    start_model_warmup()
+
+
+def child_exit(server, worker):
+    from metrics import mark_process_dead
+    mark_process_dead(worker.pid)
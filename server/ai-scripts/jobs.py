@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Asynchronous analysis jobs
+- POST /jobs queues an analysis on a bounded per-process worker pool and returns a job id at once
+- Job state (status, progress, result) is a small JSON file in a shared directory, so any
+  gunicorn worker can answer GET /jobs/<id>, not only the one running the job
+- Progress is frames processed / frames planned, written at most every AI_JOB_PROGRESS_INTERVAL seconds
+- At most AI_JOB_WORKERS jobs run and AI_JOB_QUEUE_LIMIT wait per process; beyond that submit() refuses
+- Finished job files are removed after AI_JOB_TTL seconds
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import metrics
+
+JOB_DIR = os.environ.get('AI_JOB_DIR', os.path.join(tempfile.gettempdir(), 'ai-analysis-jobs'))
+JOB_WORKERS = int(os.environ.get('AI_JOB_WORKERS', '2'))
+JOB_QUEUE_LIMIT = int(os.environ.get('AI_JOB_QUEUE_LIMIT', '8'))
+JOB_TTL_SECONDS = int(os.environ.get('AI_JOB_TTL', '3600'))
+PROGRESS_INTERVAL = float(os.environ.get('AI_JOB_PROGRESS_INTERVAL', '0.5'))
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """Raised when this process already holds its maximum number of running and queued jobs"""
+
+
+def _job_file(job_id: str) -> str:
+    return os.path.join(JOB_DIR, f"{job_id}.json")
+
+
+def _write_job(job: Dict[str, Any]):
+    """Atomic replace, so readers in other workers never see a half-written file"""
+    os.makedirs(JOB_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=JOB_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(job, f)
+    os.replace(tmp_path, _job_file(job["jobId"]))
+
+
+def read_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Current job state, or None for unknown (or expired) ids"""
+    # Ids are generated here as uuid4 hex; anything else cannot name a job file
+    if not job_id or len(job_id) != 32 or not all(c in '0123456789abcdef' for c in job_id):
+        return None
+    try:
+        with open(_job_file(job_id)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class JobManager:
+    """Bounded worker pool that runs analyses and records their state on disk"""
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_limit: int = JOB_QUEUE_LIMIT):
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_limit)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='analysis-job')
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def depth(self) -> int:
+        """Jobs of this process that are queued or running"""
+        return self._pending
+
+    def submit(self, run: Callable[[Callable[..., None]], Dict[str, Any]],
+               cleanup: Callable[[], None] = None, meta: Dict[str, Any] = None) -> str:
+        """Queue run(progress) and return the job id; cleanup() runs once the job has finished"""
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise QueueFull(f"{self._pending} analysis jobs already queued or running")
+            self._pending += 1
+            metrics.job_queue_depth(self.depth())
+        job = {
+            "jobId": uuid.uuid4().hex,
+            "status": "queued",
+            "progress": {"processed": 0, "planned": None},
+            "submittedAt": time.time(),
+            **(meta or {}),
+        }
+        try:
+            _write_job(job)
+            self._executor.submit(self._run, job, run, cleanup)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                metrics.job_queue_depth(self.depth())
+            raise
+        self.expire()
+        return job["jobId"]
+
+    def _run(self, job: Dict[str, Any], run, cleanup):
+        last_write = 0.0
+
+        def progress(processed: int, planned: int, means: Dict[str, Any] = None):
+            nonlocal last_write
+            job["progress"] = {"processed": processed, "planned": planned}
+            if means is not None:
+                job["progress"]["means"] = means
+            now = time.monotonic()
+            if now - last_write >= PROGRESS_INTERVAL or processed >= planned:
+                last_write = now
+                _write_job(job)
+
+        try:
+            job.update(status="running", startedAt=time.time())
+            _write_job(job)
+            result = run(progress)
+            job.update(status="done", result=result)
+        except Exception as e:
+            logger.exception("Analysis job %s failed", job['jobId'])
+            job.update(status="failed", error=str(e))
+        finally:
+            job["finishedAt"] = time.time()
+            try:
+                _write_job(job)
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                    metrics.job_queue_depth(self.depth())
+                if cleanup:
+                    cleanup()
+
+    def expire(self, ttl: int = JOB_TTL_SECONDS):
+        """Delete job files that finished (or were abandoned) more than ttl seconds ago"""
+        cutoff = time.time() - ttl
+        try:
+            entries = list(os.scandir(JOB_DIR))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Process-wide job manager, created on first use"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Vectorized landmark features for RealVideoAnalyzer
+- Per frame, each MediaPipe landmark list is read once: only the points the heuristics use,
+  appended to one flat float buffer per graph (no protobuf field reads spread over the heuristics)
+- The rows of all analyzed frames become one NumPy array per graph, and eye openness, iris gaze,
+  head pose, mouth/brow emotion, fingertip spread (every hand of every frame at once) and
+  shoulder/hip/arm posture are computed as array expressions over all frames together;
+  per frame, a handful of 2-element NumPy operations would cost more than the scalar code
+- Thresholds and the order of floating-point operations match the original scalar heuristics,
+  so every label and count is identical (benchmarks/bench_landmark_features.py checks parity)
+"""
+
+import math
+import operator
+from array import array
+from itertools import chain
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Face mesh points, in row order (x, y per point)
+FACE_POINTS = (
+    159, 145, 386, 374,    # 0-3: left eye top/bottom, right eye top/bottom
+    33, 133, 362, 263,     # 4-7: left eye outer/inner, right eye inner/outer
+    1, 152,                # 8-9: nose tip, chin
+    61, 291, 13, 14,       # 10-13: mouth left/right/top/bottom
+    70, 300, 105, 334,     # 14-17: brow left/right, brow left top/right top
+    468, 473,              # 18-19: left/right iris centre (only with refine_landmarks=True)
+)
+IRIS = [18, 19]
+EYE_TOPS, EYE_BOTTOMS = [0, 2], [1, 3]
+GAZE_LOWER, GAZE_UPPER = [4, 6], [5, 7]   # iris x must lie strictly between these per eye
+LEFT_EYE_OUTER, RIGHT_EYE_OUTER, NOSE, CHIN = 4, 7, 8, 9
+MOUTH_FROM, MOUTH_TO = [10, 13], [11, 12]  # width: left->right, height: bottom->top
+BROW_BASE, BROW_TOP = [14, 15], [16, 17]
+
+HAND_POINTS = (0, 4, 8, 12, 16, 20)   # wrist, then thumb..pinky tips
+
+# Pose points, in row order (x, y, visibility per point): shoulders, hips, elbows, wrists (left, right)
+POSE_POINTS = (11, 12, 23, 24, 13, 14, 15, 16)
+SHOULDERS, HIPS, TORSO = [0, 1], [2, 3], [0, 1, 2, 3]
+L_ELBOW, R_ELBOW, L_WRIST, R_WRIST = 4, 5, 6, 7
+
+HEAD_POSES = np.array(['left', 'right', 'up', 'down', 'forward'])
+EMOTIONS = np.array(['happy', 'surprised', 'neutral'])
+GESTURES = np.array(['open_palm', 'fist', 'other'])
+POSTURE_QUALITIES = np.array(['slouching', 'leaning_left', 'leaning_right', 'arms_crossed', 'confident'])
+
+
+XY = operator.attrgetter('x', 'y')
+XYV = operator.attrgetter('x', 'y', 'visibility')
+
+
+def read_landmarks(buffer: array, landmarks, points, visibility: bool = False):
+    """Append x, y (and visibility) of the given landmark indices to a flat float buffer; NaN for missing points"""
+    getter = XYV if visibility else XY
+    if len(landmarks) > max(points):
+        # map()/chain keep the protobuf reads and the float copies in C; this is the only per-frame cost
+        buffer.extend(chain.from_iterable(map(getter, map(landmarks.__getitem__, points))))
+        return
+    missing = (math.nan,) * (3 if visibility else 2)
+    for i in points:
+        buffer.extend(getter(landmarks[i]) if i < len(landmarks) else missing)
+
+
+def as_points(buffer: array, points, fields: int) -> np.ndarray:
+    """(rows, len(points), fields) view of a flat float buffer, without copying"""
+    return np.frombuffer(buffer, dtype=np.float64).reshape(-1, len(points), fields)
+
+
+def first_match(conditions: List[np.ndarray], labels: np.ndarray) -> np.ndarray:
+    """Label of the first true condition per element (an if/elif/else chain); the last label is the else"""
+    return labels[np.select(conditions, np.arange(len(conditions)), default=len(conditions))]
+
+
+def face_features(face: np.ndarray, eye_threshold: float) -> Dict[str, np.ndarray]:
+    """eyes_open, has_iris, gaze_forward, head_pose, emotion for (frames, len(FACE_POINTS), 2) points"""
+    x, y = face[..., 0], face[..., 1]
+    eyes_open = (np.abs(y[:, EYE_TOPS] - y[:, EYE_BOTTOMS]) > eye_threshold).all(axis=1)
+    has_iris = ~np.isnan(x[:, IRIS]).any(axis=1)
+    gaze_forward = ((x[:, GAZE_LOWER] < x[:, IRIS]) & (x[:, IRIS] < x[:, GAZE_UPPER])).all(axis=1)
+
+    # Horizontal head pose (yaw) from the nose against the eye centre, then pitch against the chin
+    eye_center_x = (x[:, LEFT_EYE_OUTER] + x[:, RIGHT_EYE_OUTER]) / 2
+    nose_x, nose_y, chin_y = x[:, NOSE], y[:, NOSE], y[:, CHIN]
+    head_pose = first_match([nose_x < eye_center_x - 0.01, nose_x > eye_center_x + 0.01,
+                             nose_y < chin_y - 0.02, nose_y > chin_y + 0.02], HEAD_POSES)
+
+    # Mouth aspect ratio (smile proxy) and eyebrow raise (surprise proxy)
+    mouth = face[:, MOUTH_TO] - face[:, MOUTH_FROM]
+    mouth_length = np.sqrt(mouth[..., 0] ** 2 + mouth[..., 1] ** 2)
+    smile_ratio = mouth_length[:, 0] / (mouth_length[:, 1] + 1e-6)
+    brow = y[:, BROW_TOP] - y[:, BROW_BASE]
+    brow_raise = (brow[:, 0] + brow[:, 1]) / 2
+    emotion = first_match([smile_ratio > 2.0, brow_raise < -0.03], EMOTIONS)
+
+    return {"eyes_open": eyes_open, "has_iris": has_iris, "gaze_forward": gaze_forward,
+            "head_pose": head_pose, "emotion": emotion}
+
+
+def hand_gestures(hands: np.ndarray) -> np.ndarray:
+    """Gesture per hand for (hands, len(HAND_POINTS), 2) points: fingertips far from / close to the wrist"""
+    tips = hands[:, 1:] - hands[:, :1]
+    tip_distances = np.sqrt(tips[..., 0] ** 2 + tips[..., 1] ** 2)
+    # Left-to-right sum, as the scalar version did, so the averages are bit-identical
+    total = tip_distances[:, 0]
+    for column in range(1, tip_distances.shape[1]):
+        total = total + tip_distances[:, column]
+    avg_tip_distance = total / tip_distances.shape[1]
+    return first_match([avg_tip_distance > 0.25, avg_tip_distance < 0.12], GESTURES)
+
+
+def pose_features(pose: np.ndarray, visibility_threshold: float) -> Dict[str, np.ndarray]:
+    """confident (torso visible) and posture quality for (frames, len(POSE_POINTS), 3) points"""
+    x, y, visibility = pose[..., 0], pose[..., 1], pose[..., 2]
+    confident = (visibility[:, TORSO] > visibility_threshold).all(axis=1)
+    shoulder_x, shoulder_y, hip_x, hip_y = x[:, SHOULDERS], y[:, SHOULDERS], x[:, HIPS], y[:, HIPS]
+    quality = first_match([
+        (shoulder_y > hip_y + 0.1).all(axis=1),
+        (shoulder_x < hip_x - 0.07).all(axis=1),
+        (shoulder_x > hip_x + 0.07).all(axis=1),
+        # Arms crossed: wrists close to the opposite elbows
+        (np.abs(x[:, [L_WRIST, R_WRIST]] - x[:, [R_ELBOW, L_ELBOW]]) < 0.07).all(axis=1),
+    ], POSTURE_QUALITIES)
+    return {"confident": confident, "quality": quality}
+
+
+class LandmarkBatch:
+    """Landmark rows of the frames analyzed so far; features() evaluates them all at once"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.frames = 0
+        self.face_points, self.face_frames = array('d'), []
+        self.hand_points, self.hand_frames = array('d'), []
+        self.pose_points, self.pose_frames = array('d'), []
+
+    def add_frame(self, face_landmarks=None, multi_hand_landmarks=None, pose_landmarks=None):
+        """Read the used points of one frame's results (first face, every hand, the pose)"""
+        frame = self.frames
+        if face_landmarks is not None:
+            read_landmarks(self.face_points, face_landmarks.landmark, FACE_POINTS)
+            self.face_frames.append(frame)
+        for hand_landmarks in multi_hand_landmarks or ():
+            read_landmarks(self.hand_points, hand_landmarks.landmark, HAND_POINTS)
+            self.hand_frames.append(frame)
+        if pose_landmarks is not None:
+            read_landmarks(self.pose_points, pose_landmarks.landmark, POSE_POINTS, visibility=True)
+            self.pose_frames.append(frame)
+        self.frames += 1
+
+    def features(self, eye_threshold: float, visibility_threshold: float) -> Dict[str, Any]:
+        """Per-frame feature arrays (length = frames) plus the gesture of every hand"""
+        n = self.frames
+        result = {
+            "face": np.zeros(n, dtype=bool),
+            "eyes_open": np.zeros(n, dtype=bool),
+            "has_iris": np.zeros(n, dtype=bool),
+            "gaze_forward": np.zeros(n, dtype=bool),
+            "head_pose": np.full(n, '', dtype=HEAD_POSES.dtype),
+            "emotion": np.full(n, '', dtype=EMOTIONS.dtype),
+            "pose_confident": np.zeros(n, dtype=bool),
+            "posture_quality": np.full(n, '', dtype=POSTURE_QUALITIES.dtype),
+            "gestures": np.array([], dtype=GESTURES.dtype),
+        }
+        if self.face_frames:
+            frames = np.array(self.face_frames)
+            face = face_features(as_points(self.face_points, FACE_POINTS, 2), eye_threshold)
+            result["face"][frames] = True
+            for name, values in face.items():
+                result[name][frames] = values
+        if self.hand_frames:
+            result["gestures"] = hand_gestures(as_points(self.hand_points, HAND_POINTS, 2))
+        if self.pose_frames:
+            frames = np.array(self.pose_frames)
+            pose = pose_features(as_points(self.pose_points, POSE_POINTS, 3), visibility_threshold)
+            result["pose_confident"][frames] = pose["confident"]
+            result["posture_quality"][frames] = pose["quality"]
+        return result
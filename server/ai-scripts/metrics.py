@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Prometheus metrics for the analysis service (GET /metrics)
+- Analyses (from /analyze, /analyze/stream and /jobs alike): count and latency histogram by
+  status and scenario, analyses in progress, frames analyzed, result-cache hits and misses
+- Per-model inference time (FaceMesh, Hands, Pose) as histograms of individual graph calls, fed
+  from the run's StageTimer: only for requests that asked for timings, or for every analysis
+  with AI_METRICS_STAGE_TIMINGS=1 (off by default, since timing each graph call is per-frame work)
+- The always-on latency metric is one wall-clock measurement of the whole analysis
+- HTTP requests by route and status code, job queue depth (JobManager.depth()) and worker RSS
+  (refreshed on each response, since a scrape reaches only one worker)
+- Multi-process: with PROMETHEUS_MULTIPROC_DIR set (the Dockerfile does), every gunicorn worker
+  writes its samples there and any worker's /metrics aggregates all of them; gunicorn.conf.py
+  empties the directory at startup and marks exited workers dead. Without it (python app.py)
+  the process registry is exported as is
+- Status: the result's own status ('success', or 'error', e.g. no person detected)
+- Status 'cancelled': a streaming client disconnected mid-analysis
+- Status 'failed': the analysis raised
+- Scenarios outside the app's list are counted as 'other', so a client cannot create label
+  values at will
+- prometheus_client is optional: without it every function here is a no-op and /metrics is a 503
+"""
+
+import os
+import sys
+from typing import Any, Dict
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:
+    prometheus_client = None
+
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+METRICS_ENABLED = prometheus_client is not None and os.environ.get('AI_METRICS_ENABLED', '1') == '1'
+# Time every analysis stage so the per-model histograms cover all requests, not only timed ones
+STAGE_TIMINGS = METRICS_ENABLED and os.environ.get('AI_METRICS_STAGE_TIMINGS', '0') == '1'
+
+KNOWN_SCENARIOS = (
+    'Job Interview Introduction', 'Team Meeting Presentation', 'Client Pitch',
+    'Difficult Conversation', 'Public Speaking', 'Free Practice',
+)
+# Graph stages of stage_timer reported as per-model inference time
+MODEL_STAGES = {'faceMesh': 'face_mesh', 'hands': 'hands', 'pose': 'pose'}
+
+ANALYSIS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600)
+INFERENCE_BUCKETS = (0.002, 0.005, 0.01, 0.02, 0.035, 0.05, 0.075, 0.1, 0.2, 0.5, 1)
+
+if METRICS_ENABLED:
+    ANALYSES = Counter('tawasl_analyses_total', 'Analyses run, by result status and scenario',
+                       ['status', 'scenario'])
+    ANALYSIS_SECONDS = Histogram('tawasl_analysis_seconds', 'Wall time of one analysis (cache hits included)',
+                                 ['status', 'scenario'], buckets=ANALYSIS_BUCKETS)
+    ANALYSES_IN_PROGRESS = Gauge('tawasl_analyses_in_progress', 'Analyses currently running',
+                                 multiprocess_mode='livesum')
+    FRAMES_ANALYZED = Counter('tawasl_frames_analyzed_total', 'Sampled frames run through the models')
+    INFERENCE_SECONDS = Histogram('tawasl_model_inference_seconds', 'Wall time of one graph call per model',
+                                  ['model'], buckets=INFERENCE_BUCKETS)
+    CACHE_LOOKUPS = Counter('tawasl_result_cache_lookups_total', 'Result-cache lookups', ['result'])
+    HTTP_REQUESTS = Counter('tawasl_http_requests_total', 'HTTP requests by route and status code',
+                            ['route', 'code'])
+    JOB_QUEUE_DEPTH = Gauge('tawasl_job_queue_depth', 'Async jobs queued or running',
+                            multiprocess_mode='livesum')
+    WORKER_RSS = Gauge('tawasl_worker_rss_bytes', 'Resident set size of the worker process',
+                       multiprocess_mode='liveall')
+
+
+def scenario_label(scenario: Any) -> str:
+    return scenario if scenario in KNOWN_SCENARIOS else 'other'
+
+
+def current_rss_bytes() -> int:
+    """Current RSS from /proc (Linux), or the peak RSS where /proc is not available"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def analysis_started():
+    if METRICS_ENABLED:
+        ANALYSES_IN_PROGRESS.inc()
+
+
+def analysis_finished(scenario: Any, seconds: float, result: Dict[str, Any] = None, timer=None,
+                      status: str = None):
+    """Record one finished analysis; result None means it raised. timer is the run's StageTimer
+    (its graph stages feed the inference histograms when it was enabled), status overrides the one derived from the result (e.g. 'cancelled')"""
+    if not METRICS_ENABLED:
+        return
+    ANALYSES_IN_PROGRESS.dec()
+    status = status or ('failed' if result is None else str(result.get('status', 'error')))
+    labels = {'status': status, 'scenario': scenario_label(scenario)}
+    ANALYSES.labels(**labels).inc()
+    ANALYSIS_SECONDS.labels(**labels).observe(seconds)
+    if result is not None and not result.get('cacheHit'):
+        preprocess = (result.get('instrumentation') or {}).get('preprocess') or {}
+        FRAMES_ANALYZED.inc(preprocess.get('framesPreprocessed', 0))
+    if timer is not None and timer.enabled:
+        for stage, model in MODEL_STAGES.items():
+            stats = timer.stages.get(stage)
+            if stats is not None:
+                histogram = INFERENCE_SECONDS.labels(model=model)
+                for seconds_per_call in stats.wall:
+                    histogram.observe(seconds_per_call)
+
+
+def cache_lookup(hit: bool):
+    if METRICS_ENABLED:
+        CACHE_LOOKUPS.labels(result='hit' if hit else 'miss').inc()
+
+
+def http_request(route: str, code: int):
+    """Count a response; also refreshes this worker's RSS, which other workers cannot read"""
+    if METRICS_ENABLED:
+        HTTP_REQUESTS.labels(route=route, code=str(code)).inc()
+        WORKER_RSS.set(current_rss_bytes())
+
+
+def job_queue_depth(depth: int):
+    if METRICS_ENABLED:
+        JOB_QUEUE_DEPTH.set(depth)
+
+
+def render() -> tuple:
+    """(body, content type) of the exposition for every worker, or (None, None) when disabled"""
+    if not METRICS_ENABLED:
+        return None, None
+    WORKER_RSS.set(current_rss_bytes())
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    """gunicorn child_exit hook: drop the live gauges of an exited worker"""
+    if METRICS_ENABLED and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Per-process MediaPipe model pool
+- Builds FaceMesh, Hands and Pose graphs once per process (one gunicorn worker)
+- Hands a model set to one request thread at a time and takes it back afterwards
+- Resets the tracking state of every graph between requests
+- Pool size comes from AI_MODEL_POOL_SIZE (default 2, match gunicorn --threads)
+- warm() also runs one inference per graph, so the first request does not pay for lazy init
+- mediapipe is imported when the first model set is built, not with this module, so the Flask
+  app imports without it and a worker's warmup thread pays for it instead of the boot
+"""
+
+import os
+import sys
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any
+
+import numpy as np
+
+# Graph settings per pool. 'strict' matches what ai_strict_video_analysis used to build per call.
+MODEL_CONFIGS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    'strict': {
+        'face_mesh': {'static_image_mode': False, 'max_num_faces': 1, 'refine_landmarks': True},
+        'hands': {'static_image_mode': False, 'max_num_hands': 2},
+        'pose': {'static_image_mode': False},
+    },
+    # analysis_modes: 'fast' drops iris refinement and uses the lite Hands/Pose models,
+    # 'full' uses the heavy Pose model
+    'fast': {
+        'face_mesh': {'static_image_mode': False, 'max_num_faces': 1, 'refine_landmarks': False},
+        'hands': {'static_image_mode': False, 'max_num_hands': 2, 'model_complexity': 0},
+        'pose': {'static_image_mode': False, 'model_complexity': 0},
+    },
+    'full': {
+        'face_mesh': {'static_image_mode': False, 'max_num_faces': 1, 'refine_landmarks': True},
+        'hands': {'static_image_mode': False, 'max_num_hands': 2},
+        'pose': {'static_image_mode': False, 'model_complexity': 2},
+    },
+}
+
+DEFAULT_POOL_SIZE = int(os.environ.get('AI_MODEL_POOL_SIZE', '2'))
+
+
+class MediaPipeModels:
+    """One FaceMesh + Hands + Pose graph set, used by a single thread at a time"""
+
+    def __init__(self, config: Dict[str, Dict[str, Any]]):
+        started = time.perf_counter()
+        import mediapipe as mp
+        self.face_mesh = mp.solutions.face_mesh.FaceMesh(**config['face_mesh'])
+        self.hands = mp.solutions.hands.Hands(**config['hands'])
+        self.pose = mp.solutions.pose.Pose(**config['pose'])
+        self.load_seconds = time.perf_counter() - started
+        self.warmup_seconds = None
+        self.uses = 0
+
+    def warmup(self):
+        """One inference per graph on a blank frame; the next acquire() resets the tracking state"""
+        frame = np.zeros((256, 256, 3), dtype=np.uint8)
+        started = time.perf_counter()
+        for graph in (self.face_mesh, self.hands, self.pose):
+            graph.process(frame)
+        self.warmup_seconds = time.perf_counter() - started
+        self.uses += 1
+
+    def reset(self):
+        """Drop tracking state left over from the previous video"""
+        for graph in (self.face_mesh, self.hands, self.pose):
+            graph.reset()
+
+    def close(self):
+        for graph in (self.face_mesh, self.hands, self.pose):
+            graph.close()
+
+
+class ModelPool:
+    """Bounded pool of MediaPipeModels sets, built lazily and reused across requests"""
+
+    def __init__(self, config_name: str = 'strict', size: int = DEFAULT_POOL_SIZE):
+        self.config_name = config_name
+        self.config = MODEL_CONFIGS[config_name]
+        self.size = max(1, size)
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _try_create(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            models = MediaPipeModels(self.config)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        print(f"[INFO] Loaded MediaPipe '{self.config_name}' models in {models.load_seconds:.2f}s "
+              f"({self._created}/{self.size}, pid {os.getpid()})", file=sys.stderr)
+        return models
+
+    def warm(self, count: int = 1):
+        """Build up to `count` model sets ahead of the first request"""
+        for _ in range(min(count, self.size)):
+            models = self._try_create()
+            if models is None:
+                break
+            models.warmup()
+            print(f"[INFO] Warmed up MediaPipe '{self.config_name}' models in {models.warmup_seconds:.2f}s",
+                  file=sys.stderr)
+            self._idle.put(models)
+
+    @contextmanager
+    def acquire(self, timeout: float = None):
+        """Borrow a model set; blocks while every set is in use by another thread"""
+        try:
+            models = self._idle.get_nowait()
+        except queue.Empty:
+            models = self._try_create()
+            if models is None:
+                models = self._idle.get(timeout=timeout)
+        try:
+            if models.uses:
+                models.reset()
+            models.uses += 1
+            yield models
+        finally:
+            self._idle.put(models)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "config": self.config_name,
+            "size": self.size,
+            "created": self._created,
+            "idle": self._idle.qsize(),
+        }
+
+
+_pools: Dict[str, ModelPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(config_name: str = 'strict') -> ModelPool:
+    """Return the process-wide pool for a model configuration"""
+    pool = _pools.get(config_name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(config_name)
+            if pool is None:
+                pool = ModelPool(config_name)
+                _pools[config_name] = pool
+    return pool
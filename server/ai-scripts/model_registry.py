@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Offline model registry for weight files (YOLOv8)
+- Resolves weights from a local cache directory (AI_MODEL_DIR, default ./models next to this file)
+- Downloads a missing file only when AI_MODEL_OFFLINE is not set; air-gapped nodes get the
+  directory pre-populated with `python model_registry.py fetch` on a connected host
+- Downloaded weights are verified against the SHA-256 in their MODEL_SPECS entry (or one pinned in
+  MODEL_DIR/checksums.json ahead of time); a mismatch refuses to load
+- A file with no known checksum still loads (as before the registry), with a warning and without
+  being pinned, so an unverified download never becomes the trusted checksum;
+  AI_MODEL_REQUIRE_CHECKSUM=1 refuses it instead
+- Derived models are built locally instead of downloaded: the ONNX export of yolov8n and its
+  int8 dynamically quantized copy (person_detector.py runs them on ONNX Runtime); a build needs
+  the verified source weights only, so it also works offline, and its output is pinned when built
+- Loads each model once per process and runs one warmup inference, recording both times
+- MediaPipe ships its graphs inside the package, so model_pool.py handles those
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from typing import Any, Dict
+
+MODEL_DIR = os.environ.get('AI_MODEL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models'))
+OFFLINE = os.environ.get('AI_MODEL_OFFLINE', '0') == '1'
+REQUIRE_CHECKSUM = os.environ.get('AI_MODEL_REQUIRE_CHECKSUM', '0') == '1'
+
+MODEL_SPECS: Dict[str, Dict[str, Any]] = {
+    'yolov8n': {
+        'file': 'yolov8n.pt',
+        'url': os.environ.get('AI_YOLOV8N_URL',
+                              'https://github.com/ultralytics/assets/releases/download/v8.2.0/yolov8n.pt'),
+        # SHA-256 of the release asset at 'url'; override both together
+        'sha256': os.environ.get('AI_YOLOV8N_SHA256'),
+        'warmup_shape': (640, 640, 3),
+    },
+    'yolov8n-onnx': {
+        'file': 'yolov8n.onnx',
+        'source': 'yolov8n',
+        'build': 'onnx_export',
+        'warmup_shape': (640, 640, 3),
+    },
+    'yolov8n-onnx-int8': {
+        'file': 'yolov8n-int8.onnx',
+        'source': 'yolov8n-onnx',
+        'build': 'int8_quantize',
+        'warmup_shape': (640, 640, 3),
+    },
+}
+
+
+class ModelChecksumError(Exception):
+    """The cached weight file does not match its pinned SHA-256"""
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _checksums_path() -> str:
+    return os.path.join(MODEL_DIR, 'checksums.json')
+
+
+def load_checksums() -> Dict[str, str]:
+    try:
+        with open(_checksums_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _pin_checksum(file_name: str, sha256: str):
+    checksums = load_checksums()
+    checksums[file_name] = sha256
+    # Written aside and renamed, so a concurrent reader (another worker) never sees a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=MODEL_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(checksums, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, _checksums_path())
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _download(url: str, path: str, sha256: str = None):
+    """Download to a temp file and move it into place only if it matches sha256 (when known)"""
+    print(f"[INFO] Downloading {url}", file=sys.stderr)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, 'wb') as f, urllib.request.urlopen(url, timeout=60) as response:
+            for chunk in iter(lambda: response.read(1024 * 1024), b''):
+                f.write(chunk)
+                digest.update(chunk)
+        if sha256 is not None and digest.hexdigest() != sha256:
+            raise ModelChecksumError(f"{url}: sha256 {digest.hexdigest()} does not match expected {sha256}")
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _export_onnx(source_path: str, path: str):
+    """ONNX export with dynamic batch and image size, so batches and rect letterboxing work"""
+    from ultralytics import YOLO
+    exported = YOLO(source_path).export(format='onnx', dynamic=True, imgsz=640, verbose=False)
+    if os.path.abspath(exported) != os.path.abspath(path):
+        os.replace(exported, path)
+
+
+def _quantize_int8(source_path: str, path: str):
+    """int8 weights, activations quantized at run time (ConvInteger/MatMulInteger on the CPU provider)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.onnx')
+    os.close(fd)
+    try:
+        quantize_dynamic(source_path, tmp_path, weight_type=QuantType.QUInt8)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+BUILDERS = {'onnx_export': _export_onnx, 'int8_quantize': _quantize_int8}
+
+
+def resolve_weights(name: str) -> str:
+    """Absolute path of a verified weight file in the local cache"""
+    spec = MODEL_SPECS[name]
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    path = os.path.join(MODEL_DIR, spec['file'])
+    if 'build' in spec:
+        if not os.path.exists(path) or spec['file'] not in load_checksums():
+            print(f"[INFO] Building {spec['file']} from {spec['source']}", file=sys.stderr)
+            BUILDERS[spec['build']](resolve_weights(spec['source']), path)
+            # Built here from verified weights, so its checksum is trusted on first use
+            _pin_checksum(spec['file'], file_sha256(path))
+        expected = load_checksums()[spec['file']]
+    else:
+        expected = spec.get('sha256') or load_checksums().get(spec['file'])
+        if expected is None and REQUIRE_CHECKSUM:
+            raise ModelChecksumError(f"No known sha256 for {spec['file']} and AI_MODEL_REQUIRE_CHECKSUM=1 "
+                                     f"(set the checksum in MODEL_SPECS or {_checksums_path()})")
+        if not os.path.exists(path):
+            if OFFLINE:
+                raise FileNotFoundError(f"{path} is missing and AI_MODEL_OFFLINE=1; "
+                                        f"run `python model_registry.py fetch {name}` on a connected host")
+            _download(spec['url'], path, expected)
+    actual = file_sha256(path)
+    if expected is None:
+        # Not pinned: trusting whatever was downloaded first would defeat the check
+        print(f"[WARN] {path} is unverified (sha256 {actual}); set its checksum in MODEL_SPECS or "
+              f"{_checksums_path()} to verify it", file=sys.stderr)
+        return path
+    if actual != expected:
+        raise ModelChecksumError(f"{path}: sha256 {actual} does not match pinned {expected}")
+    if load_checksums().get(spec['file']) != expected:
+        # Recorded next to the file, so a copied model directory verifies without the spec's env
+        _pin_checksum(spec['file'], expected)
+    return path
+
+
+def _load_yolo(path: str):
+    from ultralytics import YOLO
+    return YOLO(path)
+
+
+def _load_onnx(path: str):
+    from person_detector import OnnxPersonDetector
+    return OnnxPersonDetector(path)
+
+
+LOADERS = {'yolov8n': _load_yolo, 'yolov8n-onnx': _load_onnx, 'yolov8n-onnx-int8': _load_onnx}
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded models with load/warmup instrumentation"""
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, warmup: bool = True):
+        """Loaded model, loading (and warming up) it on first use in this process"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            model = self._models.get(name)
+            if model is None:
+                started = time.perf_counter()
+                model = LOADERS[name](resolve_weights(name))
+                timings = {"loadSeconds": round(time.perf_counter() - started, 3)}
+                if warmup:
+                    timings["warmupSeconds"] = round(self._warmup(name, model), 3)
+                self._timings[name] = timings
+                self._models[name] = model
+                print(f"[INFO] Loaded model '{name}' in {timings['loadSeconds']}s"
+                      f"{', warmup ' + str(timings['warmupSeconds']) + 's' if warmup else ''} "
+                      f"(pid {os.getpid()})", file=sys.stderr)
+        return model
+
+    @staticmethod
+    def _warmup(name: str, model) -> float:
+        """One inference on a blank frame, so the first request does not pay for lazy init"""
+        import numpy as np
+        from person_detector import count_persons
+        frame = np.zeros(MODEL_SPECS[name]['warmup_shape'], dtype=np.uint8)
+        started = time.perf_counter()
+        count_persons(model, [frame])
+        return time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return dict(self._timings)
+
+
+_registry = ModelRegistry()
+
+
+def get_model(name: str, warmup: bool = True):
+    """Process-wide loaded model by registry name (e.g. 'yolov8n')"""
+    return _registry.get(name, warmup)
+
+
+def registry_stats() -> Dict[str, Dict[str, float]]:
+    return _registry.stats()
+
+
+def main():
+    global OFFLINE
+    if len(sys.argv) < 2 or sys.argv[1] not in ('fetch', 'verify'):
+        print(f"Usage: python model_registry.py fetch|verify [{'|'.join(MODEL_SPECS)} ...]", file=sys.stderr)
+        sys.exit(1)
+    # verify never downloads: it checks what an air-gapped node would load
+    OFFLINE = OFFLINE or sys.argv[1] == 'verify'
+    for name in sys.argv[2:] or list(MODEL_SPECS):
+        path = resolve_weights(name)
+        print(json.dumps({"model": name, "path": path, "sha256": file_sha256(path)}))
+
+
+if __name__ == '__main__':
+    main()
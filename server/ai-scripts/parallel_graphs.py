@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Concurrent execution of independent MediaPipe graphs on one frame
+- MediaPipe releases the GIL inside inference, so FaceMesh, Hands and Pose can overlap
+- One process-wide thread pool per gunicorn worker bounds the extra threads
+  (AI_GRAPH_THREADS; default: cores per worker minus the request thread, at most 2)
+- The calling thread runs one graph itself, so a budget of 0 means plain sequential calls
+- Each graph object is still used by a single thread at a time
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Tuple
+
+
+def default_thread_budget() -> int:
+    workers = max(1, int(os.environ.get('WEB_CONCURRENCY', '1')))
+    cores_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    return max(0, min(2, cores_per_worker - 1))
+
+
+GRAPH_THREADS = int(os.environ.get('AI_GRAPH_THREADS', default_thread_budget()))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Process-wide graph thread pool, or None when the budget is 0"""
+    global _executor
+    if GRAPH_THREADS <= 0:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=GRAPH_THREADS, thread_name_prefix='mp-graph')
+    return _executor
+
+
+def run_graphs(tasks: Dict[str, Tuple[Callable, Any]]) -> Dict[str, Any]:
+    """Run {name: (graph.process, input)} concurrently and return {name: result}"""
+    executor = get_executor()
+    names = list(tasks)
+    if executor is None or len(names) < 2:
+        return {name: fn(arg) for name, (fn, arg) in tasks.items()}
+    futures = {name: executor.submit(*tasks[name]) for name in names[1:]}
+    fn, arg = tasks[names[0]]
+    try:
+        results = {names[0]: fn(arg)}
+    finally:
+        # Never leave a graph running in the pool when the caller moves on to the next frame
+        wait(futures.values())
+    for name, future in futures.items():
+        results[name] = future.result()
+    return results
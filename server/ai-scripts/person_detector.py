@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Person detector backends for the YOLO analyzers (video_analysis.py, video_analysis_latest.py)
+- 'ultralytics' (default): yolov8n through ultralytics/PyTorch
+- 'onnx': the same network exported to ONNX and run with ONNX Runtime on the CPU execution
+  provider; importing onnxruntime costs a fraction of importing torch, and inference is faster
+  on CPU-only nodes
+- AI_ONNX_INT8=1 uses a copy of the ONNX model with int8 weights (dynamic quantization:
+  activations are quantized per inference, no calibration set needed)
+- AI_ONNX_THREADS sets ONNX Runtime's intra-op threads (0 lets it use every core)
+- The ONNX path reproduces ultralytics' preprocessing (rect letterbox, pad 114, BGR -> RGB)
+  and its person filtering (best class is person, conf > 0.25, NMS at IoU 0.7), so counts match;
+  test_person_detector.py checks the tensors and the NMS against ultralytics without weights,
+  benchmarks/bench_onnx_detector.py checks end-to-end parity and compares throughput
+- Models come from model_registry: 'yolov8n', 'yolov8n-onnx', 'yolov8n-onnx-int8'
+"""
+
+import os
+from typing import Any, List
+
+import numpy as np
+
+DETECTOR_BACKENDS = ('ultralytics', 'onnx')
+DEFAULT_BACKEND = os.environ.get('AI_DETECTOR_BACKEND', 'ultralytics')
+ONNX_INT8 = os.environ.get('AI_ONNX_INT8', '0') == '1'
+ONNX_THREADS = int(os.environ.get('AI_ONNX_THREADS', '0'))
+
+# ultralytics predict() defaults for detection
+CONF_THRESHOLD = 0.25
+IOU_THRESHOLD = 0.7
+MAX_DETECTIONS = 300
+PERSON_CLASS = 0  # 'person' in COCO
+
+
+def detector_model_name(backend: str = None, int8: bool = None) -> str:
+    """Model registry name for a backend ('ultralytics' or 'onnx') and quantization choice"""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in DETECTOR_BACKENDS:
+        raise ValueError(f"Unknown detector backend: {backend}")
+    if backend == 'ultralytics':
+        return 'yolov8n'
+    return 'yolov8n-onnx-int8' if (ONNX_INT8 if int8 is None else int8) else 'yolov8n-onnx'
+
+
+def get_person_detector(backend: str = None, int8: bool = None):
+    """Process-wide detector (loaded and warmed up once) for the configured backend"""
+    from model_registry import get_model
+    return get_model(detector_model_name(backend, int8))
+
+
+def count_persons(detector, frames: List[Any]) -> List[int]:
+    """Person boxes per frame for one forward pass over a batch of frames, on either backend"""
+    if isinstance(detector, OnnxPersonDetector):
+        return detector.count_persons(frames)
+    results = detector(frames, verbose=False)
+    return [sum(1 for box in result.boxes if int(box.cls[0]) == PERSON_CLASS) for result in results]
+
+
+def letterbox(frame: np.ndarray, size: int = 640, stride: int = 32) -> np.ndarray:
+    """Resize keeping the aspect ratio and pad to a multiple of stride, as ultralytics does for predict()"""
+    import cv2
+    height, width = frame.shape[:2]
+    ratio = min(size / height, size / width)
+    new_width, new_height = round(width * ratio), round(height * ratio)
+    pad_w, pad_h = (size - new_width) % stride / 2, (size - new_height) % stride / 2
+    if (width, height) != (new_width, new_height):
+        frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    return cv2.copyMakeBorder(frame, round(pad_h - 0.1), round(pad_h + 0.1), round(pad_w - 0.1),
+                              round(pad_w + 0.1), cv2.BORDER_CONSTANT, value=(114, 114, 114))
+
+
+def nms_keep(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = IOU_THRESHOLD,
+             max_detections: int = MAX_DETECTIONS) -> np.ndarray:
+    """Indices of the boxes (x1, y1, x2, y2) kept by greedy non-maximum suppression, best first"""
+    order = np.argsort(-scores, kind='stable')
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    kept = []
+    while order.size and len(kept) < max_detections:
+        best, rest = order[0], order[1:]
+        kept.append(best)
+        top_left = np.maximum(boxes[best, :2], boxes[rest, :2])
+        bottom_right = np.minimum(boxes[best, 2:], boxes[rest, 2:])
+        intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=1)
+        iou = intersection / (areas[best] + areas[rest] - intersection + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.array(kept, dtype=np.int64)
+
+
+def persons_in_predictions(predictions: np.ndarray) -> List[int]:
+    """Person count per image from raw YOLOv8 output (N, 4 + classes, anchors), boxes as cx, cy, w, h
+
+    Every class takes part, as in ultralytics: each class is suppressed separately (boxes are
+    offset by class), and the MAX_DETECTIONS cap applies to all classes together.
+    """
+    counts = []
+    for prediction in predictions:
+        class_scores = prediction[4:]
+        best = class_scores.argmax(axis=0)
+        confidence = class_scores.max(axis=0)
+        candidates = confidence > CONF_THRESHOLD
+        if not (candidates & (best == PERSON_CLASS)).any():
+            counts.append(0)
+            continue
+        cx, cy, w, h = prediction[:4, candidates]
+        offset = best[candidates] * 7680.0  # ultralytics' max_wh: boxes of different classes never overlap
+        boxes = np.stack([cx - w / 2 + offset, cy - h / 2 + offset, cx + w / 2 + offset, cy + h / 2 + offset], axis=1)
+        kept = nms_keep(boxes, confidence[candidates])
+        counts.append(int((best[candidates][kept] == PERSON_CLASS).sum()))
+    return counts
+
+
+class OnnxPersonDetector:
+    """YOLOv8 ONNX model on ONNX Runtime (CPU) that counts persons per frame"""
+
+    def __init__(self, model_path: str, threads: int = None, size: int = 640):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = ONNX_THREADS if threads is None else threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        self.model_path = model_path
+        self.size = size
+
+    def preprocess(self, frames: List[np.ndarray]) -> np.ndarray:
+        """(N, 3, H, W) float32 RGB in [0, 1]; numpy frames are taken as BGR, like ultralytics"""
+        batch = np.stack([letterbox(frame, self.size) for frame in frames])
+        return np.ascontiguousarray(batch[..., ::-1].transpose(0, 3, 1, 2), dtype=np.float32) / 255.0
+
+    def count_persons(self, frames: List[np.ndarray]) -> List[int]:
+        return persons_in_predictions(self.session.run(None, {self.input_name: self.preprocess(frames)})[0])
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Person-presence policy for the YOLO analyzers
+- Detects on a sampled schedule (AI_PERSON_DETECTIONS evenly spaced frames, or every
+  AI_PERSON_DETECT_INTERVAL frames) instead of on every decoded frame; schedule() lists the
+  indices, so decoding ends at the last planned detection rather than at the end of the stream
+- One detection per sampled frame serves both the gate (none / single / multiple) and scoring
+- Stops early once the verdict is settled:
+  - multiple people: as soon as AI_PERSON_MAX_MULTI_FRAMES detections saw more than one person
+  - no person / single person: once at least AI_PERSON_MIN_COVERAGE of the schedule is done and
+    the 95% upper bound on the rate of the unseen outcome (rule of three, 3/n) is below
+    AI_PERSON_TOLERANCE
+- AI_PERSON_EARLY_STOP=0 keeps the sampled schedule but always runs it to the end
+"""
+
+import math
+import os
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DETECTIONS = int(os.environ.get('AI_PERSON_DETECTIONS', '60'))
+DEFAULT_INTERVAL = int(os.environ.get('AI_PERSON_DETECT_INTERVAL', '0'))
+DEFAULT_TOLERANCE = float(os.environ.get('AI_PERSON_TOLERANCE', '0.1'))
+DEFAULT_MIN_COVERAGE = float(os.environ.get('AI_PERSON_MIN_COVERAGE', '0.5'))
+DEFAULT_MAX_MULTI_FRAMES = int(os.environ.get('AI_PERSON_MAX_MULTI_FRAMES', '1'))
+EARLY_STOP = os.environ.get('AI_PERSON_EARLY_STOP', '1') == '1'
+
+NO_PERSON = 'none'
+SINGLE_PERSON = 'single'
+MULTI_PERSON = 'multi'
+
+
+class PersonPresencePolicy:
+    """Detection schedule plus a sequential verdict over person counts"""
+
+    def __init__(self, total_frames: int, interval: int = None, detections: int = None,
+                 tolerance: float = None, min_coverage: float = None, max_multi_frames: int = None,
+                 early_stop: bool = None):
+        detections = detections or DEFAULT_DETECTIONS
+        self.interval = max(1, interval or DEFAULT_INTERVAL or total_frames // max(1, detections))
+        self.planned = max(1, total_frames // self.interval)
+        self.tolerance = tolerance or DEFAULT_TOLERANCE
+        self.min_coverage = DEFAULT_MIN_COVERAGE if min_coverage is None else min_coverage
+        self.max_multi_frames = max(1, max_multi_frames or DEFAULT_MAX_MULTI_FRAMES)
+        self.early_stop = EARLY_STOP if early_stop is None else early_stop
+        # Rule of three: zero events in n trials puts the 95% upper bound on their rate at 3/n
+        self.min_detections = max(math.ceil(self.planned * self.min_coverage), math.ceil(3 / self.tolerance))
+        self.counts = {NO_PERSON: 0, SINGLE_PERSON: 0, MULTI_PERSON: 0}
+        self.detections = 0
+        self.stopped_early = False
+
+    @property
+    def start(self) -> int:
+        """First sampled frame index; frame i is sampled when (i + 1) % interval == 0"""
+        return self.interval - 1
+
+    def schedule(self) -> List[int]:
+        """Frame indices of the planned detections, so the decoder can stop after the last one"""
+        return [self.start + i * self.interval for i in range(self.planned)]
+
+    def observe(self, person_count: int) -> Optional[str]:
+        """Record one detection; returns the verdict once it is settled, else None"""
+        outcome = NO_PERSON if person_count == 0 else SINGLE_PERSON if person_count == 1 else MULTI_PERSON
+        self.counts[outcome] += 1
+        self.detections += 1
+        if self.counts[MULTI_PERSON] >= self.max_multi_frames:
+            self.stopped_early = self.detections < self.planned
+            return MULTI_PERSON
+        if not self.early_stop or self.detections < self.min_detections or self.detections >= self.planned:
+            return None
+        if self.counts[SINGLE_PERSON] == 0:
+            self.stopped_early = True
+            return NO_PERSON
+        if self.counts[MULTI_PERSON] == 0:
+            self.stopped_early = True
+            return SINGLE_PERSON
+        return None
+
+    def verdict(self) -> str:
+        """Final verdict after the schedule ran to the end (or stopped early)"""
+        if self.counts[MULTI_PERSON] >= self.max_multi_frames:
+            return MULTI_PERSON
+        return SINGLE_PERSON if self.counts[SINGLE_PERSON] else NO_PERSON
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "detectionsPlanned": self.planned,
+            "detectionsRun": self.detections,
+            "stoppedEarly": self.stopped_early,
+            "verdict": self.verdict(),
+            "counts": dict(self.counts),
+        }
@@ -9,54 +9,76 @@ import sys
 import base64
 import tempfile
 import os
+import time
 import math
 import random
 import cv2
-import mediapipe as mp
 import numpy as np
 from typing import Dict, List, Tuple, Any
 import statistics
+from frame_sampler import FrameSampler, sample_indices, DEFAULT_SAMPLING_MODE
+from frame_preprocess import FramePreprocessor
+from parallel_graphs import run_graphs
+from video_probe import probe_video
+from landmark_features import LandmarkBatch
+from frame_timeline import FrameTimeline
+from motion_filter import MotionFilter
+from stage_timer import StageTimer
+
+# Per-frame accumulators, merged across segments by segmented_analysis (the scored frames
+# themselves live in self.timeline; these lists only collect fallback values)
+ACCUMULATOR_LISTS = ('eye_contact_data', 'facial_expression_data', 'gesture_data', 'posture_data')
+ACCUMULATOR_COUNTS = ('emotion_counts', 'gesture_counts', 'head_pose_counts', 'posture_quality_counts')
+ACCUMULATOR_COUNTERS = (
+    'no_face_frames', 'multi_face_frames', 'total_frames', 'face_detected_frames',
+    'eye_contact_frames', 'hand_detected_frames', 'good_posture_frames',
+)
 
 class RealVideoAnalyzer:
-    def __init__(self):
+    def __init__(self, sampling: str = None, resize=None, parallel: bool = False, load_models: bool = True,
+                 motion_threshold: float = None, timings: bool = False):
+        self.sampling = sampling or DEFAULT_SAMPLING_MODE  # 'sequential' or 'keyframe'
+        self.preprocessor = FramePreprocessor(resize)  # per-model downscale before inference
+        self.parallel = parallel  # run FaceMesh, Hands and Pose concurrently on each frame
+        self.motion_filter = MotionFilter(motion_threshold)  # reuse detections for near-identical frames
+        self.last_detections = None  # (first face, hands, pose, face count) of the last analyzed frame
+        self.loop_seconds = None
+        self.timer = StageTimer(timings)  # per-stage wall/CPU times, reported as result["timings"] when enabled
         # Analysis results storage
         self.eye_contact_data = []
         self.facial_expression_data = []
         self.gesture_data = []
         self.posture_data = []
-        self.frame_analysis_data = []
-        self.overall_scores = []
-        self.eye_contact_scores = []
-        self.facial_expression_scores = []
-        self.gesture_scores = []
-        self.posture_scores = []
+        self.timeline = FrameTimeline()  # scored frames; reserved from the sample plan
         self.emotion_counts = {'happy': 0, 'neutral': 0, 'surprised': 0}
         self.gesture_counts = {'open_palm': 0, 'fist': 0, 'other': 0}
         self.head_pose_counts = {'forward': 0, 'left': 0, 'right': 0, 'up': 0, 'down': 0}
         self.posture_quality_counts = {'confident': 0, 'slouching': 0, 'leaning_left': 0, 'leaning_right': 0, 'arms_crossed': 0}
-        # Initialize MediaPipe models with more robust settings
-        self.mp_face = mp.solutions.face_mesh
-        self.mp_hands = mp.solutions.hands
-        self.mp_pose = mp.solutions.pose
-        # More robust face detection settings
-        self.face_mesh = self.mp_face.FaceMesh(
-            static_image_mode=False, 
-            max_num_faces=2,
-            refine_landmarks=True,  # Enable refined landmarks for better accuracy
-            min_detection_confidence=0.5,  # Lower threshold for better detection
-            min_tracking_confidence=0.5
-        )
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False, 
-            max_num_hands=2,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        # Initialize MediaPipe models with more robust settings (skipped by the segmented-analysis parent)
+        if load_models:
+            import mediapipe as mp  # deferred: importing this module (or a parent that merges segments) skips it
+            self.mp_face = mp.solutions.face_mesh
+            self.mp_hands = mp.solutions.hands
+            self.mp_pose = mp.solutions.pose
+            # More robust face detection settings
+            self.face_mesh = self.mp_face.FaceMesh(
+                static_image_mode=False, 
+                max_num_faces=2,
+                refine_landmarks=True,  # Enable refined landmarks for better accuracy
+                min_detection_confidence=0.5,  # Lower threshold for better detection
+                min_tracking_confidence=0.5
+            )
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False, 
+                max_num_hands=2,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
+            self.pose = self.mp_pose.Pose(
+                static_image_mode=False,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
         self.no_face_frames = 0
         self.multi_face_frames = 0
         self.total_frames = 0
@@ -65,6 +87,9 @@ class RealVideoAnalyzer:
         self.hand_detected_frames = 0
         self.good_posture_frames = 0
         self.low_resolution_mode = False # Added for adaptive sampling
+        self.video_info = None
+        self.landmark_batch = LandmarkBatch()  # landmark rows awaiting finalize_frames()
+        self.frame_times = []
         
     def analyze_video(self, video_path: str, scenario: str, duration: float) -> Dict[str, Any]:
         """Main analysis function with realistic video analysis using MediaPipe"""
@@ -81,55 +106,124 @@ class RealVideoAnalyzer:
             
             if video_exists:
                 # Real video analysis - process frames
-                cap = cv2.VideoCapture(video_path)
+                with self.timer.stage('open'):
+                    cap = cv2.VideoCapture(video_path)
                 if not cap.isOpened():
                     print(f"[ERROR] Could not open video file: {video_path}", file=sys.stderr)
                     return self.generate_enhanced_mock_analysis(scenario, duration)
-                else:
-                    print(f"[INFO] Opened video file: {video_path}", file=sys.stderr)
-                    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                    print(f"[INFO] Total frames: {total_frames}, Resolution: {width}x{height}", file=sys.stderr)
-                
-                # Get video resolution for adaptive analysis
-                resolution = width * height
-                
-                # Adaptive sampling based on resolution
-                if resolution < 480 * 360:  # Low resolution (VGA or lower)
-                    sample_frames = min(20, max(3, total_frames // 3))  # More samples for low-res
-                    self.low_resolution_mode = True
-                    print(f"[AI Analysis] Low resolution detected: {width}x{height}, using adaptive sampling", file=sys.stderr)
-                elif resolution < 1280 * 720:  # Medium resolution
-                    sample_frames = min(40, max(8, total_frames // 8))
-                    self.low_resolution_mode = True
-                else:  # High resolution
-                    sample_frames = min(50, max(10, total_frames // 10))
-                    self.low_resolution_mode = True
-                
-                print(f"[AI Analysis] Video: {width}x{height}, {total_frames} frames, sampling {sample_frames} frames", file=sys.stderr)
-                
-                for i in range(sample_frames):
-                    frame_idx = int(i * total_frames / sample_frames)
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                    ret, frame = cap.read()
-                    if not ret:
-                        continue
-                    frame_time = (i / sample_frames) * duration
-                    self.analyze_frame_realistic(frame_time, duration, scenario, frame)
+                print(f"[INFO] Opened video file: {video_path}", file=sys.stderr)
+                with self.timer.stage('probe'):
+                    total_frames, indices = self.plan_samples(video_path, cap)
+                self.analyze_samples(video_path, cap, indices, total_frames, scenario, duration)
                 cap.release()
             else:
                 # Enhanced analysis based on duration and scenario
                 self.analyze_video_enhanced(duration, scenario)
             
             # Calculate final scores
-            return self.calculate_scores(scenario, duration)
+            with self.timer.stage('aggregate'):
+                result = self.calculate_scores(scenario, duration)
+            if video_exists:
+                result["instrumentation"] = {
+                    "probe": self.video_info.as_dict(),
+                    "preprocess": self.preprocessor.report(self.loop_seconds),
+                    "timeline": self.timeline.summary(),
+                    "motion": self.motion_filter.report(),
+                }
+                if self.timer.enabled:
+                    result["timings"] = self.timer.report()
+            return result
             
         except Exception as e:
             # Fallback to enhanced mock analysis
             print(f"Error in analysis: {str(e)}", file=sys.stderr)
             return self.generate_enhanced_mock_analysis(scenario, duration)
     
+    def plan_samples(self, video_path: str, cap) -> Tuple[int, List[int]]:
+        """Pick the sampled frame indices from the probed stream properties (also sets low_resolution_mode)"""
+        self.video_info = probe_video(video_path, cap)
+        total_frames = self.video_info.frames
+        width = self.video_info.width
+        height = self.video_info.height
+        print(f"[INFO] Total frames: {total_frames}, Resolution: {width}x{height}", file=sys.stderr)
+        
+        # Get video resolution for adaptive analysis
+        resolution = width * height
+        
+        # Adaptive sampling based on resolution
+        if resolution < 480 * 360:  # Low resolution (VGA or lower)
+            sample_frames = min(20, max(3, total_frames // 3))  # More samples for low-res
+            self.low_resolution_mode = True
+            print(f"[AI Analysis] Low resolution detected: {width}x{height}, using adaptive sampling", file=sys.stderr)
+        elif resolution < 1280 * 720:  # Medium resolution
+            sample_frames = min(40, max(8, total_frames // 8))
+            self.low_resolution_mode = True
+        else:  # High resolution
+            sample_frames = min(50, max(10, total_frames // 10))
+            self.low_resolution_mode = True
+        
+        print(f"[AI Analysis] Video: {width}x{height}, {total_frames} frames, sampling {sample_frames} frames", file=sys.stderr)
+        return total_frames, sample_indices(total_frames, sample_frames)
+    
+    def analyze_samples(self, video_path: str, cap, indices: List[int], total_frames: int,
+                        scenario: str, duration: float, seek: bool = False):
+        """Decode and analyze the given frame indices in one pass"""
+        source = video_path if self.sampling == 'keyframe' else cap
+        self.timeline.reserve(len(self.timeline) + len(indices))
+        loop_started = time.perf_counter()
+        samples = FrameSampler(source, indices, mode=self.sampling, seek=seek)
+        for frame_idx, _, frame in self.timer.timed_iter('decode', samples):
+            frame_time = (frame_idx / total_frames) * duration if total_frames else 0.0
+            with self.timer.frame():
+                if self.motion_filter.unchanged(frame) and self.last_detections is not None:
+                    self.record_detections(frame_time, *self.last_detections)
+                    continue
+                self.analyze_frame_realistic(frame_time, duration, scenario, frame)
+        self.loop_seconds = time.perf_counter() - loop_started
+    
+    def export_state(self) -> Dict[str, Any]:
+        """Partial accumulators of this analyzer, picklable for segmented analysis"""
+        self.finalize_frames()
+        state = {name: list(getattr(self, name)) for name in ACCUMULATOR_LISTS}
+        state['timeline'] = self.timeline.to_bytes()
+        state.update({name: dict(getattr(self, name)) for name in ACCUMULATOR_COUNTS})
+        state.update({name: getattr(self, name) for name in ACCUMULATOR_COUNTERS})
+        state['preprocess'] = {
+            'frames': self.preprocessor.frames,
+            'seconds': self.preprocessor.seconds,
+            'source_shape': self.preprocessor.source_shape,
+            'input_shapes': dict(self.preprocessor.input_shapes),
+        }
+        state['motion'] = {
+            'frames_checked': self.motion_filter.frames_checked,
+            'frames_skipped': self.motion_filter.frames_skipped,
+            'seconds': self.motion_filter.seconds,
+        }
+        state['timer'] = self.timer.export_state()
+        return state
+    
+    def merge_state(self, state: Dict[str, Any]):
+        """Add another analyzer's accumulators (merge segments in time order)"""
+        for name in ACCUMULATOR_LISTS:
+            getattr(self, name).extend(state[name])
+        self.timeline.append_timeline(FrameTimeline.from_bytes(state['timeline']))
+        for name in ACCUMULATOR_COUNTS:
+            counts = getattr(self, name)
+            for key, value in state[name].items():
+                counts[key] = counts.get(key, 0) + value
+        for name in ACCUMULATOR_COUNTERS:
+            setattr(self, name, getattr(self, name) + state[name])
+        preprocess = state['preprocess']
+        self.preprocessor.frames += preprocess['frames']
+        self.preprocessor.seconds += preprocess['seconds']
+        self.preprocessor.source_shape = preprocess['source_shape'] or self.preprocessor.source_shape
+        self.preprocessor.input_shapes.update(preprocess['input_shapes'])
+        motion = state['motion']
+        self.motion_filter.frames_checked += motion['frames_checked']
+        self.motion_filter.frames_skipped += motion['frames_skipped']
+        self.motion_filter.seconds += motion['seconds']
+        self.timer.merge_state(state['timer'])
+    
     def analyze_frame_realistic(self, frame_time: float, total_duration: float, scenario: str, frame=None):
         """Realistic frame analysis using MediaPipe for face, eyes, and hands"""
         try:
@@ -141,235 +235,40 @@ class RealVideoAnalyzer:
                 self.posture_data.append(80)
                 return
             
-            # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Downscale per model and convert BGR to RGB (inputs are built on first access)
+            with self.timer.stage('preprocess'):
+                inputs = self.preprocessor.prepare(frame)
+                face_input, hands_input, pose_input = inputs['face_mesh'], inputs['hands'], inputs['pose']
             
             # Get frame dimensions for debugging
-            height, width = rgb_frame.shape[:2]
+            height, width = frame.shape[:2]
             resolution = width * height
             
-            # Adaptive processing for low resolution
-            if hasattr(self, 'low_resolution_mode') and self.low_resolution_mode:
-                # For low-res videos, be more lenient with detection
-                face_confidence_threshold = 0.3  # Lower threshold for low-res
-                pose_visibility_threshold = 0.6   # Lower threshold for low-res
-                eye_threshold = 0.012            # More lenient eye detection
+            # The three graphs are independent; run them together when parallel mode is on
+            graph_tasks = {
+                'face_mesh': (self.timer.timed('faceMesh', self.face_mesh.process), face_input),
+                'hands': (self.timer.timed('hands', self.hands.process), hands_input),
+                'pose': (self.timer.timed('pose', self.pose.process), pose_input),
+            }
+            if self.parallel:
+                graph_results = run_graphs(graph_tasks)
             else:
-                # Standard thresholds for higher resolution
-                face_confidence_threshold = 0.5
-                pose_visibility_threshold = 0.8
-                eye_threshold = 0.015
+                graph_results = {name: fn(arg) for name, (fn, arg) in graph_tasks.items()}
             
             # Face detection with enhanced debugging
-            face_results = self.face_mesh.process(rgb_frame)
+            face_results = graph_results['face_mesh']
             num_faces = len(face_results.multi_face_landmarks) if face_results.multi_face_landmarks else 0
             
             # Debug information
             if self.total_frames < 5:  # Only log first few frames to avoid spam
                 print(f"[DEBUG] Frame {self.total_frames}: {width}x{height}, faces detected: {num_faces}, low-res mode: {getattr(self, 'low_resolution_mode', False)}", file=sys.stderr)
             
-            confident_face = False
-            confident_eye = False
-            confident_hand = False
-            confident_posture = False
-            eyes_open = False
-            gaze_forward = False
-            
-            # Enhanced face detection with adaptive thresholds
-            if num_faces > 0 and face_results.multi_face_landmarks:
-                confident_face = True
-                self.face_detected_frames += 1
-                face_landmarks = face_results.multi_face_landmarks[0]
-                
-                try:
-                    # Eye open detection with adaptive thresholds
-                    left_eye_top = face_landmarks.landmark[159]
-                    left_eye_bottom = face_landmarks.landmark[145]
-                    right_eye_top = face_landmarks.landmark[386]
-                    right_eye_bottom = face_landmarks.landmark[374]
-                    
-                    left_eye_open = abs(left_eye_top.y - left_eye_bottom.y) > eye_threshold
-                    right_eye_open = abs(right_eye_top.y - right_eye_bottom.y) > eye_threshold
-                    eyes_open = left_eye_open and right_eye_open
-                    
-                    # Gaze direction with more robust landmark access
-                    left_iris = face_landmarks.landmark[468]
-                    right_iris = face_landmarks.landmark[473]
-                    left_eye_outer = face_landmarks.landmark[33]
-                    left_eye_inner = face_landmarks.landmark[133]
-                    right_eye_inner = face_landmarks.landmark[362]
-                    right_eye_outer = face_landmarks.landmark[263]
-                    
-                    left_gaze_centered = left_eye_outer.x < left_iris.x < left_eye_inner.x
-                    right_gaze_centered = right_eye_inner.x < right_iris.x < right_eye_outer.x
-                    gaze_forward = left_gaze_centered and right_gaze_centered
-                    
-                    # Eye contact: more lenient for low-res videos
-                    if eyes_open and gaze_forward:
-                        confident_eye = True
-                        self.eye_contact_frames += 1
-                    elif hasattr(self, 'low_resolution_mode') and self.low_resolution_mode and eyes_open:
-                        # For low-res, accept eye contact if eyes are open (more lenient)
-                        confident_eye = True
-                        self.eye_contact_frames += 1
-                        
-                except (IndexError, AttributeError) as e:
-                    # If landmark access fails, still count as face detected but not confident eye
-                    if self.total_frames < 5:
-                        print(f"[DEBUG] Landmark access error: {e}", file=sys.stderr)
-                    confident_eye = False
-            else:
-                self.no_face_frames += 1
-                if self.total_frames < 5:
-                    print(f"[DEBUG] No face detected in frame {self.total_frames}", file=sys.stderr)
-                    
-            if num_faces > 1:
-                self.multi_face_frames += 1
-                if self.total_frames < 5:
-                    print(f"[DEBUG] Multiple faces detected: {num_faces}", file=sys.stderr)
-                    
-            # Hand detection with adaptive confidence threshold
-            hand_results = self.hands.process(rgb_frame)
-            if hand_results.multi_hand_landmarks:
-                confident_hand = True
-                self.hand_detected_frames += 1
-                
-            # Posture detection with adaptive visibility threshold
-            pose_results = self.pose.process(rgb_frame)
-            if pose_results.pose_landmarks:
-                left_shoulder = pose_results.pose_landmarks.landmark[11]
-                right_shoulder = pose_results.pose_landmarks.landmark[12]
-                left_hip = pose_results.pose_landmarks.landmark[23]
-                right_hip = pose_results.pose_landmarks.landmark[24]
-                left_elbow = pose_results.pose_landmarks.landmark[13]
-                right_elbow = pose_results.pose_landmarks.landmark[14]
-                left_wrist = pose_results.pose_landmarks.landmark[15]
-                right_wrist = pose_results.pose_landmarks.landmark[16]
-                
-                # Use adaptive visibility threshold
-                if all(lm.visibility > pose_visibility_threshold for lm in [left_shoulder, right_shoulder, left_hip, right_hip]):
-                    confident_posture = True
-                    self.good_posture_frames += 1
-                    
-            # Adaptive scoring based on resolution
-            if hasattr(self, 'low_resolution_mode') and self.low_resolution_mode:
-                # For low-res videos, be more generous with scoring
-                face_score = 100 if confident_face else 50  # Partial credit for face detection
-                eye_score = 100 if confident_eye else (50 if confident_face else 0)  # Partial credit if face detected
-                hand_score = 100 if confident_hand else 30  # Lower threshold for hands
-                posture_score = 100 if confident_posture else 40  # Lower threshold for posture
-            else:
-                # Standard scoring for higher resolution
-                face_score = 100 if confident_face else 0
-                eye_score = 100 if confident_eye else 0
-                hand_score = 100 if confident_hand else 0
-                posture_score = 100 if confident_posture else 0
-                
-            # Overall score calculation
-            self.overall_scores.append(25 * int(confident_face) + 25 * int(confident_eye) + 25 * int(confident_hand) + 25 * int(confident_posture))
-            self.eye_contact_scores.append(eye_score)
-            self.facial_expression_scores.append(face_score)
-            self.gesture_scores.append(hand_score)
-            self.posture_scores.append(posture_score)
-            # Store data
-            self.frame_analysis_data.append({
-                'time': frame_time,
-                'eye_contact': self.eye_contact_scores[-1],
-                'expression': self.facial_expression_scores[-1],
-                'gesture': self.gesture_scores[-1],
-                'posture': self.posture_scores[-1],
-                'face_detected': confident_face,
-                'hands_detected': confident_hand
-            })
-            self.total_frames += 1
-            # After confident_face detection
-            if confident_face and face_results.multi_face_landmarks:
-                face_landmarks = face_results.multi_face_landmarks[0]
-                # Head pose estimation using nose and eyes
-                # Nose tip: 1, left eye: 33, right eye: 263, chin: 152
-                nose = face_landmarks.landmark[1]
-                left_eye = face_landmarks.landmark[33]
-                right_eye = face_landmarks.landmark[263]
-                chin = face_landmarks.landmark[152]
-                # Horizontal head pose (yaw): compare nose.x to eyes
-                eye_center_x = (left_eye.x + right_eye.x) / 2
-                if nose.x < eye_center_x - 0.01:
-                    self.head_pose_counts['left'] += 1
-                elif nose.x > eye_center_x + 0.01:
-                    self.head_pose_counts['right'] += 1
-                else:
-                    # Vertical head pose (pitch): compare nose.y to chin
-                    if nose.y < chin.y - 0.02:
-                        self.head_pose_counts['up'] += 1
-                    elif nose.y > chin.y + 0.02:
-                        self.head_pose_counts['down'] += 1
-                    else:
-                        self.head_pose_counts['forward'] += 1
-                # Use the first detected face for emotion estimation
-                # Get mouth and eyebrow landmarks
-                # Mouth: 61 (left), 291 (right), 13 (top), 14 (bottom)
-                # Eyebrows: 70 (left), 300 (right), 105 (left top), 334 (right top)
-                mouth_left = face_landmarks.landmark[61]
-                mouth_right = face_landmarks.landmark[291]
-                mouth_top = face_landmarks.landmark[13]
-                mouth_bottom = face_landmarks.landmark[14]
-                brow_left = face_landmarks.landmark[70]
-                brow_right = face_landmarks.landmark[300]
-                brow_left_top = face_landmarks.landmark[105]
-                brow_right_top = face_landmarks.landmark[334]
-                # Calculate mouth aspect ratio (smile proxy)
-                mouth_width = ((mouth_right.x - mouth_left.x) ** 2 + (mouth_right.y - mouth_left.y) ** 2) ** 0.5
-                mouth_height = ((mouth_top.x - mouth_bottom.x) ** 2 + (mouth_top.y - mouth_bottom.y) ** 2) ** 0.5
-                smile_ratio = mouth_width / (mouth_height + 1e-6)
-                # Calculate eyebrow raise (surprise proxy)
-                brow_raise = ((brow_left_top.y - brow_left.y) + (brow_right_top.y - brow_right.y)) / 2
-                # Heuristic thresholds
-                if smile_ratio > 2.0:
-                    self.emotion_counts['happy'] += 1
-                elif brow_raise < -0.03:
-                    self.emotion_counts['surprised'] += 1
-                else:
-                    self.emotion_counts['neutral'] += 1
-            # After confident_hand detection
-            if confident_hand and hand_results.multi_hand_landmarks:
-                for hand_landmarks in hand_results.multi_hand_landmarks:
-                    # Simple gesture classification using thumb and finger tip distances
-                    # Open palm: all finger tips far from wrist
-                    # Fist: all finger tips close to wrist
-                    wrist = hand_landmarks.landmark[0]
-                    tip_ids = [4, 8, 12, 16, 20]
-                    tip_distances = [((hand_landmarks.landmark[tip].x - wrist.x) ** 2 + (hand_landmarks.landmark[tip].y - wrist.y) ** 2) ** 0.5 for tip in tip_ids]
-                    avg_tip_distance = sum(tip_distances) / len(tip_distances)
-                    if avg_tip_distance > 0.25:
-                        self.gesture_counts['open_palm'] += 1
-                    elif avg_tip_distance < 0.12:
-                        self.gesture_counts['fist'] += 1
-                    else:
-                        self.gesture_counts['other'] += 1
-            # After confident_posture detection
-            if confident_posture and pose_results.pose_landmarks:
-                # Shoulders: 11 (left), 12 (right); Hips: 23 (left), 24 (right); Elbows: 13 (left), 14 (right); Wrists: 15 (left), 16 (right)
-                left_shoulder = pose_results.pose_landmarks.landmark[11]
-                right_shoulder = pose_results.pose_landmarks.landmark[12]
-                left_hip = pose_results.pose_landmarks.landmark[23]
-                right_hip = pose_results.pose_landmarks.landmark[24]
-                left_elbow = pose_results.pose_landmarks.landmark[13]
-                right_elbow = pose_results.pose_landmarks.landmark[14]
-                left_wrist = pose_results.pose_landmarks.landmark[15]
-                right_wrist = pose_results.pose_landmarks.landmark[16]
-                # Slouching: shoulders much lower than hips
-                if (left_shoulder.y > left_hip.y + 0.1 and right_shoulder.y > right_hip.y + 0.1):
-                    self.posture_quality_counts['slouching'] += 1
-                # Leaning left/right: shoulder-hip x difference
-                elif (left_shoulder.x < left_hip.x - 0.07 and right_shoulder.x < right_hip.x - 0.07):
-                    self.posture_quality_counts['leaning_left'] += 1
-                elif (left_shoulder.x > left_hip.x + 0.07 and right_shoulder.x > right_hip.x + 0.07):
-                    self.posture_quality_counts['leaning_right'] += 1
-                # Arms crossed: wrists close to opposite elbows
-                elif (abs(left_wrist.x - right_elbow.x) < 0.07 and abs(right_wrist.x - left_elbow.x) < 0.07):
-                    self.posture_quality_counts['arms_crossed'] += 1
-                else:
-                    self.posture_quality_counts['confident'] += 1
+            # Landmark heuristics (eyes, gaze, head pose, emotion, gestures, posture) are evaluated
+            # for all frames at once in finalize_frames(); here only the used points are read
+            first_face = face_results.multi_face_landmarks[0] if num_faces > 0 else None
+            self.last_detections = (first_face, graph_results['hands'].multi_hand_landmarks,
+                                    graph_results['pose'].pose_landmarks, num_faces)
+            self.record_detections(frame_time, *self.last_detections)
         except Exception as e:
             # If frame analysis fails, use default values
             self.eye_contact_data.append(70)
@@ -377,6 +276,83 @@ class RealVideoAnalyzer:
             self.gesture_data.append(65)
             self.posture_data.append(80)
     
+    def record_detections(self, frame_time: float, first_face, multi_hand_landmarks, pose_landmarks, num_faces: int):
+        """Queue one frame's landmarks for finalize_frames() and update the detection counters"""
+        self.landmark_batch.add_frame(first_face, multi_hand_landmarks, pose_landmarks)
+        self.frame_times.append(frame_time)
+        
+        if first_face is not None:
+            self.face_detected_frames += 1
+        else:
+            self.no_face_frames += 1
+            if self.total_frames < 5:
+                print(f"[DEBUG] No face detected in frame {self.total_frames}", file=sys.stderr)
+                
+        if num_faces > 1:
+            self.multi_face_frames += 1
+            if self.total_frames < 5:
+                print(f"[DEBUG] Multiple faces detected: {num_faces}", file=sys.stderr)
+                
+        if multi_hand_landmarks:
+            self.hand_detected_frames += 1
+        self.total_frames += 1
+    
+    def detection_thresholds(self) -> Tuple[float, float]:
+        """(eye openness, pose visibility) thresholds for the current resolution mode"""
+        if hasattr(self, 'low_resolution_mode') and self.low_resolution_mode:
+            # For low-res videos, be more lenient with detection
+            return 0.012, 0.6
+        # Standard thresholds for higher resolution
+        return 0.015, 0.8
+    
+    def finalize_frames(self):
+        """Score the frames collected by analyze_frame_realistic from their landmarks, all at once"""
+        batch = self.landmark_batch
+        if not batch.frames:
+            return
+        eye_threshold, pose_visibility_threshold = self.detection_thresholds()
+        with self.timer.stage('score'):
+            features = batch.features(eye_threshold, pose_visibility_threshold)
+        low_resolution = hasattr(self, 'low_resolution_mode') and self.low_resolution_mode
+        
+        confident_face = features['face']
+        confident_hand = np.zeros(batch.frames, dtype=bool)
+        confident_hand[batch.hand_frames] = True
+        # Eye contact needs open eyes and centred irises; low-res videos accept open eyes alone
+        confident_eye = confident_face & features['has_iris'] & features['eyes_open'] & (features['gaze_forward'] | low_resolution)
+        confident_posture = features['pose_confident']
+        self.eye_contact_frames += int(confident_eye.sum())
+        self.good_posture_frames += int(confident_posture.sum())
+        
+        # Adaptive scoring based on resolution
+        if low_resolution:
+            # For low-res videos, be more generous with scoring (partial credit)
+            face_scores = np.where(confident_face, 100, 50)
+            eye_scores = np.where(confident_eye, 100, np.where(confident_face, 50, 0))
+            hand_scores = np.where(confident_hand, 100, 30)
+            posture_scores = np.where(confident_posture, 100, 40)
+        else:
+            face_scores = np.where(confident_face, 100, 0)
+            eye_scores = np.where(confident_eye, 100, 0)
+            hand_scores = np.where(confident_hand, 100, 0)
+            posture_scores = np.where(confident_posture, 100, 0)
+        overall_scores = 25 * (confident_face.astype(int) + confident_eye + confident_hand + confident_posture)
+        
+        self.timeline.extend(time=self.frame_times, eye_contact=eye_scores, expression=face_scores,
+                             gesture=hand_scores, posture=posture_scores, overall=overall_scores,
+                             face_detected=confident_face, hands_detected=confident_hand)
+        
+        # Head pose and emotion of the first face, gesture of every hand, posture quality of confident torsos
+        for counts, labels in ((self.head_pose_counts, features['head_pose'][confident_face]),
+                               (self.emotion_counts, features['emotion'][confident_face]),
+                               (self.gesture_counts, features['gestures']),
+                               (self.posture_quality_counts, features['posture_quality'][confident_posture])):
+            for label, count in zip(*np.unique(labels, return_counts=True)):
+                counts[str(label)] += int(count)
+        
+        batch.clear()
+        self.frame_times = []
+    
     def analyze_video_enhanced(self, duration: float, scenario: str):
         """Enhanced analysis when video file is not available"""
         # If we cannot analyze, set all scores to zero
@@ -387,6 +363,7 @@ class RealVideoAnalyzer:
     
     def calculate_scores(self, scenario: str, duration: float) -> Dict[str, Any]:
         """Calculate final analysis scores with error handling"""
+        self.finalize_frames()
         try:
             # Calculate average scores
             eye_contact_score = int(sum(self.eye_contact_data) / len(self.eye_contact_data)) if self.eye_contact_data else 70
@@ -483,7 +460,7 @@ class RealVideoAnalyzer:
                             "professionalism": 0
                         },
                         "analysisMethod": "Real AI Analysis (Python 3.13)",
-                        "framesAnalyzed": len(self.frame_analysis_data),
+                        "framesAnalyzed": len(self.timeline),
                         "scenario": scenario,
                         "duration": duration,
                         "detectionStats": {
@@ -584,7 +561,7 @@ class RealVideoAnalyzer:
                     "counts": self.posture_quality_counts
                 },
                 "analysisMethod": "Real AI Analysis (Python 3.13)",
-                "framesAnalyzed": len(self.frame_analysis_data),
+                "framesAnalyzed": len(self.timeline),
                 "scenario": scenario,
                 "duration": duration,
                 "emotions": {
@@ -762,9 +739,15 @@ def main():
         duration = float(sys.argv[3])
         print(f"video_path: {video_path}, scenario: {scenario}, duration: {duration}", file=sys.stderr)
         
-        # Initialize analyzer and run analysis
-        analyzer = RealVideoAnalyzer()
-        result = analyzer.analyze_video(video_path, scenario, duration)
+        # Initialize analyzer and run analysis (split across processes when AI_SEGMENT_WORKERS > 1)
+        parallel = os.environ.get('AI_PARALLEL_GRAPHS') == '1'
+        timings = os.environ.get('AI_TIMINGS') == '1'  # add the per-stage "timings" block
+        if int(os.environ.get('AI_SEGMENT_WORKERS', '1')) > 1:
+            from segmented_analysis import analyze_video_segmented
+            result = analyze_video_segmented(video_path, scenario, duration, parallel=parallel, timings=timings)
+        else:
+            analyzer = RealVideoAnalyzer(parallel=parallel, timings=timings)
+            result = analyzer.analyze_video(video_path, scenario, duration)
         
         # Output result as JSON
         print(json.dumps(result))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of analysis results
+- Key: SHA-256 over the video bytes' SHA-256, the scenario, ANALYZER_VERSION and the options
+  that can change scores (mode, sampling, resize, cascade, adaptive, motion_threshold)
+- parallel is left out: it only runs the same graphs on threads, so its results are identical
+- One JSON file per key in AI_CACHE_DIR, shared by every gunicorn worker on the host
+- A hit refreshes the file's mtime; writes evict the least recently used files until the
+  store fits in AI_CACHE_MAX_MB
+- Only successful analyses are stored, so a retry after a failure always re-runs the pipeline
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+CACHE_DIR = os.environ.get('AI_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'ai-analysis-cache'))
+CACHE_MAX_BYTES = int(float(os.environ.get('AI_CACHE_MAX_MB', '256')) * 1024 * 1024)
+CACHE_ENABLED = os.environ.get('AI_CACHE_ENABLED', '1') == '1'
+
+# Options that affect the scores for a given video
+KEYED_OPTIONS = ('mode', 'sampling', 'resize', 'cascade', 'adaptive', 'motion_threshold')
+
+
+def cache_key(video_digest: str, scenario: str, analyzer_version: str, options: Dict[str, Any] = None) -> str:
+    keyed = {name: (options or {}).get(name) for name in KEYED_OPTIONS}
+    material = json.dumps([video_digest, scenario, analyzer_version, keyed], sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """On-disk LRU store of result dicts with a total size cap"""
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._evict_lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the store is under the size cap"""
+        with self._evict_lock:
+            entries = []
+            try:
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith('.json'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                return
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "maxBytes": self.max_bytes}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[ResultCache]:
+    """Process-wide cache, or None when AI_CACHE_ENABLED=0"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache()
+                print(f"[INFO] Result cache at {_cache.directory} (cap {_cache.max_bytes // (1024 * 1024)} MB)",
+                      file=sys.stderr)
+    return _cache
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Process-pool segmented analysis for long videos
+- Splits the RealVideoAnalyzer sample plan into N contiguous time segments
+- Each segment runs in its own process with its own MediaPipe graphs and VideoCapture,
+  seeking once to its first frame and decoding forward from there
+- The per-segment accumulators (the frame timeline as compact bytes, detection counters and the
+  emotion/gesture/head pose/posture quality counts) are merged in time order into the normal
+  result schema
+- Processes are spawned, not forked, because MediaPipe graphs are not fork-safe
+- Used by the real_ai_analysis CLI (AI_SEGMENT_WORKERS) only: /analyze and /jobs run the strict
+  analyzer on one core per request, since its adaptive stop and progress events need frame order
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+import cv2
+
+from real_ai_analysis import RealVideoAnalyzer
+
+DEFAULT_SEGMENT_WORKERS = int(os.environ.get('AI_SEGMENT_WORKERS', os.cpu_count() or 1))
+
+
+def split_segments(indices: List[int], segments: int) -> List[List[int]]:
+    """Contiguous, near-equal chunks of the (sorted) sample plan"""
+    segments = max(1, min(segments, len(indices)))
+    size, extra = divmod(len(indices), segments)
+    chunks, start = [], 0
+    for i in range(segments):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(indices[start:end])
+        start = end
+    return chunks
+
+
+def _analyze_segment(video_path: str, indices: List[int], total_frames: int, scenario: str,
+                     duration: float, low_resolution_mode: bool, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker process entry point: analyze one segment and return its accumulators"""
+    analyzer = RealVideoAnalyzer(**options)
+    analyzer.low_resolution_mode = low_resolution_mode
+    cap = cv2.VideoCapture(video_path)
+    try:
+        analyzer.analyze_samples(video_path, cap, indices, total_frames, scenario, duration, seek=True)
+    finally:
+        cap.release()
+    return analyzer.export_state()
+
+
+def analyze_video_segmented(video_path: str, scenario: str, duration: float, workers: int = None,
+                            **options) -> Dict[str, Any]:
+    """Same result as RealVideoAnalyzer.analyze_video, with decoding and inference spread over processes"""
+    workers = workers or DEFAULT_SEGMENT_WORKERS
+    if not scenario or not isinstance(scenario, str):
+        scenario = "Free Practice"
+    if not isinstance(duration, (int, float)) or duration <= 0:
+        duration = 30.0
+
+    if workers <= 1 or not (video_path and len(video_path) < 1000 and os.path.exists(video_path)):
+        return RealVideoAnalyzer(**options).analyze_video(video_path, scenario, duration)
+
+    # The parent only plans, merges and scores, so it does not build MediaPipe graphs
+    analyzer = RealVideoAnalyzer(load_models=False, **options)
+    try:
+        with analyzer.timer.stage('open'):
+            cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            print(f"[ERROR] Could not open video file: {video_path}", file=sys.stderr)
+            return analyzer.generate_enhanced_mock_analysis(scenario, duration)
+        with analyzer.timer.stage('probe'):
+            total_frames, indices = analyzer.plan_samples(video_path, cap)
+        cap.release()
+
+        segments = split_segments(indices, workers)
+        print(f"[AI Analysis] Segmented analysis: {len(indices)} samples over {len(segments)} processes", file=sys.stderr)
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=len(segments),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [
+                pool.submit(_analyze_segment, video_path, segment, total_frames, scenario, duration,
+                            analyzer.low_resolution_mode, options)
+                for segment in segments
+            ]
+            states = [future.result() for future in futures]
+        analyzer.loop_seconds = time.perf_counter() - started
+
+        analyzer.timeline.reserve(len(indices))
+        for state in states:
+            analyzer.merge_state(state)
+        with analyzer.timer.stage('aggregate'):
+            result = analyzer.calculate_scores(scenario, duration)
+        result["instrumentation"] = {
+            "probe": analyzer.video_info.as_dict(),
+            "preprocess": analyzer.preprocessor.report(analyzer.loop_seconds),
+            "timeline": analyzer.timeline.summary(),
+            "motion": analyzer.motion_filter.report(),
+            "segments": {
+                "count": len(segments),
+                "samplesPerSegment": [len(segment) for segment in segments],
+                "wallSeconds": round(analyzer.loop_seconds, 3),
+            },
+        }
+        if analyzer.timer.enabled:
+            result["timings"] = analyzer.timer.report()
+        return result
+    except Exception as e:
+        print(f"Error in segmented analysis: {str(e)}", file=sys.stderr)
+        return analyzer.generate_enhanced_mock_analysis(scenario, duration)
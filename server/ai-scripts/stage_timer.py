@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing for the MediaPipe analyzers (the optional `timings` block of a result)
+- Stages (base64 decode, temp-file write, capture open, probe, decode, preprocess, FaceMesh,
+  Hands, Pose, scoring, aggregation) accumulate wall time (perf_counter) and CPU time
+  (process_time) per call; per-call wall times give p50/p90/p99/max per stage
+- `perFrame` is the wall time of analyzing one sampled frame once it is decoded
+  (preprocess + graphs + scoring); decoding and seeking are the separate `decode` stage
+- CPU time is process-wide, so it includes MediaPipe's and FFmpeg's own threads; a concurrent
+  request in the same worker inflates it. CPU well below wall means the stage was waiting
+- Segment workers' stages are merged into the parent's, so with AI_SEGMENT_WORKERS > 1 a stage's
+  wallSeconds is summed over processes and can exceed totalSeconds
+- Disabled (the default), timed() and timed_iter() hand back the callable/iterable unchanged and
+  stage()/frame() return a shared no-op context, so the analyzers pay nothing for it
+"""
+
+import contextlib
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+import numpy as np
+
+_NO_OP = contextlib.nullcontext()
+
+
+def percentiles_ms(samples: List[float]) -> Dict[str, float]:
+    """p50/p90/p99/max in milliseconds of wall-time samples in seconds"""
+    if not samples:
+        return {}
+    p50, p90, p99 = np.percentile(samples, (50, 90, 99))
+    return {"p50Ms": round(1000 * p50, 3), "p90Ms": round(1000 * p90, 3), "p99Ms": round(1000 * p99, 3),
+            "maxMs": round(1000 * max(samples), 3)}
+
+
+class StageStats:
+    """Wall and CPU seconds of every call of one stage; list.append keeps it safe across graph threads"""
+
+    def __init__(self):
+        self.wall: List[float] = []
+        self.cpu: List[float] = []
+
+    def report(self) -> Dict[str, Any]:
+        return {"calls": len(self.wall), "wallSeconds": round(sum(self.wall), 4),
+                "cpuSeconds": round(sum(self.cpu), 4), **percentiles_ms(self.wall)}
+
+
+class _Span:
+    """One timed call of a stage"""
+    __slots__ = ('stats', 'wall_started', 'cpu_started')
+
+    def __init__(self, stats: StageStats):
+        self.stats = stats
+
+    def __enter__(self):
+        self.wall_started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.wall.append(time.perf_counter() - self.wall_started)
+        self.stats.cpu.append(time.process_time() - self.cpu_started)
+        return False
+
+
+class StageTimer:
+    """Named stages plus per-frame wall times; every method is a no-op when disabled"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = bool(enabled)
+        self.stages: Dict[str, StageStats] = {}
+        self.frames = StageStats()
+        self.started = time.perf_counter()
+
+    def _stats(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages.setdefault(name, StageStats())
+        return stats
+
+    def stage(self, name: str):
+        """Context manager timing one call of a stage"""
+        return _Span(self._stats(name)) if self.enabled else _NO_OP
+
+    def frame(self):
+        """Context manager timing the analysis of one sampled frame"""
+        return _Span(self.frames) if self.enabled else _NO_OP
+
+    def timed(self, name: str, fn: Callable) -> Callable:
+        """fn, with every call timed as the stage `name` (fn itself when disabled)"""
+        if not self.enabled:
+            return fn
+
+        def timed_call(*args, **kwargs):
+            with _Span(self._stats(name)):
+                return fn(*args, **kwargs)
+        return timed_call
+
+    def timed_iter(self, name: str, iterable: Iterable) -> Iterable:
+        """iterable, with the time to produce each item timed as the stage `name`"""
+        if not self.enabled:
+            return iterable
+        return self._timed_iter(self._stats(name), iter(iterable))
+
+    @staticmethod
+    def _timed_iter(stats: StageStats, iterator: Iterator) -> Iterator:
+        while True:
+            wall_started, cpu_started = time.perf_counter(), time.process_time()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            stats.wall.append(time.perf_counter() - wall_started)
+            stats.cpu.append(time.process_time() - cpu_started)
+            yield item
+
+    def export_state(self) -> Dict[str, Any]:
+        """Raw per-call samples, picklable, for merging a segment worker's timer into the parent's"""
+        return {"stages": {name: (stats.wall, stats.cpu) for name, stats in self.stages.items()},
+                "frames": (self.frames.wall, self.frames.cpu)}
+
+    def merge_state(self, state: Dict[str, Any]):
+        for name, (wall, cpu) in state["stages"].items():
+            stats = self._stats(name)
+            stats.wall.extend(wall)
+            stats.cpu.extend(cpu)
+        self.frames.wall.extend(state["frames"][0])
+        self.frames.cpu.extend(state["frames"][1])
+
+    def report(self) -> Dict[str, Any]:
+        """The `timings` block: total wall time, stages in first-use order, per-frame percentiles"""
+        return {
+            "totalSeconds": round(time.perf_counter() - self.started, 4),
+            "stages": {name: stats.report() for name, stats in self.stages.items()},
+            "perFrame": {"frames": len(self.frames.wall), **percentiles_ms(self.frames.wall)},
+        }
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Weight resolution of the model registry on a clean checkout
+- resolve_weights('yolov8n') works with no AI_* environment variables and an empty model directory
+- A known checksum is enforced: a mismatching download is discarded, and AI_MODEL_REQUIRE_CHECKSUM=1
+  refuses a file with no known checksum
+- The download is stubbed (no network, no ultralytics); every test uses its own temp model directory
+Usage: python -m unittest test_model_registry   (or: python -m pytest test_model_registry.py)
+"""
+
+import hashlib
+import importlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import model_registry
+
+WEIGHTS = b'stub yolov8n weights'
+
+
+def clean_environ():
+    return {key: value for key, value in os.environ.items() if not key.startswith('AI_')}
+
+
+class ResolveWeightsTest(unittest.TestCase):
+    def setUp(self):
+        self.model_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.model_dir.cleanup)
+        # Cleanups run last-in first-out: the environment is restored before the module is re-read
+        self.addCleanup(importlib.reload, model_registry)
+        environ = mock.patch.dict(os.environ, clean_environ(), clear=True)
+        environ.start()
+        self.addCleanup(environ.stop)
+        # Re-read the module's env-derived settings (MODEL_SPECS, OFFLINE, ...) with no AI_* set
+        self.registry = importlib.reload(model_registry)
+        self.registry.MODEL_DIR = self.model_dir.name
+        urlopen = mock.patch('urllib.request.urlopen', side_effect=lambda url, timeout: io.BytesIO(WEIGHTS))
+        self.urlopen = urlopen.start()
+        self.addCleanup(urlopen.stop)
+
+    def test_resolves_with_no_environment(self):
+        path = self.registry.resolve_weights('yolov8n')
+        self.assertEqual(path, os.path.join(self.model_dir.name, 'yolov8n.pt'))
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), WEIGHTS)
+        self.urlopen.assert_called_once()
+        # Unverified, so nothing is pinned for later loads to trust
+        self.assertNotIn('yolov8n.pt', self.registry.load_checksums())
+
+    def test_known_checksum_is_pinned(self):
+        self.registry.MODEL_SPECS['yolov8n']['sha256'] = hashlib.sha256(WEIGHTS).hexdigest()
+        self.registry.resolve_weights('yolov8n')
+        self.assertEqual(self.registry.load_checksums(), {'yolov8n.pt': hashlib.sha256(WEIGHTS).hexdigest()})
+
+    def test_mismatching_download_is_discarded(self):
+        self.registry.MODEL_SPECS['yolov8n']['sha256'] = hashlib.sha256(b'other weights').hexdigest()
+        with self.assertRaises(self.registry.ModelChecksumError):
+            self.registry.resolve_weights('yolov8n')
+        self.assertEqual(os.listdir(self.model_dir.name), [])
+
+    def test_require_checksum_refuses_unknown_file(self):
+        self.registry.REQUIRE_CHECKSUM = True
+        with self.assertRaises(self.registry.ModelChecksumError):
+            self.registry.resolve_weights('yolov8n')
+        self.urlopen.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
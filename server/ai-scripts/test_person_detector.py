@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Parity of the ONNX person detector's reimplemented pre- and post-processing with ultralytics
+- Letterbox: the (N, 3, H, W) input tensor equals the one ultralytics' predictor builds for the
+  same BGR frames (rect letterbox at stride 32, pad 114, BGR -> RGB, / 255), over several shapes
+- NMS: person counts from synthetic raw YOLOv8 predictions equal the person detections that
+  ultralytics' non_max_suppression keeps (conf 0.25, IoU 0.7, class-offset boxes, max_det 300)
+- Needs no weights (no model is loaded); skipped when ultralytics / torch are not installed
+Usage: python -m unittest test_person_detector   (or: python -m pytest test_person_detector.py)
+"""
+
+import unittest
+
+import numpy as np
+
+from person_detector import MAX_DETECTIONS, PERSON_CLASS, OnnxPersonDetector, letterbox, persons_in_predictions
+
+try:
+    import torch
+    from ultralytics.data.augment import LetterBox
+    from ultralytics.utils.nms import non_max_suppression
+except ImportError:
+    torch = None
+
+# (height, width): landscape and portrait, already a multiple of 32, upscaled, odd sizes
+FRAME_SHAPES = [(720, 1280), (1080, 1920), (480, 640), (360, 640), (640, 480), (300, 500), (333, 777)]
+NUM_CLASSES = 80
+# ultralytics predict() defaults, written out so a drifting constant in person_detector fails here
+REFERENCE_NMS = {'conf_thres': 0.25, 'iou_thres': 0.7, 'max_det': 300}
+
+
+def reference_tensor(frames):
+    """ultralytics BasePredictor.preprocess for a .pt model (rect letterbox) as a NumPy array"""
+    transform = LetterBox((640, 640), auto=True, stride=32)
+    batch = torch.from_numpy(np.stack([transform(image=frame) for frame in frames]))
+    return batch.permute(0, 3, 1, 2).flip(1).contiguous().float().div_(255).numpy()
+
+
+def synthetic_predictions(rng, images: int = 4, anchors: int = 3000) -> np.ndarray:
+    """Raw (N, 4 + classes, anchors) output with clusters of overlapping boxes of several classes"""
+    predictions = np.zeros((images, 4 + NUM_CLASSES, anchors), dtype=np.float32)
+    for image in range(images):
+        centers = rng.uniform(40, 600, size=(anchors // 30, 2))
+        cluster = rng.integers(0, len(centers), size=anchors)
+        predictions[image, 0:2] = (centers[cluster] + rng.normal(0, 12, size=(anchors, 2))).T
+        predictions[image, 2:4] = rng.uniform(20, 220, size=(2, anchors))
+        predictions[image, 4:] = rng.uniform(0, 0.2, size=(NUM_CLASSES, anchors))
+        # Most clusters are persons, the rest another class; scores spread across the threshold
+        cluster_class = np.where(rng.random(len(centers)) < 0.6, PERSON_CLASS, rng.integers(1, NUM_CLASSES, len(centers)))
+        predictions[image, 4 + cluster_class[cluster], np.arange(anchors)] = rng.uniform(0.05, 0.95, size=anchors)
+    # One image with nothing above the threshold
+    predictions[-1, 4:] = np.minimum(predictions[-1, 4:], REFERENCE_NMS['conf_thres'] - 0.01)
+    return predictions
+
+
+@unittest.skipIf(torch is None, "ultralytics / torch not installed")
+class LetterboxParityTest(unittest.TestCase):
+    def test_letterbox_matches_ultralytics(self):
+        rng = np.random.default_rng(0)
+        for height, width in FRAME_SHAPES:
+            frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+            with self.subTest(shape=(height, width)):
+                np.testing.assert_array_equal(letterbox(frame), LetterBox((640, 640), auto=True, stride=32)(image=frame))
+
+    def test_input_tensor_matches_ultralytics(self):
+        rng = np.random.default_rng(1)
+        detector = OnnxPersonDetector.__new__(OnnxPersonDetector)  # preprocessing only, no session
+        detector.size = 640
+        for height, width in FRAME_SHAPES:
+            frames = [rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8) for _ in range(3)]
+            with self.subTest(shape=(height, width)):
+                tensor = detector.preprocess(frames)
+                self.assertEqual(tensor.dtype, np.float32)
+                np.testing.assert_array_equal(tensor, reference_tensor(frames))
+
+
+@unittest.skipIf(torch is None, "ultralytics / torch not installed")
+class NmsParityTest(unittest.TestCase):
+    def test_person_counts_match_ultralytics(self):
+        for seed in range(5):
+            predictions = synthetic_predictions(np.random.default_rng(seed))
+            kept = non_max_suppression(torch.from_numpy(predictions), **REFERENCE_NMS)
+            expected = [int((detections[:, 5] == PERSON_CLASS).sum()) for detections in kept]
+            with self.subTest(seed=seed):
+                self.assertGreater(sum(expected), 0)
+                self.assertEqual(persons_in_predictions(predictions), expected)
+
+    def test_max_detections_cap_spans_all_classes(self):
+        # More well-separated boxes than MAX_DETECTIONS: the cap keeps the best of every class together
+        anchors = MAX_DETECTIONS + 100
+        predictions = np.zeros((1, 4 + NUM_CLASSES, anchors), dtype=np.float32)
+        grid = np.arange(anchors)
+        predictions[0, 0], predictions[0, 1] = (grid % 20) * 32 + 16, (grid // 20) * 32 + 16
+        predictions[0, 2:4] = 20
+        classes = np.where(grid % 2 == 0, PERSON_CLASS, 1)
+        predictions[0, 4 + classes, grid] = np.linspace(0.3, 0.9, anchors)
+        kept = non_max_suppression(torch.from_numpy(predictions), **REFERENCE_NMS)
+        self.assertEqual(persons_in_predictions(predictions), [int((kept[0][:, 5] == PERSON_CLASS).sum())])
+
+
+if __name__ == '__main__':
+    unittest.main()
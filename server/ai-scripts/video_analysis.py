@@ -12,20 +12,19 @@ import base64
 import tempfile
 import os
 from typing import Dict, List, Tuple, Any
-from ultralytics import YOLO
+from person_detector import get_person_detector, count_persons
+from frame_sampler import FrameSampler
+from video_probe import probe_video
+from person_presence import PersonPresencePolicy, MULTI_PERSON, NO_PERSON
 
 import warnings
 warnings.filterwarnings("ignore")
 
 class VideoAnalyzer:
     def __init__(self):
-        # Always remove any existing yolov8n.pt to force auto-download of a fresh, compatible model
-        model_path = 'yolov8n.pt'
-        if os.path.exists(model_path):
-            os.remove(model_path)
-        # This will auto-download yolov8n.pt if not present
-        self.yolo_model = YOLO(model_path)
-        # Suppress YOLOv8 output to avoid breaking JSON parsing
+        # Checksum-verified weights from the local model cache, loaded and warmed up once per process;
+        # AI_DETECTOR_BACKEND=onnx runs the ONNX export on ONNX Runtime instead of ultralytics
+        self.detector = get_person_detector()
         
         # Analysis results storage
         self.eye_contact_data = []
@@ -48,56 +47,29 @@ class VideoAnalyzer:
                 "postureScore": 0
             }
         
-        frame_count = 0
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        video_info = probe_video(video_path, cap)
+        total_frames = video_info.frames
         
-        # Sample frames for analysis (every 10th frame for performance)
-        sample_interval = max(1, total_frames // 30)
+        # Detect on a sampled schedule; each detection gates the video and scores its frame.
+        # Decoding stops at the last scheduled frame, or as soon as the verdict is settled
+        presence = PersonPresencePolicy(total_frames)
+        verdict = None
+        sampler = FrameSampler(cap, indices=presence.schedule())
         
-        no_person_frames = 0
-        multi_person_detected = False
-        person_detected_at_least_once = False
-        
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            frame_count += 1
-            
-            # Use YOLOv8 to detect people (suppress output)
-            import io
-            import sys
-            from contextlib import redirect_stdout
-            
-            # Temporarily redirect stdout to suppress YOLOv8 output
-            f = io.StringIO()
-            with redirect_stdout(f):
-                results = self.yolo_model(frame, verbose=False)
-            
-            person_count = 0
-            for box in results[0].boxes:
-                if int(box.cls[0]) == 0:  # class 0 is 'person' in COCO
-                    person_count += 1
-            
-            if person_count == 0:
-                no_person_frames += 1
-                continue
-            if person_count > 1:
-                multi_person_detected = True
+        for _, _, frame in sampler:
+            person_count = self.count_persons(frame)
+            if person_count == 1:
+                self.score_frame(person_count)
+            verdict = presence.observe(person_count)
+            if verdict is not None:
                 break
-            
-            # If exactly one person, run basic analysis
-            person_detected_at_least_once = True
-            
-            # Analyze every nth frame for performance
-            if frame_count % sample_interval == 0:
-                self.analyze_frame_basic(frame)
         
         cap.release()
+        verdict = verdict or presence.verdict()
+        instrumentation = {"probe": video_info.as_dict(), "presence": presence.report(),
+                           "framesDecoded": sampler.frames_decoded}
         
-        if multi_person_detected:
+        if verdict == MULTI_PERSON:
             return {
                 "status": "error",
                 "message": "Multiple people detected in the video. Analysis aborted.",
@@ -105,10 +77,11 @@ class VideoAnalyzer:
                 "eyeContactScore": 0,
                 "facialExpressionScore": 0,
                 "gestureScore": 0,
-                "postureScore": 0
+                "postureScore": 0,
+                "instrumentation": instrumentation
             }
         
-        if not person_detected_at_least_once:
+        if verdict == NO_PERSON:
             return {
                 "status": "error",
                 "message": "No person detected in the video. Please ensure the camera can see you clearly.",
@@ -116,32 +89,27 @@ class VideoAnalyzer:
                 "eyeContactScore": 0,
                 "facialExpressionScore": 0,
                 "gestureScore": 0,
-                "postureScore": 0
+                "postureScore": 0,
+                "instrumentation": instrumentation
             }
         
         # Calculate final scores (no fallback/defaults)
         result = self.calculate_scores(scenario, duration)
         result["status"] = "success"
         result["message"] = "Analysis completed successfully."
+        result["instrumentation"] = instrumentation
         return result
     
+    def count_persons(self, frame: np.ndarray) -> int:
+        """YOLOv8 person boxes in one frame (class 0 is 'person' in COCO)"""
+        return count_persons(self.detector, [frame])[0]
+    
     def analyze_frame_basic(self, frame: np.ndarray):
         """Basic frame analysis using YOLOv8 person detection"""
-        # Use YOLOv8 to detect people (suppress output)
-        import io
-        import sys
-        from contextlib import redirect_stdout
-        
-        # Temporarily redirect stdout to suppress YOLOv8 output
-        f = io.StringIO()
-        with redirect_stdout(f):
-            results = self.yolo_model(frame, verbose=False)
-        
-        person_count = 0
-        for box in results[0].boxes:
-            if int(box.cls[0]) == 0:  # class 0 is 'person' in COCO
-                person_count += 1
-        
+        self.score_frame(self.count_persons(frame))
+    
+    def score_frame(self, person_count: int):
+        """Record the basic per-frame scores for an already detected person count"""
         if person_count == 1:
             # One person detected - basic analysis
             eye_contact_score = 75  # Basic score when person is detected
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 """
-Video Analysis Script (YOLOv8 Only, No OpenCV, No NumPy)
+Video Analysis Script (YOLOv8 Only)
 - Uses YOLOv8 (ultralytics) for person detection and analysis
-- Uses imageio for video frame extraction (no cv2, no numpy)
+- Uses imageio for video frame extraction (decoding uses no cv2)
+- Sampled frames go through YOLO in batches (AI_YOLO_BATCH_SIZE, default 8; 1 = one call per frame);
+  frames are NumPy arrays, and a batch is a list of them (stacked into one tensor by the detector)
+- AI_DETECTOR_BACKEND=onnx runs the ONNX export on ONNX Runtime instead of ultralytics/PyTorch; its
+  letterbox (person_detector.py) resizes and pads with OpenCV
 - Compatible with Python 3.13+
 """
 
@@ -11,45 +15,85 @@ import sys
 import base64
 import tempfile
 import os
-from ultralytics import YOLO
-import imageio
-from typing import Dict, Any
+import time
+from model_registry import registry_stats
+from person_detector import get_person_detector, count_persons, detector_model_name
+from frame_sampler import FrameSampler, sample_indices
+from video_probe import probe_video
+from typing import Dict, Any, List
+
+DEFAULT_BATCH_SIZE = int(os.environ.get('AI_YOLO_BATCH_SIZE', '8'))
 
 def mean(values):
     return sum(values) / len(values) if values else 0
 
-def analyze_video(video_path: str, scenario: str, duration: float) -> Dict[str, Any]:
-    # Initialize YOLOv8 model
-    yolo_model = YOLO('yolov8n.pt')
+def analyze_video(video_path: str, scenario: str, duration: float, batch_size: int = None) -> Dict[str, Any]:
+    batch_size = max(1, batch_size or DEFAULT_BATCH_SIZE)
+    # YOLOv8 from the model registry: loaded and warmed up once per process
+    detector = get_person_detector()
 
-    # Read video frames using imageio
+    # Read video frames using imageio (imported here, so importing this module stays cheap)
+    import imageio
     try:
         reader = imageio.get_reader(video_path)
     except Exception as e:
         return {"status": "error", "message": f"Could not open video file: {str(e)}"}
-    total_frames = reader.count_frames()
+    # Container metadata (or a packet scan) instead of count_frames(), which decodes the whole file
+    video_info = probe_video(video_path)
+    total_frames = video_info.frames
     sample_frames = min(50, max(10, total_frames // 10))
     person_detected_frames = 0
     multi_person_frames = 0
     no_person_frames = 0
-    for i in range(sample_frames):
-        frame_idx = int(i * total_frames / sample_frames)
-        try:
-            frame = reader.get_data(frame_idx)
-        except Exception:
+    person_counts = []
+    batch = []
+    frames_inferred = 0
+    inference_seconds = 0.0
+    started = time.perf_counter()
+    # One sequential pass over the stream instead of a get_data() seek per sample;
+    # frames are buffered only up to one batch
+    sampler = FrameSampler(reader, sample_indices(total_frames, sample_frames), backend='imageio')
+    for _, _, frame in sampler:
+        batch.append(frame)
+        if len(batch) < batch_size:
             continue
         # YOLOv8 person detection
-        yolo_results = yolo_model(frame, verbose=False)
-        person_count = sum(1 for box in yolo_results[0].boxes if int(box.cls[0]) == 0)
+        inference_started = time.perf_counter()
+        person_counts.extend(count_persons(detector, batch))
+        inference_seconds += time.perf_counter() - inference_started
+        frames_inferred += len(batch)
+        batch = []
+    if batch:
+        # Last, partial batch
+        inference_started = time.perf_counter()
+        person_counts.extend(count_persons(detector, batch))
+        inference_seconds += time.perf_counter() - inference_started
+        frames_inferred += len(batch)
+    loop_seconds = time.perf_counter() - started
+    reader.close()
+    for person_count in person_counts:
         if person_count == 1:
             person_detected_frames += 1
         elif person_count > 1:
             multi_person_frames += 1
         else:
             no_person_frames += 1
-    reader.close()
+    inference = {
+        "backend": detector_model_name(),
+        "batchSize": batch_size,
+        "framesInferred": frames_inferred,
+        "inferenceSeconds": round(inference_seconds, 3),
+        "inferenceFramesPerSecond": round(frames_inferred / inference_seconds, 2) if inference_seconds else None,
+        "framesPerSecond": round(frames_inferred / loop_seconds, 2) if loop_seconds else None,
+        "models": registry_stats(),
+    }
+    probe = video_info.as_dict()
+    print(f"[INFO] YOLO batch={batch_size}: {frames_inferred} frames, "
+          f"{inference['inferenceFramesPerSecond']} fps inference, {inference['framesPerSecond']} fps end to end",
+          file=sys.stderr)
     if person_detected_frames == 0:
-        return {"status": "error", "message": "No person detected in the video."}
+        return {"status": "error", "message": "No person detected in the video.",
+                "instrumentation": {"probe": probe, "inference": inference}}
     # Aggregate results
     person_score = int(100 * person_detected_frames / sample_frames)
     multi_person_score = int(100 * multi_person_frames / sample_frames)
@@ -74,7 +118,8 @@ def analyze_video(video_path: str, scenario: str, duration: float) -> Dict[str,
         "multiPersonScore": multi_person_score,
         "noPersonScore": no_person_score,
         "feedback": feedback,
-        "framesAnalyzed": sample_frames
+        "framesAnalyzed": sample_frames,
+        "instrumentation": {"probe": probe, "inference": inference}
     }
 
 def main():
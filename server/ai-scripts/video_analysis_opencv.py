@@ -12,6 +12,8 @@ import base64
 import tempfile
 import os
 from typing import Dict, List, Tuple, Any
+from frame_sampler import FrameSampler
+from video_probe import probe_video
 
 class OpenCVVideoAnalyzer:
     def __init__(self):
@@ -34,23 +36,16 @@ class OpenCVVideoAnalyzer:
         if not cap.isOpened():
             raise ValueError("Could not open video file")
         
-        frame_count = 0
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        video_info = probe_video(video_path, cap)
+        total_frames = video_info.frames
+        fps = video_info.fps
         
         # Sample frames for analysis (every 5th frame for performance)
         sample_interval = max(1, total_frames // 50)
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            frame_count += 1
-            
-            # Analyze every nth frame for performance
-            if frame_count % sample_interval == 0:
-                self.analyze_frame(frame)
+        # Analyze every nth frame (1-based count); the frames in between are only grabbed, not converted
+        for _, _, frame in FrameSampler(cap, step=sample_interval, start=sample_interval - 1):
+            self.analyze_frame(frame)
         
         cap.release()
         
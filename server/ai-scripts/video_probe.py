@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Container probe: frame count, fps, duration, resolution and codec without decoding
+- Reads the container and stream headers through PyAV (libavformat)
+- MediaRecorder WebM files usually carry no frame count or duration; for those the packets of
+  the video stream are demuxed (not decoded) to count frames and find the last timestamp
+- Without PyAV, falls back to the OpenCV capture properties; a missing or implausible frame
+  count there is recounted with a grab() pass as a last resort
+- Every analyzer plans its sample set from probe_video() instead of CAP_PROP_FRAME_COUNT or
+  imageio's count_frames(), which decodes the whole file
+"""
+
+import sys
+from typing import Any, Dict, Optional
+
+
+class VideoInfo:
+    """Stream properties plus how they were obtained ('metadata', 'packets', 'opencv' or 'grab')"""
+
+    def __init__(self, frames: int = 0, fps: float = 0.0, duration: float = 0.0, width: int = 0,
+                 height: int = 0, codec: Optional[str] = None, method: str = 'metadata'):
+        self.frames = int(frames or 0)
+        self.fps = float(fps or 0.0)
+        self.duration = float(duration or 0.0)
+        self.width = int(width or 0)
+        self.height = int(height or 0)
+        self.codec = codec
+        self.method = method
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "fps": round(self.fps, 3),
+            "duration": round(self.duration, 3),
+            "resolution": f"{self.width}x{self.height}",
+            "codec": self.codec,
+            "method": self.method,
+        }
+
+    def __repr__(self):
+        return f"VideoInfo({self.as_dict()})"
+
+
+def _complete(info: VideoInfo) -> VideoInfo:
+    """Fill whichever of frames / fps / duration is missing from the other two"""
+    if not info.frames and info.duration and info.fps:
+        info.frames = int(round(info.duration * info.fps))
+    if not info.duration and info.frames and info.fps:
+        info.duration = info.frames / info.fps
+    if not info.fps and info.frames and info.duration:
+        info.fps = info.frames / info.duration
+    return info
+
+
+def _probe_pyav(path: str) -> VideoInfo:
+    import av
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        rate = stream.average_rate or stream.guessed_rate
+        info = VideoInfo(
+            frames=stream.frames,
+            fps=float(rate) if rate else 0.0,
+            width=stream.codec_context.width,
+            height=stream.codec_context.height,
+            codec=stream.codec_context.name,
+        )
+        if stream.duration and stream.time_base:
+            info.duration = float(stream.duration * stream.time_base)
+        elif container.duration:
+            info.duration = container.duration / av.time_base
+        if info.frames and info.duration:
+            return _complete(info)
+
+        # Header is incomplete (typical for MediaRecorder WebM): count packets instead
+        packets, first_pts, last_pts = 0, None, None
+        for packet in container.demux(stream):
+            if packet.size == 0:  # flush packet at end of stream
+                continue
+            packets += 1
+            if packet.pts is not None:
+                first_pts = packet.pts if first_pts is None else min(first_pts, packet.pts)
+                end_pts = packet.pts + (packet.duration or 0)
+                last_pts = end_pts if last_pts is None else max(last_pts, end_pts)
+        info.frames = packets
+        if last_pts is not None and stream.time_base:
+            info.duration = float((last_pts - first_pts) * stream.time_base)
+        # Recorder timestamps are the ground truth here; the header rate is often a 1 kHz time base
+        info.fps = 0.0 if info.duration else info.fps
+        info.method = 'packets'
+        return _complete(info)
+
+
+def _probe_opencv(path: str, cap=None) -> VideoInfo:
+    import cv2
+    capture = cap if cap is not None else cv2.VideoCapture(path)
+    try:
+        fourcc = int(capture.get(cv2.CAP_PROP_FOURCC))
+        codec = ''.join(chr((fourcc >> 8 * i) & 0xFF) for i in range(4)).strip('\x00 ') or None
+        info = VideoInfo(
+            frames=max(0, int(capture.get(cv2.CAP_PROP_FRAME_COUNT))),
+            fps=capture.get(cv2.CAP_PROP_FPS),
+            width=capture.get(cv2.CAP_PROP_FRAME_WIDTH),
+            height=capture.get(cv2.CAP_PROP_FRAME_HEIGHT),
+            codec=codec,
+            method='opencv',
+        )
+        # OpenCV reports WebM without duration as 0 or as a huge bogus count; neither is usable
+        if info.fps and not 0 < info.frames < info.fps * 24 * 3600:
+            info.frames = 0
+        if not info.frames and path:
+            info = _grab_count(path, info)
+        return _complete(info)
+    finally:
+        if cap is None:
+            capture.release()
+
+
+def _grab_count(path: str, info: VideoInfo) -> VideoInfo:
+    """Last resort: count frames with grab() on a separate capture (decodes, but never converts)"""
+    import cv2
+    capture = cv2.VideoCapture(path)
+    frames = 0
+    while capture.grab():
+        frames += 1
+    capture.release()
+    info.frames = frames
+    info.method = 'grab'
+    return info
+
+
+def probe_video(path: str, cap=None) -> VideoInfo:
+    """Probe a video file; cap, when given, is an open cv2.VideoCapture used for the OpenCV fallback"""
+    try:
+        return _probe_pyav(path)
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"[WARN] PyAV probe failed for {path}: {e}; falling back to OpenCV", file=sys.stderr)
+    return _probe_opencv(path, cap)
+
+
+if __name__ == '__main__':
+    import json
+    for video in sys.argv[1:]:
+        print(json.dumps({"path": video, **probe_video(video).as_dict()}))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Video upload spooling for the Flask analysis service
+- Streams raw request bodies (application/octet-stream) to a temp file in fixed-size chunks
+- Multipart uploads: UploadRequest hands werkzeug's form parser a HashingSpool, so each file part
+  is written once, straight into the temp file the analysis reads (no second copy)
+- Avoids the base64-in-JSON transport (~4 in-memory copies, +33% on the wire)
+- Optionally feeds every chunk to a hashlib object, so the content hash costs no extra pass
+"""
+
+import hashlib
+import os
+import tempfile
+
+from flask import Request
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+MIME_SUFFIXES = {
+    'video/webm': '.webm',
+    'video/mp4': '.mp4',
+    'video/quicktime': '.mov',
+    'video/x-matroska': '.mkv',
+}
+
+
+def suffix_for(mime_type: str = None) -> str:
+    if not mime_type:
+        return '.webm'
+    return MIME_SUFFIXES.get(mime_type.split(';')[0].strip().lower(), '.webm')
+
+
+class HashingSpool:
+    """Named temp file (kept on close) that SHA-256 hashes everything written to it"""
+
+    def __init__(self, mime_type: str = None):
+        self.file = tempfile.NamedTemporaryFile(suffix=suffix_for(mime_type), delete=False)
+        self.name = self.file.name
+        self.hasher = hashlib.sha256()
+
+    def write(self, data) -> int:
+        self.hasher.update(data)
+        return self.file.write(data)
+
+    def hexdigest(self) -> str:
+        return self.hasher.hexdigest()
+
+    def __getattr__(self, name):
+        # read / seek / close / flush etc. of the underlying file, for werkzeug's FileStorage
+        return getattr(self.file, name)
+
+
+class UploadRequest(Request):
+    """Flask request whose multipart file parts are parsed straight into HashingSpool files"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.spools = []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        spool = HashingSpool(content_type)
+        self.spools.append(spool)
+        return spool
+
+    def discard_spools(self, keep: str = None):
+        """Remove every spooled file part except the one at path keep"""
+        for spool in self.spools:
+            if spool.name != keep:
+                spool.close()
+                remove_spool(spool.name)
+
+
+def spool_stream(stream, mime_type: str = None, chunk_size: int = CHUNK_SIZE, hasher=None) -> str:
+    """Copy a file-like stream to a temp file chunk by chunk and return its path"""
+    with tempfile.NamedTemporaryFile(suffix=suffix_for(mime_type), delete=False) as temp_file:
+        try:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                temp_file.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+        except Exception:
+            temp_file.close()
+            os.unlink(temp_file.name)
+            raise
+        return temp_file.name
+
+
+def spool_upload(file_storage, chunk_size: int = CHUNK_SIZE):
+    """(path, SHA-256) of a multipart upload (werkzeug FileStorage)
+
+    A part parsed by UploadRequest is already on disk and hashed, so it is used as is; any other
+    stream is copied to a temp file.
+    """
+    stream = file_storage.stream
+    if isinstance(stream, HashingSpool):
+        stream.flush()
+        return stream.name, stream.hexdigest()
+    hasher = hashlib.sha256()
+    return spool_stream(stream, file_storage.mimetype, chunk_size, hasher), hasher.hexdigest()
+
+
+def remove_spool(path: str):
+    if path and os.path.exists(path):
+        os.unlink(path)
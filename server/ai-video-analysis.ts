@@ -5,6 +5,7 @@ import { writeFileSync, unlinkSync } from 'fs';
 import { join } from 'path';
 import { tmpdir } from 'os';
 import { Buffer } from 'buffer';
+import { Readable } from 'stream';
 import { spawnSync } from 'child_process';
 
 export interface AIAnalysisResult {
@@ -55,6 +56,33 @@ try {
   pythonAvailable = false;
 }
 
+const AI_SERVICE_URL = process.env.AI_SERVICE_URL || 'http://tawasl-ai-video-analysis:8000/analyze';
+// Jobs endpoints live next to /analyze on the same service
+const AI_JOBS_URL = new URL('/jobs', AI_SERVICE_URL).toString();
+const AI_JOB_POLL_INTERVAL_MS = Number(process.env.AI_JOB_POLL_INTERVAL_MS || 1000);
+const AI_JOB_DEADLINE_MS = Number(process.env.AI_JOB_DEADLINE_MS || 15 * 60 * 1000);
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+async function waitForJob(jobId: string): Promise<any> {
+  const deadline = Date.now() + AI_JOB_DEADLINE_MS;
+  while (Date.now() < deadline) {
+    const { data: job } = await axios.get(`${AI_JOBS_URL}/${jobId}`, { timeout: 10000 });
+    if (job.status === 'done') {
+      return job.result;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Analysis job failed');
+    }
+    const { processed, planned } = job.progress || {};
+    if (planned) {
+      console.log(`AI analysis job ${jobId}: ${processed}/${planned} frames`);
+    }
+    await sleep(AI_JOB_POLL_INTERVAL_MS);
+  }
+  throw new Error(`Analysis job ${jobId} did not finish within ${AI_JOB_DEADLINE_MS} ms`);
+}
+
 export async function analyzeVideoWithAI(
   videoBuffer: Buffer,
   scenario: string,
@@ -62,20 +90,28 @@ export async function analyzeVideoWithAI(
   mimeType?: string
 ): Promise<AIAnalysisResult> {
   try {
-    // Convert video buffer to base64
-    const videoData = videoBuffer.toString('base64');
-    console.log({ videoData, scenario, duration });
-    // Call the Flask AI service
+    // Stream the raw bytes; the Flask service spools them to disk in chunks and
+    // answers with a job id right away, so long videos are not cut off by an HTTP timeout
+    console.log(`Sending ${videoBuffer.length} bytes for analysis`, { scenario, duration });
     const response = await axios.post(
-      process.env.AI_SERVICE_URL || 'http://tawasl-ai-video-analysis:8000/analyze',
+      AI_JOBS_URL,
+      Readable.from([videoBuffer]),
       {
-        video_path: videoData,   // must be a non-empty string
-        scenario,                // must be a non-empty string
-        duration                 // must be a valid number
-      },
-      { timeout: 120000 }
+        params: {
+          scenario,                // must be a non-empty string
+          duration,                // must be a valid number
+          mime_type: mimeType
+        },
+        headers: {
+          'Content-Type': 'application/octet-stream',
+          'Content-Length': videoBuffer.length
+        },
+        maxBodyLength: Infinity,
+        maxContentLength: Infinity,
+        timeout: 120000
+      }
     );
-    return response.data;
+    return await waitForJob(response.data.jobId);
   } catch (error: any) {
     console.error('AI service error:', error.response?.data || error.message);
         // Return zero scores instead of mock analysis